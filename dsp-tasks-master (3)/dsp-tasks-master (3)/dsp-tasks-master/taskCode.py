@@ -16,6 +16,11 @@ import cmath
 # Add task4 testing modules to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'task4', 'dftCompare'))
 sys.path.append(os.path.join(os.path.dirname(__file__), 'task4', 'dc_compare'))
+# The FFT engine lives in task_4 at the top of the repository
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from task_4 import fft_engine
+from new.correlation import autocorrelate, estimate_period
 
 try:
     from signalcompare import SignalComapreAmplitude, SignalComaprePhaseShift, RoundPhaseShift
@@ -33,69 +38,38 @@ def fourier_transform(y, type):
     """
     Calculates either the DFT (type='dft') or IDFT (type='idft').
     Returns: (Mag, Phase) for DFT, or (Time_Samples) for IDFT.
+
+    Both directions run on the mixed-radix FFT engine in O(N log N).
     """
     N = len(y)
 
     if type == "idft":
-        X = y  # Input y is now the frequency-domain signal X[k]
-        x_n = []  # This will hold the time-domain signal x[n]
-
-        # Outer loop: Iterates over time samples n (n = 0 to N-1)
-        for n in range(N):
-            buffer = 0 + 0j
-
-            # Inner loop: Iterates over frequency bins k (k = 0 to N-1)
-            for k in range(N):
-                comp = 2 * math.pi * n * k
-                comp = comp / N
-                complex_num = complex(0, comp)  # POSITIVE sign here
-                c = X[k] * cmath.exp(complex_num)
-                buffer += c
-
-            final_sample = buffer / N
-            x_n.append(final_sample.real)
+        if N == 0:
+            return []
+        # Input y is the frequency-domain signal X[k]
+        x_n = fft_engine.ifft(y)
 
         # The IDFT returns the time-domain signal itself,
         # NOT the magnitude and phase of it.
-        return x_n  # Returns a single list of real (float) time-domain samples
+        return np.real(x_n).tolist()  # Returns a single list of real (float) time-domain samples
     # --- DFT: Forward Discrete Fourier Transform ---
     elif type == "dft":
-        # Input y is the time-domain signal x[n]
-        new_y = []  # Holds the complex results X[k]
-
-        # Step 1: Calculate the DFT (k and n loops remain correct)
-        for k in range(N):
-            buffer = 0 + 0j
-            for n in range(N):
-                comp = 2 * math.pi * n * k
-                comp = comp / N
-                complex_num = complex(0, -comp)  # Negative sign for DFT
-
-                c = y[n] * cmath.exp(complex_num)
-                buffer += c
-            new_y.append(buffer)
-
-        # Step 2: Convert to Polar Form and Destructure Output (Returns floats for comparison)
-        raw_magnitudes = []
-        raw_phases = []
+        if N == 0:
+            return [], []
+        # Step 1: Calculate the DFT of the time-domain signal x[n]
+        new_y = fft_engine.fft(y)
+
+        # Step 2: Convert to Polar Form (Returns floats for comparison)
+        raw_magnitudes = np.abs(new_y)
+        raw_phases = np.angle(new_y)
         TOLERANCE = 1e-12
 
-        for z in new_y:
-            magnitude = abs(z)
-            phase = cmath.phase(z)
-
-            # Apply tolerance cleanup directly to the float values
-            if abs(magnitude) < TOLERANCE:
-                magnitude = 0.0
-            if abs(phase) < TOLERANCE:
-                phase = 0.0
-            if abs(phase - math.pi) < TOLERANCE:
-                phase = -math.pi
+        # Apply tolerance cleanup directly to the float values
+        raw_magnitudes[raw_magnitudes < TOLERANCE] = 0.0
+        raw_phases[np.abs(raw_phases) < TOLERANCE] = 0.0
+        raw_phases[np.abs(raw_phases - math.pi) < TOLERANCE] = -math.pi
 
-            raw_magnitudes.append(magnitude)
-            raw_phases.append(phase)
-
-        return raw_magnitudes, raw_phases
+        return raw_magnitudes.tolist(), raw_phases.tolist()
 
     return [], []  # Return empty lists if type is not recognized
 
@@ -491,7 +465,8 @@ class SignalProcessorGUI:
                                       state="readonly", width=20)
         operation_combo['values'] = [
             "DFT", "IDFT", "Remove DC Component", 
-            "Modify Amplitude", "Modify Phase", "Show Dominant Frequencies"
+            "Modify Amplitude", "Modify Phase", "Show Dominant Frequencies",
+            "Estimate Period"
         ]
         operation_combo.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=5)
         operation_combo.bind('<<ComboboxSelected>>', self.on_operation_selected)
@@ -748,6 +723,8 @@ class SignalProcessorGUI:
                 self.execute_modify_phase_operation(signal_name, indices, samples, fs)
             elif operation == "Show Dominant Frequencies":
                 self.execute_show_dominant_frequencies(signal_name, indices, samples, fs)
+            elif operation == "Estimate Period":
+                self.execute_period_operation(signal_name, indices, samples, fs)
                 
         except ValueError as e:
             self.log_operation_result(f"ERROR: Invalid parameter - {str(e)}")
@@ -917,6 +894,40 @@ class SignalProcessorGUI:
         # Plot with dominant frequencies highlighted
         self.plot_task4_result(freqs, amps, None, "Dominant Frequencies", dominant_indices)
 
+    def execute_period_operation(self, signal_name, indices, samples, fs):
+        """Estimate the fundamental period from the autocorrelation (FFT based)"""
+        samples = np.asarray(samples, dtype=float)
+        if len(samples) < 3:
+            self.log_operation_result("ERROR: The signal needs at least 3 samples")
+            return
+
+        period, strength = estimate_period(samples)
+
+        # Normalized autocorrelation of the mean-free signal for display
+        lags, r = autocorrelate(samples - samples.mean(), unbiased=True, max_lag=len(samples) // 2)
+        r = r / r[0] if r[0] > 0 else r
+
+        result_name = f"{signal_name}_Autocorrelation"
+        self.task4_results = {
+            "indices": lags,
+            "samples": r,
+            "N": len(samples),
+            "type": "Autocorrelation"
+        }
+        self.result_name_var.set(result_name)
+
+        if np.isnan(period):
+            self.log_operation_result("No periodicity found (autocorrelation peak below 0.5)")
+            highlight = None
+        else:
+            self.log_operation_result(f"Period = {period:.3f} samples = {period / fs:.6f} s")
+            self.log_operation_result(f"Fundamental frequency = {fs / period:.3f} Hz (strength {strength:.3f})")
+            highlight = [int(round(period))]
+
+        self.plot_task4_result(lags / fs, r, None, "Autocorrelation", highlight)
+        self.task4_ax.set_xlabel("Lag (s)")
+        self.task4_canvas.draw()
+
     def plot_task4_result(self, x_data, y_data, phase_data=None, title="Results", highlight_indices=None):
         """Plot Task 4 operation results"""
         self.task4_ax.clear()
@@ -2027,7 +2038,6 @@ class SignalProcessorGUI:
             N = res["N"]
             samples = []
             indices = np.arange(N)
-            sign = 1  # positive for IDFT
             input_data = X
             label = result_name + "_IDFT"
         else:
@@ -2036,26 +2046,14 @@ class SignalProcessorGUI:
             samples = signal_data['samples']
             indices = signal_data['indices']
             N = len(samples)
-            sign = -1
             input_data = samples
             label = signal_name + "_FT"
 
-        X_result = []
-        for k in range(N):
-            real = 0
-            imag = 0
-            for n in range(N):
-                angle = sign * 2 * np.pi * k * n / N
-                if inverse:
-                    real += (input_data[n].real * np.cos(angle) - input_data[n].imag * np.sin(angle))
-                    imag += (input_data[n].real * np.sin(angle) + input_data[n].imag * np.cos(angle))
-                else:
-                    real += input_data[n] * np.cos(angle)
-                    imag += input_data[n] * np.sin(angle)
-            if inverse:
-                real /= N
-                imag /= N
-            X_result.append(complex(real, imag))
+        # Twiddles and factorization of length N come from the cached FFT plan
+        if inverse:
+            X_result = fft_engine.ifft(input_data).tolist()
+        else:
+            X_result = fft_engine.fft(input_data).tolist()
 
         if inverse:
             samples = [x.real for x in X_result]
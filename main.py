@@ -10,7 +10,9 @@ from tkinter import filedialog as fd
 from new.sinusoidal import createSin
 from new.subtraction import subtract_signals
 from task3.quantization import quantize_signal_by_bits
-from task_4.dft_idft import run_dft_idft, plot_dft_result, display_dominant_frequencies, remove_dc_component, modify_dft_components
+from task_4.dft_idft import run_dft_idft, plot_dft_result, display_dominant_frequencies
+from task_4.spectrum_session import SpectrumSession
+from task_4.stft import stft, plot_spectrogram
 from task_one.addition_of_signals import add_signals
 from task_one.display_continuous import draw_continuous
 from task_one.display_discrete import draw_discrete
@@ -32,6 +34,7 @@ dft_fs_entry = None
 dft_comp_entry = None
 dft_amp_entry = None
 dft_phase_entry = None
+LAST_DFT_RESULT = {'X_complex': None, 'Fs': None, 'N': None, 'session': None}
 
 # --- Pre-load Signals ---
 # Load existing signals (adjust paths if necessary)
@@ -251,12 +254,26 @@ def run_dft_analysis():
         LAST_DFT_RESULT['X_complex'] = X_complex
         LAST_DFT_RESULT['Fs'] = Fs
         LAST_DFT_RESULT['N'] = len(y)
+        # Keeps the time-domain reconstruction for O(N) single-bin edits
+        LAST_DFT_RESULT['session'] = SpectrumSession(X_complex=X_complex)
 
         plot_dft_result(f_bins, amp_norm, phase)
         display_dominant_frequencies(f_bins, amp_norm)
     except Exception as e:
         messagebox.showerror("DFT Error", f"An error occurred during DFT: {e}")
 
+def run_spectrogram():
+    """Computes the STFT of the selected signal and plots its spectrogram."""
+    _, y, Fs = get_dft_inputs()
+    if y is None: return
+    try:
+        # 256-sample Hann frames with 50% overlap (shorter for short signals)
+        frame_length = min(256, len(y))
+        times, freqs, Z = stft(y, Fs, window='hann', frame_length=frame_length, hop=max(1, frame_length // 2))
+        plot_spectrogram(times, freqs, Z)
+    except Exception as e:
+        messagebox.showerror("STFT Error", f"An error occurred during STFT: {e}")
+
 def run_remove_dc():
     """Removes the DC component (k=0) from the last computed DFT result and re-analyzes."""
     global LAST_DFT_RESULT
@@ -264,13 +281,10 @@ def run_remove_dc():
         messagebox.showwarning("Warning", "Run DFT Analysis first.")
         return
 
-    X_complex = LAST_DFT_RESULT['X_complex']
-    Fs = LAST_DFT_RESULT['Fs']
-
-    X_modified = remove_dc_component(X_complex)
-
-    # Re-analyze and plot the new spectrum
-    f_bins, amp_norm, phase, _ = run_dft_idft(X_modified, Fs, mode='dft')
+    # X[0] = 0 is applied to the stored reconstruction as an O(N) rank-1 update
+    session = LAST_DFT_RESULT['session']
+    session.remove_dc()
+    f_bins, amp_norm, phase, X_modified = session.spectrum()
 
     # Update stored result
     LAST_DFT_RESULT['X_complex'] = X_modified
@@ -331,11 +345,10 @@ def apply_modification_and_update():
             messagebox.showerror("Index Error", f"Component index k must be between 0 and {LAST_DFT_RESULT['N'] - 1}.")
             return
 
-        X_modified = modify_dft_components(LAST_DFT_RESULT['X_complex'], k, new_amplitude, new_phase)
-
-        # Re-analyze and plot the new spectrum
-        Fs = LAST_DFT_RESULT['Fs']
-        f_bins, amp_norm, phase, _ = run_dft_idft(X_modified, Fs, mode='dft')
+        # Apply the edit (and its mirror bin) to the stored reconstruction in O(N)
+        session = LAST_DFT_RESULT['session']
+        session.set_bin(k, new_amplitude, new_phase)
+        f_bins, amp_norm, phase, X_modified = session.spectrum()
 
         # Update stored result
         LAST_DFT_RESULT['X_complex'] = X_modified
@@ -356,12 +369,16 @@ def run_idft_reconstruction():
         return
 
     try:
-        x_indices, y_reconstructed = run_dft_idft(
-            signal_y=None,
-            Fs=LAST_DFT_RESULT['Fs'],
-            mode='idft',
-            X_complex_input=LAST_DFT_RESULT['X_complex']
-        )
+        if LAST_DFT_RESULT['session'] is not None:
+            # The session already holds the reconstruction of the edited spectrum
+            x_indices, y_reconstructed = LAST_DFT_RESULT['session'].reconstruction()
+        else:
+            x_indices, y_reconstructed = run_dft_idft(
+                signal_y=None,
+                Fs=LAST_DFT_RESULT['Fs'],
+                mode='idft',
+                X_complex_input=LAST_DFT_RESULT['X_complex']
+            )
 
         # Assuming draw_discrete is imported and works
         # If draw_discrete is not in scope, you'll need to update imports
@@ -561,7 +578,7 @@ def open_frequency_domain_dialog():
 
     freq_window = Toplevel(window)
     freq_window.title("Frequency Domain Analysis (DFT / IDFT)")
-    freq_window.geometry("500x350")
+    freq_window.geometry("500x390")
 
     Label(freq_window, text="Discrete Fourier Transform (DFT / IDFT)", font=("Arial", 12)).pack(pady=10)
 
@@ -596,6 +613,10 @@ def open_frequency_domain_dialog():
     # 4. IDFT Reconstruction
     ttk.Button(freq_window, text="4. Reconstruct Signal (IDFT)", command=run_idft_reconstruction).place(x=20, y=y_start)
 
+    y_start += 40
+    # 5. Spectrogram of overlapping windowed frames
+    ttk.Button(freq_window, text="5. Spectrogram (STFT)", command=run_spectrogram).place(x=20, y=y_start)
+
 # The main menu command:
 freq_menu.add_command(label="Open DFT/IDFT Toolbox", command=open_frequency_domain_dialog)
 
@@ -0,0 +1,36 @@
+import numpy as np
+
+from new.convolution import OverlapSave, convolve
+
+# Run from the repository root: python -m new.ConvolutionTest
+
+
+def ConvolutionMethodsAreEqual(sizes=((1, 1), (100, 7), (5000, 64), (3000, 2500))):
+    """Every method gives np.convolve's full linear convolution."""
+    rng = np.random.default_rng(0)
+    for N, M in sizes:
+        x, h = rng.standard_normal(N), rng.standard_normal(M)
+        expected = np.convolve(x, h)
+        for method in ('auto', 'direct', 'fft', 'overlap_add', 'overlap_save'):
+            y = convolve(x, h, method)
+            if len(y) != len(expected) or np.max(np.abs(y - expected)) > 1e-9:
+                print(f"Convolution Test case failed for N = {N}, M = {M}, method = {method}")
+                return
+    print("Convolution Test case passed successfully")
+
+
+def OverlapSaveStreamIsEqual(N=10000, M=101):
+    """Streamed overlap-save blocks plus flush give the full convolution."""
+    rng = np.random.default_rng(1)
+    x, h = rng.standard_normal(N), rng.standard_normal(M)
+    stream = OverlapSave(h, block_size=256)
+    y = np.concatenate([stream.process(c) for c in np.array_split(x, 23)] + [stream.flush()])
+    if len(y) != N + M - 1 or np.max(np.abs(y - np.convolve(x, h))) > 1e-9:
+        print("Overlap-Save Stream Test case failed, streamed output differs from np.convolve")
+        return
+    print("Overlap-Save Stream Test case passed successfully")
+
+
+if __name__ == '__main__':
+    ConvolutionMethodsAreEqual()
+    OverlapSaveStreamIsEqual()
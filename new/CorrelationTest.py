@@ -0,0 +1,115 @@
+import numpy as np
+
+from new.correlation import PeriodTracker, align_signals, autocorrelate, cross_correlate, estimate_delay, \
+    estimate_period
+
+# Run from the repository root: python -m new.CorrelationTest
+
+
+class _Signal:
+    """Same constructor and attributes as new/Signal.py (importing that needs cwd new/)."""
+
+    def __init__(self, indices=None, samples=None, filename="", fs=None):
+        self.indices = np.asarray(indices)
+        self.samples = np.asarray(samples)
+        self.filename = filename
+        self.fs = fs
+
+
+def _delayed(y, delay):
+    """y delayed by any (fractional) number of samples, as a circular phase ramp on its spectrum."""
+    k = np.fft.fftfreq(len(y))
+    return np.real(np.fft.ifft(np.fft.fft(y) * np.exp(-2j * np.pi * k * delay)))
+
+
+def AutocorrelationMatchesDirect(N=300):
+    """The FFT autocorrelation (biased and unbiased) must equal the direct sums at every lag."""
+    x = np.random.default_rng(0).standard_normal(N)
+    direct = np.correlate(x, x, 'full')[N - 1:]
+    lags, biased = autocorrelate(x)
+    _, unbiased = autocorrelate(x, unbiased=True)
+    if np.max(np.abs(biased * N - direct)) > 1e-9 or np.max(np.abs(unbiased * (N - lags) - direct)) > 1e-9:
+        print("Autocorrelation Test case failed, the FFT result differs from the direct sums")
+        return
+    print("Autocorrelation Test case passed successfully")
+
+
+def CrossCorrelationMatchesDirect(N=200, M=50):
+    """cross_correlate of one channel and of a batch equals np.correlate at every lag."""
+    rng = np.random.default_rng(3)
+    x, y = rng.standard_normal((3, N)), rng.standard_normal(M)
+    direct = np.stack([np.correlate(row, y, 'full') for row in x])
+    lags, single = cross_correlate(x[0], y)
+    _, batch = cross_correlate(x, y)
+    if lags[0] != -(M - 1) or np.max(np.abs(single - direct[0])) > 1e-9 or np.max(np.abs(batch - direct)) > 1e-9:
+        print("Cross-Correlation Test case failed, the FFT result differs from np.correlate")
+        return
+    print("Cross-Correlation Test case passed successfully")
+
+
+def DelayIsRecovered(delays=(0.0, 7.0, -23.0, 3.25, -12.6, 40.5), N=4096):
+    """GCC-PHAT finds integer and fractional delays, and a batch gives the channel-by-channel results."""
+    y = np.random.default_rng(4).standard_normal(N)
+    x = np.stack([_delayed(y, d) for d in delays])
+    batch, peaks = estimate_delay(x, y, max_lag=64)
+    if np.max(np.abs(batch - delays)) > 0.01 or np.min(peaks) < 0.5:
+        print(f"Delay Test case failed, got delays {batch}")
+        return
+    looped = np.array([estimate_delay(row, y, max_lag=64)[0] for row in x])
+    if np.max(np.abs(looped - batch)) > 1e-9:
+        print("Delay Test case failed, the batch differs from one channel at a time")
+        return
+    if abs(estimate_delay(x[3], y, Fs=1000.0, max_lag=64)[0] - delays[3] / 1000.0) > 0.01 / 1000.0:
+        print("Delay Test case failed, the delay in seconds is wrong")
+        return
+    print("Delay Test case passed successfully")
+
+
+def SignalsAreAligned(N=2000, Fs=8000.0):
+    """align_signals moves every copy back onto the reference indices and keeps fs."""
+    y = np.random.default_rng(5).standard_normal(N)
+    reference = _Signal(np.arange(N), y, 'reference', fs=Fs)
+    copies = [_Signal(np.arange(N), _delayed(y, d), f'copy{d}', fs=Fs) for d in (5, -9, 17)]
+    for result, d in zip(align_signals(reference, copies, max_lag=32), (5, -9, 17)):
+        if result.indices[0] != -d or result.fs != Fs:
+            print(f"Align Test case failed for delay {d}, got start index {result.indices[0]}")
+            return
+    print("Align Test case passed successfully")
+
+
+def PeriodIsEstimated(periods=(20.5, 37.3, 64.0)):
+    """Tones of known period (one batch) give the period, a strength in [0, 1], and NaN for noise."""
+    rng = np.random.default_rng(1)
+    n = np.arange(4096)
+    frames = np.stack([np.sin(2 * np.pi * n / T) for T in periods] + [rng.standard_normal(len(n))])
+    period, strength = estimate_period(frames)
+    if np.max(np.abs(period[:-1] - periods)) > 0.05 or not np.isnan(period[-1]):
+        print(f"Period Test case failed, got periods {period}")
+        return
+    if np.any(strength < 0) or np.any(strength > 1):
+        print(f"Period Test case failed, strengths {strength} are outside [0, 1]")
+        return
+    print("Period Test case passed successfully")
+
+
+def PeriodTrackerStreamIsEqual(N=20000):
+    """Chunks of any size give the one-shot frames, also with gaps between frames (hop > frame_length)."""
+    x = np.sin(2 * np.pi * np.arange(N) / 37.3) + 0.1 * np.random.default_rng(2).standard_normal(N)
+    for frame_length, hop, chunk_size in ((1024, 1500, 1100), (1024, 512, 700), (512, 2000, 300)):
+        whole = PeriodTracker(frame_length, hop).process(x)
+        tracker = PeriodTracker(frame_length, hop)
+        parts = [tracker.process(x[i:i + chunk_size]) for i in range(0, N, chunk_size)]
+        chunked = [np.concatenate(column) for column in zip(*parts)]
+        if len(chunked[0]) != len(whole[0]) or any(np.max(np.abs(a - b)) > 1e-9 for a, b in zip(chunked, whole)):
+            print(f"Period Tracker Stream Test case failed for frame_length = {frame_length}, hop = {hop}")
+            return
+    print("Period Tracker Stream Test case passed successfully")
+
+
+if __name__ == '__main__':
+    CrossCorrelationMatchesDirect()
+    DelayIsRecovered()
+    SignalsAreAligned()
+    AutocorrelationMatchesDirect()
+    PeriodIsEstimated()
+    PeriodTrackerStreamIsEqual()
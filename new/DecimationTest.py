@@ -0,0 +1,45 @@
+import numpy as np
+
+from new.decimation import CICDecimator, decimate, stream_decimate
+
+# Run from the repository root: python -m new.DecimationTest
+
+
+def CICIntFloatAreEqual(R=4, stages=3):
+    """Integer ADC samples and the same values as floats must decimate identically."""
+    x = np.random.default_rng(0).integers(-32768, 32768, 4000)
+    from_int = CICDecimator(R, stages).process(x)
+    from_float = CICDecimator(R, stages).process(x.astype(float))
+    constant = CICDecimator(R, stages).process(np.full(40, 1000))
+    if np.max(np.abs(from_int - from_float)) > 1e-9 or abs(constant[-1] - 1000) > 1e-9:
+        print("CIC Int/Float Test case failed, integer input is scaled differently from float input")
+        return
+    print("CIC Int/Float Test case passed successfully")
+
+
+def DecimationIntFloatAreEqual(factor=16, Fs=48000.0):
+    """The whole multistage chain (CIC first) must not depend on the input dtype."""
+    x = np.random.default_rng(1).integers(-32768, 32768, 1 << 15)
+    from_int = np.concatenate(list(stream_decimate(x, factor, Fs, chunk_size=5000)))
+    from_float = np.concatenate(list(stream_decimate(x.astype(float), factor, Fs, chunk_size=5000)))
+    if len(from_int) != len(from_float) or np.max(np.abs(from_int - from_float)) > 1e-6 * 32768:
+        print("Decimation Int/Float Test case failed, the outputs differ")
+        return
+    print("Decimation Int/Float Test case passed successfully")
+
+
+def DecimationStreamIsEqual(factor=12, Fs=48000.0):
+    """Chunked decimation must give the same samples as one call over the whole signal."""
+    x = np.random.default_rng(2).standard_normal(30000)
+    _, whole, _ = decimate(x, factor, Fs, chunk_size=len(x), compensate_delay=False)
+    _, chunked, _ = decimate(x, factor, Fs, chunk_size=1234, compensate_delay=False)
+    if len(whole) != len(chunked) or np.max(np.abs(whole - chunked)) > 1e-9:
+        print("Decimation Stream Test case failed, chunked output differs from the whole-signal output")
+        return
+    print("Decimation Stream Test case passed successfully")
+
+
+if __name__ == '__main__':
+    CICIntFloatAreEqual()
+    DecimationIntFloatAreEqual()
+    DecimationStreamIsEqual()
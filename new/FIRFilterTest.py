@@ -0,0 +1,43 @@
+import numpy as np
+
+from new.fir_filter import FIRFilter, design_fir, filter_signal
+
+# Run from the repository root: python -m new.FIRFilterTest
+
+
+class _Signal:
+    """Same constructor and attributes as new/Signal.py (importing that needs cwd new/)."""
+
+    def __init__(self, indices=None, samples=None, filename="", fs=None):
+        self.indices = np.asarray(indices)
+        self.samples = np.asarray(samples)
+        self.filename = filename
+        self.fs = fs
+
+
+def FIRStreamIsEqual(N=8000):
+    """FIRFilter over uneven blocks equals filtering the whole signal (the first N outputs)."""
+    taps = design_fir(1000, 8000, transition_width=200)
+    x = np.random.default_rng(2).standard_normal(N)
+    fir = FIRFilter(taps)
+    y = np.concatenate([fir.process(c) for c in np.array_split(x, 13)])
+    if np.max(np.abs(y - np.convolve(x, taps)[:N])) > 1e-9:
+        print("FIR Stream Test case failed, block output differs from the whole-signal output")
+        return
+    print("FIR Stream Test case passed successfully")
+
+
+def FIRSignalKeepsRate(N=500, Fs=8000.0):
+    """filter_signal keeps the sampling rate and the float32 sample type of its input."""
+    taps = design_fir(1000, Fs, num_taps=31)
+    x = np.random.default_rng(3).standard_normal(N).astype(np.float32)
+    result = filter_signal(_Signal(np.arange(N), x, 'x', fs=Fs), taps, compensate_delay=True)
+    if result.fs != Fs or result.samples.dtype != np.float32 or result.indices[0] != -15:
+        print("FIR Signal Test case failed, the result lost fs, dtype or the delay-compensated indices")
+        return
+    print("FIR Signal Test case passed successfully")
+
+
+if __name__ == '__main__':
+    FIRStreamIsEqual()
+    FIRSignalKeepsRate()
@@ -0,0 +1,72 @@
+import numpy as np
+
+from new.iir_filter import SOSFilter, butterworth, filter_signal, notch, sosfilt
+
+# Run from the repository root: python -m new.IIRFilterTest
+
+
+class _Signal:
+    """Same constructor and attributes as new/Signal.py (importing that needs cwd new/)."""
+
+    def __init__(self, indices=None, samples=None, filename="", fs=None):
+        self.indices = np.asarray(indices)
+        self.samples = np.asarray(samples)
+        self.filename = filename
+        self.fs = fs
+
+
+def _reference_sosfilt(sos, x):
+    """Sample-by-sample transposed direct form II, one section after the other."""
+    y = np.array(x, dtype=float)
+    for b0, b1, b2, a0, a1, a2 in sos:
+        b0, b1, b2, a1, a2 = b0 / a0, b1 / a0, b2 / a0, a1 / a0, a2 / a0
+        z1 = z2 = 0.0
+        out = np.empty_like(y)
+        for n, v in enumerate(y):
+            out[n] = b0 * v + z1
+            z1 = b1 * v - a1 * out[n] + z2
+            z2 = b2 * v - a2 * out[n]
+        y = out
+    return y
+
+
+def IIRBlockSizesAreEqual(N=1000):
+    """Every block size of the block recurrence must give the sample-by-sample result."""
+    sos = np.vstack((butterworth(5, 1000, 8000), notch(50, 8000)))
+    x = np.random.default_rng(0).standard_normal(N)
+    expected = _reference_sosfilt(sos, x)
+    for block_size in (1, 7, 128, 1024):
+        if np.max(np.abs(sosfilt(sos, x, block_size) - expected)) > 1e-9:
+            print(f"IIR Block Test case failed for block_size = {block_size}")
+            return
+    print("IIR Block Test case passed successfully")
+
+
+def IIRStreamIsEqual(N=1000):
+    """Chunks of any size (several channels at once) must continue the state exactly."""
+    sos = butterworth(4, 300, 8000, 'highpass')
+    x = np.random.default_rng(1).standard_normal((3, N))
+    whole = sosfilt(sos, x)
+    stream = SOSFilter(sos, block_size=64)
+    edges = [0, 1, 50, 51, 300, 777, N]
+    chunked = np.concatenate([stream.process(x[:, a:b]) for a, b in zip(edges[:-1], edges[1:])], axis=1)
+    if np.max(np.abs(chunked - whole)) > 1e-9:
+        print("IIR Stream Test case failed, chunked output differs from the one-shot output")
+        return
+    print("IIR Stream Test case passed successfully")
+
+
+def IIRSignalKeepsRate(N=500, Fs=8000.0):
+    """filter_signal keeps the indices, sampling rate and float32 sample type of its input."""
+    x = np.random.default_rng(2).standard_normal(N).astype(np.float32)
+    result = filter_signal(_Signal(np.arange(5, N + 5), x, 'x', fs=Fs), notch(50, Fs))
+    if result.fs != Fs or result.samples.dtype != np.float32 or result.indices[0] != 5:
+        print("IIR Signal Test case failed, the result lost fs, dtype or the indices")
+        return
+    print("IIR Signal Test case passed successfully")
+
+
+if __name__ == '__main__':
+    IIRBlockSizesAreEqual()
+    IIRStreamIsEqual()
+    IIRSignalKeepsRate()
@@ -0,0 +1,32 @@
+import numpy as np
+
+from new.resampling import naive_resample, resample, stream_resample
+
+# Run from the repository root: python -m new.ResamplingTest
+
+
+def ResamplerMatchesNaive(ratios=((3, 2), (2, 3), (1, 4), (4, 1), (160, 147)), N=3000):
+    """The polyphase resampler must give the zero-stuff / filter / keep-every-M reference."""
+    x = np.random.default_rng(0).standard_normal(N)
+    for L, M in ratios:
+        fast, slow = resample(x, L, M), naive_resample(x, L, M)
+        if len(fast) != len(slow) or np.max(np.abs(fast - slow)) > 1e-9:
+            print(f"Resampler Test case failed for L/M = {L}/{M}")
+            return
+    print("Resampler Test case passed successfully")
+
+
+def ResamplerStreamIsEqual(L=3, M=2, N=5000):
+    """Chunks of any size must give the one-shot result."""
+    x = np.random.default_rng(1).standard_normal(N)
+    chunked = np.concatenate(list(stream_resample(np.array_split(x, 17), L, M)))
+    whole = resample(x, L, M)
+    if len(chunked) != len(whole) or np.max(np.abs(chunked - whole)) > 1e-9:
+        print("Resampler Stream Test case failed, chunked output differs from the one-shot output")
+        return
+    print("Resampler Stream Test case passed successfully")
+
+
+if __name__ == '__main__':
+    ResamplerMatchesNaive()
+    ResamplerStreamIsEqual()
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import os
 # Import test functions and the signal reading utility from the companion file
 from new.Task1Test import ReadSignalFile, AddSignalSamplesAreEqual, MultiplySignalByConst
+from task_4.precision import real_dtype
 
 
 # --- 1. Signal Data Structure ---
@@ -15,13 +16,21 @@ class Signal:
         indices (np.ndarray): The index (time) values of the samples.
         samples (np.ndarray): The amplitude (value) of the samples.
         filename (str): The source file name or description of the signal.
+        fs (float or None): Sampling rate in Hz, if known (new/resampling.py
+            converts between rates and updates it).
+
+    dtype selects float32 ('single') or float64 ('double') samples; by default
+    float32 samples stay float32 and anything else follows the global
+    precision policy (task_4/precision.py).
     """
 
-    def __init__(self, indices=None, samples=None, filename=""):
+    def __init__(self, indices=None, samples=None, filename="", dtype=None, fs=None):
         # Convert inputs to numpy arrays for efficient computation
+        sample_dtype = real_dtype(samples, dtype)
         self.indices = np.array(indices, dtype=int) if indices is not None else np.array([], dtype=int)
-        self.samples = np.array(samples, dtype=float) if samples is not None else np.array([], dtype=float)
+        self.samples = np.array(samples, dtype=sample_dtype) if samples is not None else np.array([], dtype=sample_dtype)
         self.filename = filename
+        self.fs = fs
 
     def is_valid(self):
         """Checks if the signal contains valid data (non-empty and matching lengths)."""
@@ -168,6 +177,13 @@ def add_signals(signals):
     if len(valid_signals) == 1:
         return valid_signals[0]
 
+    # Samples can only be added index by index at the same sampling rate
+    rates = {s.fs for s in valid_signals if s.fs is not None}
+    if len(rates) > 1:
+        print(f"Cannot add signals sampled at different rates {sorted(rates)}; "
+              "resample them first (new/resampling.py).")
+        return Signal()
+
     # 1. Determine the overall common index range across ALL signals
     all_indices = np.concatenate([s.indices for s in valid_signals])
     if len(all_indices) == 0:
@@ -177,8 +193,8 @@ def add_signals(signals):
     max_idx = np.max(all_indices)
     common_indices = np.arange(min_idx, max_idx + 1)
 
-    # Initialize the result array with zeros
-    total_samples = np.zeros(len(common_indices), dtype=float)
+    # Initialize the result array with zeros (in the precision of the inputs)
+    total_samples = np.zeros(len(common_indices), dtype=np.result_type(*[s.samples for s in valid_signals]))
 
     # 2. Create index-to-value maps for all signals
     for sig in valid_signals:
@@ -188,7 +204,7 @@ def add_signals(signals):
         for i, idx in enumerate(common_indices):
             total_samples[i] += sig_map.get(idx, 0.0)
 
-    return Signal(common_indices, total_samples, filename="Summed Signal")
+    return Signal(common_indices, total_samples, filename="Summed Signal", fs=rates.pop() if rates else None)
 
 
 def multiply_signal_by_constant(signal, constant):
@@ -209,7 +225,8 @@ def multiply_signal_by_constant(signal, constant):
     # Element-wise multiplication
     result_samples = signal.samples * constant
 
-    result_signal = Signal(signal.indices, result_samples, filename=f"{signal.filename.split('.')[0]} * {constant}")
+    result_signal = Signal(signal.indices, result_samples, filename=f"{signal.filename.split('.')[0]} * {constant}",
+                           fs=signal.fs)
 
     # Check for inversion
     if constant < 0:
@@ -0,0 +1,476 @@
+import numpy as np
+
+from new.convolution import common_sampling_rate, convolve
+from task_4.fft_engine import fft, ifft, rfft, irfft
+from task_one.read_load_signals import read_signal_chunks
+
+# --- Cross-Correlation ---
+# r_xy[l] = Sum_n x[n + l] * conj(y[n]),   l = -(M - 1) .. N - 1
+# which is the convolution of x with conj(y) reversed, so the 1-D case uses
+# convolve() (direct or FFT, whichever is cheaper).  Normalized:
+#     rho_xy[l] = r_xy[l] / sqrt(Sum |x|^2 * Sum |y|^2),   -1 <= rho <= 1
+# For signals with index offsets, lag l means that x at index t + l lines up
+# with y at index t, so the lags run from
+#     x_start - y_end .. x_end - y_start.
+#
+# --- Time Delay (GCC-PHAT) ---
+# If x[n] = y[n - d], then r_xy peaks at l = d.  The generalized
+# cross-correlation with the phase transform whitens the cross-spectrum
+#     G[k] = X[k] * conj(Y[k]) / |X[k] * conj(Y[k])|
+# so only the phase (the delay) is left and the peak of IFFT(G) is sharp,
+# even for coloured or reverberant signals.  The peak is refined to a
+# fraction of a sample with a parabola through its neighbours (a, b, c):
+#     p = (a - c) / (2 * (a - 2b + c))
+# Batches: x of shape (C, N) against one reference y, all channels in one
+# batched FFT.
+#
+# --- Autocorrelation (Wiener-Khinchin) ---
+# The autocorrelation is the inverse transform of the power spectrum:
+#     r[l] = Sum_n x[n + l] conj(x[n]) = IFFT(|FFT(x)|^2)[l],   l = 0 .. N - 1
+# on an FFT of at least 2N - 1 points, so the zero padding keeps the circular
+# wrap-around out of every lag (r[-l] = conj(r[l])).  Scaling:
+#     biased    r[l] / N            (decays with the lag, positive definite)
+#     unbiased  r[l] / (N - |l|)    (keeps the height of periodic peaks)
+#
+# --- Period Estimation ---
+# A signal with period T correlates with itself at l = T, 2T, ...  After the
+# mean is removed, the unbiased autocorrelation normalized by r[0] is about 1
+# at these lags.  The period is the first local maximum that reaches
+# PEAK_RATIO of the highest one (the multiples are about as high, so taking
+# the first avoids octave errors), refined with a parabola through its
+# neighbours.  Frames whose peak stays below the threshold are aperiodic (NaN).
+
+
+# The first autocorrelation peak is the period if it reaches this fraction of the highest
+PEAK_RATIO = 0.9
+
+
+def _lags(N, M):
+    return np.arange(-(M - 1), N)
+
+
+def _energy(v):
+    return np.sqrt(np.sum(np.abs(v) ** 2, axis=-1, keepdims=True))
+
+
+def _correlation_size(N, M):
+    return 1 << (N + M - 2).bit_length()
+
+
+def cross_correlate(x, y, normalize=False):
+    """
+    Full cross-correlation of x against the reference y.
+
+    Args:
+        x (np.array): Samples (N,) or a batch of channels (C, N).
+        y (np.array): Reference samples (M,).
+        normalize (bool): Divide by the energies (correlation coefficients).
+
+    Returns:
+        tuple: (lags, r) with lags -(M-1) .. N-1 and r of shape (N + M - 1,) or (C, N + M - 1).
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if x.ndim not in (1, 2) or y.ndim != 1 or x.shape[-1] == 0 or len(y) == 0:
+        raise ValueError("x must be (N,) or (C, N) and y a non-empty (M,) array.")
+    N, M = x.shape[-1], len(y)
+
+    if x.ndim == 1:
+        r = convolve(x, np.conj(y[::-1]))
+    else:
+        # One batched FFT over all channels
+        size = _correlation_size(N, M)
+        if np.isrealobj(x) and np.isrealobj(y):
+            r = irfft(rfft(np.pad(x, ((0, 0), (0, size - N)))) * rfft(np.pad(y[::-1], (0, size - M))), size)
+        else:
+            r = ifft(fft(np.pad(x, ((0, 0), (0, size - N)))) * fft(np.pad(np.conj(y[::-1]), (0, size - M))))
+        r = r[:, :N + M - 1]
+
+    if normalize:
+        scale = _energy(x) * _energy(y)
+        r = np.where(scale > 0, r / np.where(scale > 0, scale, 1.0), 0.0)
+        if r.ndim == 2 and x.ndim == 1:
+            r = r[0]
+    return _lags(N, M), r
+
+
+def signal_correlation(x1, y1, x2, y2, normalize=False):
+    """
+    Cross-correlation of signal 1 against signal 2 given as (index, sample) arrays.
+    The lags include the index offsets: at lag l, signal 1 at index t + l lines
+    up with signal 2 at index t.
+
+    Returns:
+        tuple: (lags, r)
+    """
+    lags, r = cross_correlate(y1, y2, normalize)
+    return lags + (int(x1[0]) - int(x2[0])), r
+
+
+def correlate_signals(sig1, sig2, normalize=False):
+    """
+    Cross-correlation of two Signal objects; the result's indices are the lags
+    and it keeps the inputs' common sampling rate fs.
+    """
+    fs = common_sampling_rate(sig1, sig2)
+    lags, r = signal_correlation(sig1.indices, sig1.samples, sig2.indices, sig2.samples, normalize)
+    result = type(sig1)(lags, r, f"corr({sig1.filename or 'signal'}, {sig2.filename or 'signal'})")
+    result.fs = fs
+    return result
+
+
+# --- Time Delay Estimation ---
+
+def _cross_spectrum(x, y, phat):
+    """(G, size, real): the (phase-transformed) cross-spectrum of x and y on a size-point FFT."""
+    x, y = np.asarray(x), np.asarray(y)
+    if x.ndim not in (1, 2) or y.ndim != 1 or x.shape[-1] == 0 or len(y) == 0:
+        raise ValueError("x must be (N,) or (C, N) and y a non-empty (M,) array.")
+    N, M = x.shape[-1], len(y)
+    size = _correlation_size(N, M)
+    real = np.isrealobj(x) and np.isrealobj(y)
+
+    # 1. Cross-spectrum of every channel with the reference
+    transform = rfft if real else fft
+    pad = [(0, 0)] * (x.ndim - 1) + [(0, size - N)]
+    G = transform(np.pad(x, pad)) * np.conj(transform(np.pad(y, (0, size - M))))
+
+    # 2. Phase transform: keep only the phase of every bin
+    if phat:
+        magnitude = np.abs(G)
+        floor = np.finfo(magnitude.dtype).eps * np.max(magnitude, axis=-1, keepdims=True)
+        G = G / np.maximum(magnitude, np.where(floor > 0, floor, 1.0))
+    return G, size, real
+
+
+def _search_lags(N, M, max_lag):
+    lags = _lags(N, M)
+    return lags if max_lag is None else lags[np.abs(lags) <= max_lag]
+
+
+def _correlation_at(G, size, real, lags):
+    """Correlation at the given lags (circular index l for l >= 0, size + l for l < 0)."""
+    r = irfft(G, size) if real else ifft(G)
+    return r[..., lags % size]
+
+
+def _refine_peak(G, size, real, tau, iterations=3):
+    """
+    Newton steps on r'(tau) = 0 of the band-limited correlation
+        r(tau) = 1/size * Sum_k w_k G[k] exp(2j pi k tau / size)
+    starting from the parabolic estimate tau (one per channel).
+    """
+    if real:
+        k = np.arange(G.shape[-1])
+        # rfft bins: every bin except DC and Nyquist stands for two
+        weights = np.full(G.shape[-1], 2.0)
+        weights[0] = 1.0
+        if size % 2 == 0:
+            weights[-1] = 1.0
+    else:
+        k = np.fft.fftfreq(size, 1.0 / size)
+        weights = np.ones(size)
+    omega = 2 * np.pi * k / size
+    WG = weights * G
+
+    for _ in range(iterations):
+        terms = WG * np.exp(1j * omega * tau[..., None])
+        first = np.sum(terms * (1j * omega), axis=-1).real
+        second = np.sum(terms * -(omega ** 2), axis=-1).real
+        # Only step towards a maximum, and never further than one lag
+        step = np.where(second < 0, first / np.where(second < 0, second, -1.0), 0.0)
+        tau = tau - np.clip(step, -1.0, 1.0)
+    peak = np.sum(WG * np.exp(1j * omega * tau[..., None]), axis=-1).real / size
+    return tau, peak
+
+
+def gcc_phat(x, y, phat=True, max_lag=None):
+    """
+    Generalized cross-correlation of x (N,) or (C, N) against the reference y (M,).
+
+    Args:
+        phat (bool): Apply the phase transform (False gives the plain correlation).
+        max_lag (int, optional): Only keep lags with |l| <= max_lag.
+
+    Returns:
+        tuple: (lags, r) with r of shape (..., len(lags)).
+    """
+    G, size, real = _cross_spectrum(x, y, phat)
+    lags = _search_lags(np.shape(x)[-1], len(y), max_lag)
+    return lags, _correlation_at(G, size, real, lags)
+
+
+def estimate_delay(x, y, Fs=None, phat=True, max_lag=None, interpolate=True):
+    """
+    Delay d of x relative to the reference y (x[n] ~ y[n - d]) from the peak of GCC-PHAT.
+
+    Args:
+        x (np.array): One channel (N,) or a batch of channels (C, N).
+        y (np.array): Reference (M,).
+        Fs (float, optional): Sampling frequency; the delay is in seconds when given.
+        phat (bool): Use the phase transform (recommended) or the plain correlation.
+        max_lag (int, optional): Largest |delay| searched, in samples.
+        interpolate (bool): Sub-sample peak position (parabola through the neighbours).
+
+    Returns:
+        tuple: (delay, peak) - scalars, or arrays of shape (C,) for a batch.
+            peak is the correlation height at the delay (about 1 for a clean
+            delayed copy with phat=True).
+    """
+    G, size, real = _cross_spectrum(x, y, phat)
+    lags = _search_lags(np.shape(x)[-1], len(y), max_lag)
+    r = np.real(_correlation_at(G, size, real, lags))
+
+    # 1. Largest correlation of every channel
+    best = np.argmax(r, axis=-1)[..., None]
+    peak = np.take_along_axis(r, best, axis=-1)[..., 0]
+    position = best[..., 0].astype(float)
+
+    if interpolate and r.shape[-1] >= 3:
+        # 2. Parabola through the peak and its neighbours (not at the first/last lag)
+        inner = (best > 0) & (best < r.shape[-1] - 1)
+        a = np.take_along_axis(r, np.maximum(best - 1, 0), axis=-1)
+        c = np.take_along_axis(r, np.minimum(best + 1, r.shape[-1] - 1), axis=-1)
+        curvature = a - 2 * peak[..., None] + c
+        usable = inner & (curvature < 0)
+        offset = np.where(usable, 0.5 * (a - c) / np.where(usable, curvature, -1.0), 0.0)[..., 0]
+
+        # 3. The parabola is biased on the sinc-shaped peak; polish it on the
+        #    band-limited correlation itself
+        tau, refined = _refine_peak(G, size, real, lags[0] + position + offset)
+        position, peak = tau - lags[0], refined
+
+    delay = lags[0] + position
+    if Fs is not None:
+        delay = delay / Fs
+    if delay.ndim == 0:
+        return float(delay), float(peak)
+    return delay, peak
+
+
+def signal_delay(signal, reference, Fs=None, phat=True, max_lag=None):
+    """
+    Delay of a Signal relative to a reference Signal in index units (or
+    seconds with Fs), including the difference of their start indices.
+    """
+    delay, peak = estimate_delay(signal.samples, reference.samples, None, phat, max_lag)
+    delay += int(signal.indices[0]) - int(reference.indices[0])
+    return (delay / Fs if Fs is not None else delay), peak
+
+
+def align_signals(reference, signals, phat=True, max_lag=None):
+    """
+    Shifts the indices of every signal by its rounded delay to the reference,
+    ready for add_signals.  All signals are estimated in one batched pass when
+    they have the same length.
+
+    Returns:
+        list: New Signal objects with shifted indices (and their fs).
+    """
+    if not signals:
+        return []
+    # Delays in samples only line up signals of the same rate
+    common_sampling_rate(reference, *signals)
+    if len({len(s.samples) for s in signals}) == 1:
+        delays, _ = estimate_delay(np.stack([s.samples for s in signals]), reference.samples,
+                                   phat=phat, max_lag=max_lag)
+    else:
+        delays = np.array([estimate_delay(s.samples, reference.samples, phat=phat, max_lag=max_lag)[0]
+                           for s in signals])
+
+    aligned = []
+    for sig, delay in zip(signals, delays):
+        shift = int(round(delay)) + int(sig.indices[0]) - int(reference.indices[0])
+        result = type(sig)(sig.indices - shift, sig.samples, sig.filename)
+        result.fs = getattr(sig, 'fs', None)
+        aligned.append(result)
+    return aligned
+
+
+# --- Autocorrelation and Period ---
+
+def autocorrelate(x, unbiased=False, max_lag=None):
+    """
+    Autocorrelation through the power spectrum (Wiener-Khinchin).
+
+    Args:
+        x (np.array): Samples (N,) or a batch of signals (C, N).
+        unbiased (bool): Divide lag l by N - l instead of N.
+        max_lag (int, optional): Largest lag returned (default N - 1).
+
+    Returns:
+        tuple: (lags, r) with lags 0 .. max_lag and r of shape (..., max_lag + 1);
+            the negative lags follow from r[-l] = conj(r[l]).
+    """
+    x = np.asarray(x)
+    if x.ndim not in (1, 2) or x.shape[-1] == 0:
+        raise ValueError("x must be a non-empty (N,) or (C, N) array.")
+    N = x.shape[-1]
+    max_lag = N - 1 if max_lag is None else min(int(max_lag), N - 1)
+    if max_lag < 0:
+        raise ValueError("max_lag must be non-negative.")
+    lags = np.arange(max_lag + 1)
+
+    # 1. Power spectrum on at least 2N - 1 points (no circular wrap)
+    size = _correlation_size(N, N)
+    pad = [(0, 0)] * (x.ndim - 1) + [(0, size - N)]
+    if np.isrealobj(x):
+        r = irfft(np.abs(rfft(np.pad(x, pad))) ** 2, size)
+    else:
+        r = ifft(np.abs(fft(np.pad(x, pad))) ** 2)
+
+    # 2. Scale
+    r = r[..., :max_lag + 1]
+    return lags, r / (N - lags if unbiased else N)
+
+
+def estimate_period(x, Fs=None, min_lag=1, max_lag=None, threshold=0.5):
+    """
+    Fundamental period from the first strong autocorrelation peak.
+
+    Args:
+        x (np.array): One signal (N,) or a batch of equally long frames (C, N).
+        Fs (float, optional): Sampling frequency; the period is in seconds when given.
+        min_lag (int): Shortest period searched, in samples.
+        max_lag (int, optional): Longest period searched (default N // 2, so every
+            lag averages at least half the samples).
+        threshold (float): Smallest normalized correlation (0..1) of a periodic signal.
+
+    Returns:
+        tuple: (period, strength) - scalars, or arrays of shape (C,) for a batch.
+            period is NaN for an aperiodic signal; strength is the normalized
+            correlation at the period, clipped to [0, 1] (the unbiased estimate
+            and the interpolated peak can overshoot 1 slightly).
+    """
+    x = np.asarray(x)
+    if x.ndim not in (1, 2) or x.shape[-1] < 3:
+        raise ValueError("x must be (N,) or (C, N) with at least 3 samples.")
+    N = x.shape[-1]
+    max_lag = N // 2 if max_lag is None else min(int(max_lag), N - 2)
+    min_lag = max(int(min_lag), 1)
+    if min_lag > max_lag:
+        raise ValueError("min_lag must not exceed max_lag.")
+
+    # 1. Normalized unbiased autocorrelation of the mean-free signal
+    x = x - np.mean(x, axis=-1, keepdims=True)
+    _, r = autocorrelate(x, unbiased=True, max_lag=max_lag + 1)
+    r = np.real(r)
+    energy = r[..., :1]
+    r = np.where(energy > 0, r / np.where(energy > 0, energy, 1.0), 0.0)
+
+    # 2. Local maxima between min_lag and max_lag
+    middle = r[..., min_lag:max_lag + 1]
+    is_peak = (middle > r[..., min_lag - 1:max_lag]) & (middle >= r[..., min_lag + 1:max_lag + 2])
+    heights = np.where(is_peak, middle, -np.inf)
+    highest = np.max(heights, axis=-1, keepdims=True)
+
+    # 3. The first peak close to the highest one
+    candidates = is_peak & (heights >= PEAK_RATIO * highest)
+    best = min_lag + np.argmax(candidates, axis=-1)[..., None]
+    found = (np.any(candidates, axis=-1) & (highest[..., 0] >= threshold))[..., None]
+
+    # 4. Parabola through the peak and its neighbours
+    a = np.take_along_axis(r, best - 1, axis=-1)
+    b = np.take_along_axis(r, best, axis=-1)
+    c = np.take_along_axis(r, best + 1, axis=-1)
+    curvature = a - 2 * b + c
+    offset = np.where(curvature < 0, 0.5 * (a - c) / np.where(curvature < 0, curvature, -1.0), 0.0)
+    period = np.where(found, best + offset, np.nan)[..., 0]
+    strength = np.clip(np.where(found, b - 0.25 * (a - c) * offset, 0.0), 0.0, 1.0)[..., 0]
+
+    if Fs is not None:
+        period = period / Fs
+    if period.ndim == 0:
+        return float(period), float(strength)
+    return period, strength
+
+
+def signal_period(signal, Fs=None, min_lag=1, max_lag=None, threshold=0.5):
+    """
+    Period of a Signal (new/Signal.py); Fs defaults to signal.fs, without
+    either the period is in samples.
+
+    Returns:
+        tuple: (period, strength)
+    """
+    Fs = getattr(signal, 'fs', None) if Fs is None else Fs
+    return estimate_period(signal.samples, Fs, min_lag, max_lag, threshold)
+
+
+class PeriodTracker:
+    """
+    Period of consecutive frames of a stream.
+
+    process() buffers the samples and estimates every frame it completes,
+    all of them in one batch; an incomplete frame at the end is not estimated.
+
+    Attributes:
+        frame_length (int): Samples per frame (at least two periods).
+        hop (int): Samples between frame starts.
+        Fs (float or None): Sampling frequency (times and periods in seconds).
+    """
+
+    def __init__(self, frame_length=2048, hop=None, Fs=None, min_lag=1, max_lag=None, threshold=0.5):
+        self.frame_length = int(frame_length)
+        self.hop = self.frame_length // 2 if hop is None else int(hop)
+        if self.frame_length < 3 or self.hop < 1:
+            raise ValueError("frame_length must be at least 3 and hop at least 1.")
+        self.Fs = Fs
+        self.min_lag, self.max_lag, self.threshold = min_lag, max_lag, threshold
+        self._pending = np.zeros(0)
+        self._skip = 0
+        self._frames_done = 0
+
+    def process(self, chunk):
+        """
+        Feeds the next chunk of samples.
+
+        Returns:
+            tuple: (times, periods, strengths) of the frames completed by this
+                chunk (possibly none); times are the frame centres.
+        """
+        # 1. Drop the gap still owed when hop > frame_length
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        skipped = min(self._skip, len(chunk))
+        self._skip -= skipped
+        buffer = np.concatenate([self._pending, chunk[skipped:]])
+
+        # 2. Estimate every complete frame in one batch
+        count = (len(buffer) - self.frame_length) // self.hop + 1 if len(buffer) >= self.frame_length else 0
+        if count == 0:
+            self._pending = buffer
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+
+        starts = np.arange(count) * self.hop
+        frames = buffer[starts[:, None] + np.arange(self.frame_length)]
+        periods, strengths = estimate_period(frames, self.Fs, self.min_lag, self.max_lag, self.threshold)
+
+        times = (self._frames_done + np.arange(count)) * self.hop + self.frame_length / 2
+        if self.Fs is not None:
+            times = times / self.Fs
+        self._frames_done += count
+        self._pending = buffer[count * self.hop:]
+        self._skip = max(count * self.hop - len(buffer), 0)
+        return times, periods, strengths
+
+
+def stream_period(source, Fs=None, frame_length=2048, hop=None, chunk_size=65536, **options):
+    """
+    Generator tracking the period of a long signal frame by frame.
+
+    Args:
+        source (str or iterable): A time-domain signal file (read in chunks)
+            or an iterable of sample arrays / (x, y) pairs.
+        options: min_lag, max_lag and threshold as in estimate_period.
+
+    Yields:
+        tuple: (times, periods, strengths) for each non-empty batch of frames.
+    """
+    if isinstance(source, str):
+        source = read_signal_chunks(source, chunk_size)
+    tracker = PeriodTracker(frame_length, hop, Fs, **options)
+    for chunk in source:
+        if isinstance(chunk, tuple):
+            chunk = chunk[1]
+        times, periods, strengths = tracker.process(chunk)
+        if len(times):
+            yield times, periods, strengths
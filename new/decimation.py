@@ -0,0 +1,426 @@
+import math
+
+import numpy as np
+
+from new.fir_filter import FIRFilter, design_fir, kaiser_parameters
+from task3.quantization import quantize_signal_by_bits
+from task_4.dft_idft import run_dft_idft
+from task_4.fft_engine import irfft
+from task_4.precision import as_real
+from task_one.read_load_signals import read_signal_chunks
+
+# --- Multistage Decimation ---
+# Decimating by D in one FIR stage needs a filter whose transition band is
+# narrow compared to the input rate, i.e. very many taps at the full rate.
+# Splitting D into stages keeps every filter short: a stage only has to keep
+# its own aliases out of the final passband [0, fp], so at an input rate Fi
+# and output rate Fo its transition band is fp .. Fo - fp, which is wide for
+# the early stages.  The pipeline is
+#     CIC (factor Rc)  ->  half-band stages (2 each)  ->  FIR stage(s), the last
+#                                                         one compensating the CIC droop
+# and plan_decimation() tries every split of D and keeps the one with the
+# fewest operations (multiplies + adds) per output sample.
+#
+# CIC (Hogenauer): N integrators at the input rate, decimation by R, N combs
+# (delay D) at the output rate:
+#     H(f) = [sin(pi R D f / Fs) / (R D sin(pi f / Fs))]^N        (normalized)
+# No multiplications at all, but the passband droops (compensated later) and
+# only the bands near multiples of Fs/R are suppressed.  The integrators grow
+# without bound, so they run in int64 with wrap-around: the modular result is
+# exact as long as the output fits (input bits + N log2(R D) <= 63).
+#
+# Half-band stages: a lowpass at Fs/4 whose every second tap is zero
+# (windowed sinc with fc = 1/4), so a decimate-by-2 output costs about
+# len(h)/2 multiply-adds.  Pass- and stopband are symmetric around Fs/4.
+
+DEFAULT_ATTENUATION_DB = 80.0
+# Final passband as a fraction of the output Nyquist frequency
+DEFAULT_PASSBAND = 0.8
+MAX_CIC_STAGES = 6
+# Largest CIC droop at fp the compensator may undo
+MAX_CIC_DROOP_DB = 6.0
+
+
+def cic_response(f, Fs, R, stages, diff_delay=1):
+    """Normalized CIC magnitude |H(f)| at the frequencies f (Hz) for the input rate Fs."""
+    u = np.asarray(f, dtype=float) / Fs
+    return np.abs(np.sinc(R * diff_delay * u) / np.sinc(u)) ** stages
+
+
+class CICDecimator:
+    """
+    Streaming CIC decimator (integer arithmetic, unit DC gain at the output).
+
+    Every input is scaled by 2^fraction_bits (float input is rounded after
+    scaling, integer input is shifted), so integer and float samples of the
+    same values give the same output; the default leaves room for |x| < 2^(62 - growth - fraction_bits), growth = N log2(R D).
+
+    Attributes:
+        R, stages, diff_delay (int): Decimation, number of stages N, comb delay D.
+        delay (float): Group delay in input samples, N (R D - 1) / 2.
+    """
+
+    def __init__(self, R, stages, diff_delay=1, fraction_bits=None):
+        self.R, self.stages, self.diff_delay = int(R), int(stages), int(diff_delay)
+        if self.R < 1 or self.stages < 1 or self.diff_delay < 1:
+            raise ValueError("R, stages and diff_delay must be positive.")
+        growth = math.ceil(self.stages * math.log2(self.R * self.diff_delay))
+        if fraction_bits is None:
+            fraction_bits = max(0, min(30, 62 - growth - 16))
+        self.fraction_bits = int(fraction_bits)
+        self.gain = float(self.R * self.diff_delay) ** self.stages
+        self.delay = self.stages * (self.R * self.diff_delay - 1) / 2
+        self.reset()
+
+    def reset(self):
+        self._integrators = np.zeros(self.stages, dtype=np.int64)
+        self._combs = np.zeros((self.stages, self.diff_delay), dtype=np.int64)
+        self._skip = 0  # input samples until the next kept one
+
+    def process(self, chunk):
+        """Decimates the next chunk; returns one output per R inputs."""
+        x = np.asarray(chunk).ravel()
+        if len(x) == 0:
+            return np.zeros(0)
+        if x.dtype.kind in 'iub':
+            v = x.astype(np.int64) << self.fraction_bits
+        else:
+            v = np.round(x * 2.0 ** self.fraction_bits).astype(np.int64)
+
+        # 1. Integrators at the input rate (int64 wrap-around is exact modulo 2^64)
+        for i in range(self.stages):
+            v = np.cumsum(v, dtype=np.int64)
+            v += self._integrators[i]
+            self._integrators[i] = v[-1]
+
+        # 2. Keep inputs 0, R, 2R, ... of the whole stream
+        kept = v[self._skip::self.R]
+        self._skip = (self._skip - len(x)) % self.R
+
+        # 3. Combs y[m] = v[m] - v[m - D] at the output rate
+        for i in range(self.stages):
+            extended = np.concatenate((self._combs[i], kept))
+            kept = extended[self.diff_delay:] - extended[:-self.diff_delay]
+            self._combs[i] = extended[-self.diff_delay:]
+        return kept / (self.gain * 2.0 ** self.fraction_bits)
+
+
+class _DelayLine:
+    def __init__(self, delay):
+        self._line = np.zeros(delay)
+
+    def process(self, x):
+        if len(self._line) == 0:
+            return x
+        extended = np.concatenate((self._line, x))
+        self._line = extended[len(x):]
+        return extended[:len(x)]
+
+
+class FIRDecimator:
+    """
+    Streaming FIR decimator y[m] = Sum_k h[k] x[m R - k], in polyphase form.
+
+    Branch r filters the inputs x[j R - r] with h[q R + r]; leading and
+    trailing zero taps of a branch are dropped (a half-band filter's second
+    branch becomes a single tap), so the cost per output is the number of
+    non-zero taps.
+
+    Attributes:
+        taps (np.ndarray): The filter h.
+        R (int): Decimation factor.
+        delay (float): Group delay in input samples, (len(h) - 1) / 2.
+    """
+
+    def __init__(self, taps, R):
+        self.taps = np.asarray(taps, dtype=float)
+        self.R = int(R)
+        if self.R < 1 or self.taps.ndim != 1 or len(self.taps) == 0:
+            raise ValueError("R must be positive and taps a non-empty 1-D array.")
+        self.delay = (len(self.taps) - 1) / 2
+        self.nonzero_taps = int(np.count_nonzero(self.taps))
+
+        # Column c of a row of R inputs holds branch R - 1 - c
+        self._branches = []
+        for r in range(self.R):
+            branch = self.taps[r::self.R]
+            nonzero = np.flatnonzero(branch)
+            if len(nonzero) == 0:
+                continue
+            lead, last = nonzero[0], nonzero[-1]
+            self._branches.append((self.R - 1 - r, _DelayLine(lead), FIRFilter(branch[lead:last + 1])))
+        self._pending = np.zeros(self.R - 1)
+
+    def process(self, chunk):
+        """Decimates the next chunk; returns one output per R inputs."""
+        buffer = np.concatenate((self._pending, as_real(chunk).ravel()))
+        rows = len(buffer) // self.R
+        self._pending = buffer[rows * self.R:]
+        table = buffer[:rows * self.R].reshape(rows, self.R)
+
+        y = np.zeros(rows)
+        for column, delay_line, fir in self._branches:
+            y += fir.process(delay_line.process(table[:, column]))
+        return y
+
+
+def halfband_taps(transition, attenuation_db=DEFAULT_ATTENUATION_DB):
+    """
+    Half-band lowpass (cutoff 1/4 cycles/sample) with len(h) = 3 (mod 4), so
+    every tap at an even distance from the centre is zero.
+
+    Args:
+        transition (float): Transition width in cycles/sample (centred on 1/4).
+    """
+    num_taps, beta = kaiser_parameters(attenuation_db, transition)
+    num_taps = max(3, num_taps + (3 - num_taps % 4) % 4)
+    h = design_fir(0.25, 1.0, 'lowpass', num_taps=num_taps, beta=beta)
+    # The sinc zeros are exact in theory; clear the rounding residue
+    c = num_taps // 2
+    offsets = np.abs(np.arange(num_taps) - c)
+    h[(offsets % 2 == 0) & (offsets > 0)] = 0.0
+    return h
+
+
+def compensated_lowpass(num_taps, cutoff, Fs, beta, droop=None):
+    """
+    Lowpass whose passband is the inverse of droop(f) (frequency sampling on a
+    dense grid, then a Kaiser window); droop=None gives a plain lowpass.
+
+    Args:
+        cutoff (float): Centre of the transition band in Hz.
+        droop (callable, optional): Magnitude to undo, as a function of f in Hz.
+    """
+    nfft = max(1024, 1 << (16 * num_taps - 1).bit_length())
+    f = np.arange(nfft // 2 + 1) * Fs / nfft
+    desired = np.where(f <= cutoff, 1.0, 0.0)
+    if droop is not None:
+        desired[f <= cutoff] /= droop(f[f <= cutoff])
+    # Zero-phase response -> causal, linear phase, num_taps long
+    c = (num_taps - 1) // 2
+    h = np.roll(irfft(desired, nfft), c)[:num_taps] * np.kaiser(num_taps, beta)
+    return h / np.sum(h)
+
+
+# --- Planning ---
+
+def _fir_taps(Fi, Fo, fp, attenuation_db):
+    """Kaiser estimate of a stage from Fi to Fo that protects [0, fp]."""
+    return kaiser_parameters(attenuation_db, Fo - 2 * fp, Fi)
+
+
+def _ordered_factorizations(n, largest=None):
+    """Factorizations of n into factors >= 2, each list non-increasing."""
+    if n == 1:
+        yield []
+        return
+    largest = n if largest is None else largest
+    for f in range(min(n, largest), 1, -1):
+        if n % f == 0:
+            for rest in _ordered_factorizations(n // f, f):
+                yield [f] + rest
+
+
+def plan_decimation(factor, Fs, passband=None, attenuation_db=DEFAULT_ATTENUATION_DB, use_cic=True):
+    """
+    Cheapest stage split for decimating by factor.
+
+    Args:
+        factor (int): Total decimation D.
+        Fs (float): Input sampling rate.
+        passband (float, optional): Highest frequency to keep, in Hz
+            (default DEFAULT_PASSBAND of the output Nyquist frequency).
+        attenuation_db (float): Alias suppression of every stage.
+        use_cic (bool): Allow a CIC front end.
+
+    Returns:
+        dict: {'stages': [...], 'ops_per_output': float, 'passband': fp, 'fs_out': Fs / D}
+            with stage dicts {'type': 'cic', 'R', 'stages'}, {'type': 'halfband'},
+            {'type': 'fir', 'R', 'num_taps'} ('compensate' on the last one after a CIC).
+    """
+    D = int(factor)
+    if D < 1:
+        raise ValueError("factor must be a positive integer.")
+    fs_out = Fs / D
+    fp = DEFAULT_PASSBAND * fs_out / 2 if passband is None else float(passband)
+    if not 0 < fp < fs_out / 2:
+        raise ValueError("The passband must lie between 0 and the output Nyquist frequency.")
+
+    best = None
+    for Rc in [d for d in range(1, D + 1) if D % d == 0]:
+        if Rc > 1 and not use_cic:
+            break
+        stages, ops, rate = [], 0.0, Fs
+
+        # 1. CIC front end: fewest stages whose aliases at Fs/Rc - fp are suppressed
+        if Rc > 1:
+            Fc = Fs / Rc
+            N = next((n for n in range(1, MAX_CIC_STAGES + 1)
+                      if cic_response(Fc - fp, Fs, Rc, n) <= 10 ** (-attenuation_db / 20)), None)
+            if N is None or cic_response(fp, Fs, Rc, N) < 10 ** (-MAX_CIC_DROOP_DB / 20):
+                continue
+            stages.append({'type': 'cic', 'R': Rc, 'stages': N})
+            # N adds per input, N per output
+            ops += N * (Rc + 1) * (D // Rc)
+            rate = Fc
+
+        rest = D // Rc
+        for halfbands in range(0, int(math.log2(rest)) + 1 if rest > 1 else 1):
+            if rest % (2 ** halfbands):
+                break
+            remaining = rest // 2 ** halfbands
+            for split in _ordered_factorizations(remaining):
+                if Rc > 1 and not split:
+                    split = [1]  # the CIC droop still needs a compensator
+                plan, plan_ops, Fi = list(stages), ops, rate
+
+                # 2. Half-band stages: (len + 3) / 2 non-zero taps per output
+                for _ in range(halfbands):
+                    num_taps, _ = kaiser_parameters(attenuation_db, (Fi / 2 - 2 * fp) / Fi)
+                    num_taps = max(3, num_taps + (3 - num_taps % 4) % 4)
+                    plan.append({'type': 'halfband', 'num_taps': num_taps})
+                    Fi /= 2
+                    plan_ops += 2 * (num_taps + 3) / 2 * (Fi / fs_out)
+
+                # 3. FIR stages, the last one compensating the CIC
+                for i, R in enumerate(split):
+                    Fo = Fi / R
+                    num_taps, _ = _fir_taps(Fi, Fo, fp, attenuation_db)
+                    stage = {'type': 'fir', 'R': R, 'num_taps': num_taps}
+                    if Rc > 1 and i == len(split) - 1:
+                        stage['compensate'] = True
+                    plan.append(stage)
+                    plan_ops += 2 * num_taps * (Fo / fs_out)
+                    Fi = Fo
+
+                if best is None or plan_ops < best['ops_per_output']:
+                    best = {'stages': plan, 'ops_per_output': plan_ops, 'passband': fp, 'fs_out': fs_out}
+    if best is None:
+        raise ValueError("No stage split meets the attenuation; lower it or the passband.")
+    return best
+
+
+# --- Pipeline ---
+
+class MultistageDecimator:
+    """
+    Streaming multistage decimator built from plan_decimation (or a given plan).
+
+    Attributes:
+        factor (int): Total decimation.
+        Fs, fs_out (float): Input and output rates.
+        plan (dict): The stage plan and its operations per output sample.
+        delay (float): Group delay of the whole chain in input samples.
+    """
+
+    def __init__(self, factor, Fs, passband=None, attenuation_db=DEFAULT_ATTENUATION_DB, plan=None,
+                 use_cic=True):
+        self.factor, self.Fs = int(factor), float(Fs)
+        self.plan = plan if plan is not None else plan_decimation(factor, Fs, passband, attenuation_db, use_cic)
+        self.fs_out = self.Fs / self.factor
+        fp = self.plan['passband']
+
+        self.stages, self.delay = [], 0.0
+        rate, cic = self.Fs, None
+        for stage in self.plan['stages']:
+            if stage['type'] == 'cic':
+                block = cic = CICDecimator(stage['R'], stage['stages'])
+                R = stage['R']
+            elif stage['type'] == 'halfband':
+                block, R = FIRDecimator(halfband_taps((rate / 2 - 2 * fp) / rate, attenuation_db), 2), 2
+            else:
+                R = stage['R']
+                _, beta = _fir_taps(rate, rate / R, fp, attenuation_db)
+                droop = None
+                if stage.get('compensate') and cic is not None:
+                    droop = (lambda f, c=cic: cic_response(f, self.Fs, c.R, c.stages, c.diff_delay))
+                taps = compensated_lowpass(stage['num_taps'] | 1, rate / R / 2, rate, beta, droop)
+                block = FIRDecimator(taps, R)
+            # Delay in input samples of the whole chain
+            self.delay += block.delay * (self.Fs / rate)
+            self.stages.append(block)
+            rate /= R
+
+    @property
+    def ops_per_output(self):
+        return self.plan['ops_per_output']
+
+    def process(self, chunk):
+        """Decimates the next chunk through every stage."""
+        y = chunk
+        for stage in self.stages:
+            y = stage.process(y)
+        return np.asarray(y, dtype=float)
+
+
+def _chunks(source, chunk_size):
+    """Sample chunks of a text signal file, a .npy file (memory-mapped), an array or an iterable."""
+    if isinstance(source, str):
+        if source.endswith('.npy'):
+            data = np.load(source, mmap_mode='r')
+            for start in range(0, len(data), chunk_size):
+                yield np.asarray(data[start:start + chunk_size])
+            return
+        for _, y in read_signal_chunks(source, chunk_size):
+            yield y
+        return
+    if isinstance(source, np.ndarray):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+        return
+    for chunk in source:
+        yield chunk[1] if isinstance(chunk, tuple) else chunk
+
+
+def stream_decimate(source, factor, Fs, chunk_size=1 << 18, **options):
+    """Generator decimating a large file / array / iterable chunk by chunk."""
+    decimator = MultistageDecimator(factor, Fs, **options)
+    for chunk in _chunks(source, chunk_size):
+        y = decimator.process(chunk)
+        if len(y):
+            yield y
+
+
+def decimate(source, factor, Fs, chunk_size=1 << 18, start_index=0, compensate_delay=True, **options):
+    """
+    Decimates a whole source with bounded memory per chunk.
+
+    Returns:
+        tuple: (indices, samples, fs_out); with compensate_delay the indices
+            (at the output rate) are shifted back by the chain's group delay.
+    """
+    decimator = MultistageDecimator(factor, Fs, **options)
+    pieces = [decimator.process(chunk) for chunk in _chunks(source, chunk_size)]
+    y = np.concatenate(pieces) if pieces else np.zeros(0)
+    start = start_index / decimator.factor
+    if compensate_delay:
+        start -= decimator.delay / decimator.factor
+    start = int(round(start))
+    return np.arange(start, start + len(y)), y, decimator.fs_out
+
+
+def decimate_signal(signal, factor, Fs=None, **options):
+    """
+    Decimates a Signal (new/Signal.py); Fs defaults to signal.fs.
+    The result has indices at the new rate and its fs set.
+    """
+    Fs = getattr(signal, 'fs', None) if Fs is None else Fs
+    if Fs is None:
+        raise ValueError("The sampling rate is unknown; pass Fs.")
+    start = int(signal.indices[0]) if len(signal.indices) else 0
+    x, y, fs_out = decimate(signal.samples, factor, Fs, start_index=start, **options)
+    result = type(signal)(x, y, f"{signal.filename or 'signal'} / {int(factor)}")
+    result.fs = fs_out
+    return result
+
+
+def decimated_spectrum(source, factor, Fs, **options):
+    """Decimates the source and returns its lazy DFT Spectrum at the output rate (task_4/dft_idft.py)."""
+    _, y, fs_out = decimate(source, factor, Fs, **options)
+    return run_dft_idft(y, fs_out, lazy=True)
+
+
+def decimated_quantization(source, factor, Fs, num_bits, **options):
+    """Decimates the source and quantizes it (task3/quantization.py); returns (encoded, quantized)."""
+    x, y, _ = decimate(source, factor, Fs, **options)
+    return quantize_signal_by_bits(x, y, num_bits)
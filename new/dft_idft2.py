@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import math
 from tkinter import messagebox
+from task_4.peaks import find_peaks
 
 
 # The core transformation logic is handled by NumPy's highly optimized FFT/IFFT.
@@ -97,19 +98,22 @@ def plot_dft_result(f_bins, amplitude_norm, phase):
         print(f"{k}\t{f_bins[k]:.4f}\t\t{amplitude_norm[k]:.6f}\t\t{phase[k]:.6f}")
 
 
-def display_dominant_frequencies(f_bins, amplitude_norm):
-    """Displays frequencies where normalized amplitude > 0.5."""
+def display_dominant_frequencies(f_bins, amplitude_norm, top_k=10):
+    """Displays the top_k spectral peaks with normalized amplitude > 0.5."""
     # Note: We check the non-shifted spectrum indices.
-    dominant_indices = np.where(amplitude_norm > 0.5)[0]
+    # Peaks are local maxima; positions use parabolic sub-bin interpolation
+    _, peak_values, _, bins = find_peaks(amplitude_norm, top_k, threshold=0.5)
+    found = ~np.isnan(bins)
 
-    if len(dominant_indices) == 0:
+    if not np.any(found):
         print("\nNo dominant frequencies found (Normalized Amplitude > 0.5).")
         return
 
+    peak_freqs = np.interp(bins[found], np.arange(len(f_bins)), f_bins)
     print("\n--- Dominant Frequencies (Normalized Amplitude > 0.5) ---")
     print("Frequency (Hz)\tNormalized Amplitude")
-    for k in dominant_indices:
-        print(f"{f_bins[k]:.4f}\t\t{amplitude_norm[k]:.6f}")
+    for f, a in zip(peak_freqs, peak_values[found]):
+        print(f"{f:.4f}\t\t{a:.6f}")
 
 
 def modify_dft_components(X_complex, k, new_amplitude=None, new_phase=None):
@@ -0,0 +1,257 @@
+import math
+
+import numpy as np
+
+from new.convolution import choose_method, convolve
+from task_4.fft_engine import rfft
+from task_one.read_load_signals import read_signal_chunks
+
+# --- Windowed-Sinc FIR Design ---
+# The ideal lowpass with cutoff fc (cycles/sample) has the impulse response
+#     h[n] = 2 fc * sinc(2 fc * (n - (N - 1) / 2)),   n = 0 .. N - 1
+# (shifted by half the length so the filter is causal and linear phase) and
+# is multiplied by a window to limit the ripple.  The other types are built
+# from lowpasses:
+#     highpass = delta - lowpass(fc)
+#     bandpass = lowpass(f2) - lowpass(f1)
+#     bandstop = delta - bandpass
+# Highpass and bandstop need an odd number of taps (a delay of an integer
+# number of samples); an even request is rounded up.
+#
+# Kaiser estimation: for a stopband attenuation A dB and a transition width
+# dw = 2 pi * width / Fs rad/sample,
+#     N    = ceil((A - 7.95) / (2.285 * dw)) + 1
+#     beta = 0.1102 (A - 8.7)                          A > 50
+#            0.5842 (A - 21)^0.4 + 0.07886 (A - 21)    21 <= A <= 50
+#            0                                          A < 21
+#
+# --- Filtering ---
+# FIRFilter keeps the last N - 1 input samples between calls, so blocks of
+# any size give exactly the same output as filtering the whole signal (no
+# circular wrap-around as with editing DFT bins).  Each block is convolved
+# directly or by FFT, whichever choose_method finds cheaper for the block
+# and tap counts.
+
+FILTER_TYPES = ('lowpass', 'highpass', 'bandpass', 'bandstop')
+
+# Symmetric design windows (np.kaiser is used with its beta)
+WINDOWS = {
+    'rect': np.ones,
+    'hann': np.hanning,
+    'hamming': np.hamming,
+    'blackman': np.blackman,
+}
+
+
+def kaiser_parameters(attenuation_db, transition_width, Fs=1.0):
+    """
+    Kaiser window length and beta for a stopband attenuation and transition width.
+
+    Args:
+        attenuation_db (float): Stopband attenuation in dB (e.g. 60).
+        transition_width (float): Transition band width in Hz (in cycles/sample if Fs = 1).
+        Fs (float): Sampling frequency.
+
+    Returns:
+        tuple: (num_taps, beta)
+    """
+    if attenuation_db <= 0 or transition_width <= 0 or Fs <= 0:
+        raise ValueError("Attenuation, transition width and Fs must be positive.")
+    A = float(attenuation_db)
+    if A > 50:
+        beta = 0.1102 * (A - 8.7)
+    elif A >= 21:
+        beta = 0.5842 * (A - 21) ** 0.4 + 0.07886 * (A - 21)
+    else:
+        beta = 0.0
+    dw = 2 * np.pi * transition_width / Fs
+    num_taps = int(math.ceil((A - 7.95) / (2.285 * dw))) + 1
+    return max(num_taps, 1), beta
+
+
+def _lowpass(fc, num_taps):
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    return 2 * fc * np.sinc(2 * fc * n)
+
+
+def design_fir(cutoff, Fs=1.0, kind='lowpass', num_taps=None, window='kaiser',
+               attenuation_db=60.0, transition_width=None, beta=None):
+    """
+    Windowed-sinc FIR design.
+
+    Args:
+        cutoff (float or tuple): Cutoff in Hz; (f1, f2) for bandpass/bandstop.
+        Fs (float): Sampling frequency.
+        kind (str): 'lowpass', 'highpass', 'bandpass' or 'bandstop'.
+        num_taps (int, optional): Filter length; estimated with the Kaiser
+            formula from attenuation_db and transition_width when missing.
+        window (str): 'kaiser', 'hamming', 'hann', 'blackman' or 'rect'.
+        attenuation_db (float): Stopband attenuation for the Kaiser estimates.
+        transition_width (float, optional): Transition width in Hz (needed without num_taps).
+        beta (float, optional): Kaiser beta (estimated from attenuation_db when missing).
+
+    Returns:
+        np.array: The taps, normalized to unit gain in the passband.
+    """
+    if kind not in FILTER_TYPES:
+        raise ValueError(f"kind must be one of {FILTER_TYPES}.")
+    band = kind in ('bandpass', 'bandstop')
+    edges = np.atleast_1d(np.asarray(cutoff, dtype=float))
+    if len(edges) != (2 if band else 1):
+        raise ValueError(f"A {kind} filter needs {'two cutoffs (f1, f2)' if band else 'one cutoff'}.")
+    if Fs <= 0 or np.any(edges <= 0) or np.any(edges >= Fs / 2) or (band and edges[0] >= edges[1]):
+        raise ValueError("Cutoffs must be increasing and lie strictly between 0 and Fs / 2.")
+
+    # 1. Length (and beta) from the Kaiser estimate
+    estimated_beta = None
+    if num_taps is None:
+        if transition_width is None:
+            raise ValueError("Give num_taps or a transition_width to estimate it.")
+        num_taps, estimated_beta = kaiser_parameters(attenuation_db, transition_width, Fs)
+    num_taps = int(num_taps)
+    if num_taps < 1:
+        raise ValueError("num_taps must be at least 1.")
+    if kind in ('highpass', 'bandstop') and num_taps % 2 == 0:
+        num_taps += 1
+
+    # 2. Ideal response from lowpasses
+    fc = edges / Fs
+    if kind == 'lowpass':
+        h = _lowpass(fc[0], num_taps)
+    elif kind == 'highpass':
+        h = -_lowpass(fc[0], num_taps)
+        h[num_taps // 2] += 1.0
+    else:
+        h = _lowpass(fc[1], num_taps) - _lowpass(fc[0], num_taps)
+        if kind == 'bandstop':
+            h = -h
+            h[num_taps // 2] += 1.0
+
+    # 3. Window
+    if window == 'kaiser':
+        if beta is None:
+            beta = estimated_beta if estimated_beta is not None else kaiser_parameters(attenuation_db, 1.0)[1]
+        h = h * np.kaiser(num_taps, beta)
+    elif window in WINDOWS:
+        h = h * WINDOWS[window](num_taps)
+    else:
+        raise ValueError(f"window must be 'kaiser' or one of {tuple(WINDOWS)}.")
+
+    # 4. Unit gain at DC (lowpass, bandstop), Nyquist (highpass) or the band centre (bandpass)
+    if kind == 'highpass':
+        f0 = 0.5
+    elif kind == 'bandpass':
+        f0 = fc.mean()
+    else:
+        f0 = 0.0
+    gain = np.abs(np.sum(h * np.exp(-2j * np.pi * f0 * np.arange(num_taps))))
+    return h / gain if gain > 0 else h
+
+
+def frequency_response(taps, nfft=1024, Fs=1.0):
+    """
+    Returns:
+        tuple: (freqs, H) for 0 .. Fs/2, H complex.
+    """
+    taps = np.asarray(taps, dtype=float)
+    nfft = max(int(nfft), len(taps))
+    H = rfft(np.pad(taps, (0, nfft - len(taps))))
+    return np.arange(len(H)) * Fs / nfft, H
+
+
+# --- Block-Streaming Filter ---
+
+class FIRFilter:
+    """
+    Causal FIR filter y[n] = Sum_k h[k] x[n - k] over consecutive blocks.
+
+    process() returns one output per input sample and keeps the last
+    N - 1 inputs, so the blocks may have any size.
+
+    Attributes:
+        taps (np.ndarray): The filter coefficients h.
+        method (str): 'auto' (direct or FFT by tap and block count), 'direct' or 'fft'.
+    """
+
+    def __init__(self, taps, method='auto'):
+        self.taps = np.asarray(taps)
+        if self.taps.ndim != 1 or len(self.taps) == 0:
+            raise ValueError("taps must be a non-empty 1-D array.")
+        if method not in ('auto', 'direct', 'fft'):
+            raise ValueError("method must be 'auto', 'direct' or 'fft'.")
+        self.method = method
+        self.reset()
+
+    def reset(self):
+        """Clears the state (zeros before the next block)."""
+        self._history = np.zeros(len(self.taps) - 1, dtype=self.taps.dtype)
+
+    @property
+    def group_delay(self):
+        """Delay of a linear-phase (symmetric) filter in samples: (N - 1) / 2."""
+        return (len(self.taps) - 1) / 2
+
+    def process(self, block):
+        """Filters the next block and returns as many samples as it has."""
+        block = np.asarray(block).ravel()
+        if len(block) == 0:
+            return np.zeros(0, dtype=np.result_type(block, self.taps))
+        M = len(self.taps)
+        buffer = np.concatenate((self._history, block))
+
+        method = self.method
+        if method == 'auto':
+            method = choose_method(len(buffer), M)
+        # Outputs that only depend on samples in the buffer ("valid" part)
+        y = convolve(buffer, self.taps, method)[M - 1:len(buffer)]
+
+        self._history = buffer[len(buffer) - (M - 1):] if M > 1 else buffer[:0]
+        return y
+
+    def filter(self, x):
+        """Filters a whole signal from a zero state (the state is left untouched)."""
+        saved = self._history
+        self.reset()
+        try:
+            return self.process(x)
+        finally:
+            self._history = saved
+
+
+def filter_signal(signal, taps, compensate_delay=False, method='auto'):
+    """
+    Filters a Signal (new/Signal.py) and returns a new Signal with the
+    input's sample dtype and sampling rate fs.
+
+    Args:
+        compensate_delay (bool): Shift the indices back by the group delay
+            (N - 1) // 2 so a linear-phase filter's output lines up with the input.
+    """
+    samples = np.asarray(signal.samples)
+    y = FIRFilter(taps, method).filter(samples).astype(samples.dtype, copy=False)
+    indices = np.asarray(signal.indices)
+    if compensate_delay:
+        indices = indices - (len(taps) - 1) // 2
+    result = type(signal)(indices, y, f"filtered {signal.filename or 'signal'}")
+    result.fs = getattr(signal, 'fs', None)
+    return result
+
+
+def stream_filter(source, taps, chunk_size=65536, method='auto'):
+    """
+    Generator filtering a long signal chunk by chunk.
+
+    Args:
+        source (str or iterable): A time-domain signal file (read in chunks)
+            or an iterable of sample arrays / (x, y) pairs.
+
+    Yields:
+        np.array: The filtered samples of every chunk.
+    """
+    if isinstance(source, str):
+        source = read_signal_chunks(source, chunk_size)
+    fir = FIRFilter(taps, method)
+    for chunk in source:
+        if isinstance(chunk, tuple):
+            chunk = chunk[1]
+        yield fir.process(chunk)
@@ -0,0 +1,260 @@
+import numpy as np
+
+from task_4.precision import as_real
+
+# --- IIR Filters as Second-Order Sections ---
+# A filter is a cascade of biquads, one row [b0, b1, b2, a0, a1, a2] each:
+#     H(z) = Prod (b0 + b1 z^-1 + b2 z^-2) / (a0 + a1 z^-1 + a2 z^-2)
+# Every section runs in transposed direct form II (a0 = 1), a state-space
+# system with the state s = (z1, z2):
+#     y[n]   = b0 x[n] + z1[n]                          = C s[n] + D x[n]
+#     s[n+1] = A s[n] + B x[n],  A = [[-a1, 1], [-a2, 0]],
+#                                B = [b1 - a1 b0, b2 - a2 b0]
+#
+# --- Block Recurrence ---
+# A Python loop over samples is far too slow, so the signal is cut into
+# blocks of L samples.  Within a block the output is a matrix product
+#     y = T x + O s0,     T[i, j] = h[i - j] (impulse response, lower triangular),
+#                         O[n]    = C A^n
+# and only the state moves from block to block:
+#     s_next = A^L s0 + G x,   G[:, k] = A^(L-1-k) B.
+# T x and G x are computed for all blocks and channels in one matmul; the
+# loop that is left runs once per block (not per sample) over all channels
+# together.
+
+# 128 balances the per-block loop (few channels) against the O(L) matmul cost per sample
+DEFAULT_BLOCK_SIZE = 128
+
+
+def _normalize_sos(sos):
+    sos = np.atleast_2d(np.asarray(sos, dtype=float))
+    if sos.ndim != 2 or sos.shape[1] != 6 or len(sos) == 0:
+        raise ValueError("sos must have one row [b0, b1, b2, a0, a1, a2] per section.")
+    if np.any(sos[:, 3] == 0):
+        raise ValueError("a0 of every section must be non-zero.")
+    return sos / sos[:, 3:4]
+
+
+class _SectionMatrices:
+    """Block matrices T, O, G and A^L of one biquad for blocks of L samples."""
+
+    def __init__(self, section, L):
+        b0, b1, b2, _, a1, a2 = section
+        A = np.array([[-a1, 1.0], [-a2, 0.0]])
+        B = np.array([b1 - a1 * b0, b2 - a2 * b0])
+
+        # 1. Powers A^0 .. A^L
+        powers = np.empty((L + 1, 2, 2))
+        powers[0] = np.eye(2)
+        for n in range(1, L + 1):
+            powers[n] = A @ powers[n - 1]
+
+        # 2. Impulse response h[0] = D, h[k] = C A^(k-1) B
+        h = np.empty(L)
+        h[0] = b0
+        h[1:] = (powers[:L - 1] @ B)[:, 0]
+
+        lags = np.arange(L)[:, None] - np.arange(L)[None, :]
+        self.T = np.where(lags >= 0, h[np.maximum(lags, 0)], 0.0)
+        # C A^n is the first row of A^n
+        self.O = powers[:L, 0, :]
+        self.G = (powers[L - 1::-1] @ B).T
+        self.powers = powers
+        self.B = B
+
+    def tail(self, r):
+        """T, O, G and A^r for a last block of r < L samples."""
+        G = (self.powers[r - 1::-1] @ self.B).T
+        return self.T[:r, :r], self.O[:r], G, self.powers[r]
+
+
+def _run_section(matrices, x, state, L):
+    """
+    Filters x (C, N) through one section starting from state (C, 2).
+
+    Returns:
+        tuple: (y, final state)
+    """
+    C, N = x.shape
+    B = N // L
+    y = np.empty_like(x)
+
+    if B:
+        blocks = x[:, :B * L].reshape(C, B, L)
+        T, O, G, AL = (m.astype(x.dtype) for m in (matrices.T, matrices.O, matrices.G, matrices.powers[L]))
+
+        # 1. Zero-state response and state input of every block at once
+        Y = blocks @ T.T
+        U = blocks @ G.T
+
+        # 2. States at the start of every block (one step per block)
+        S = np.empty((C, B, 2), dtype=x.dtype)
+        for b in range(B):
+            S[:, b] = state
+            state = state @ AL.T + U[:, b]
+
+        # 3. Add the zero-input response of the block start states
+        Y += S @ O.T
+        y[:, :B * L] = Y.reshape(C, B * L)
+
+    r = N - B * L
+    if r:
+        T, O, G, Ar = (m.astype(x.dtype) for m in matrices.tail(r))
+        rest = x[:, B * L:]
+        y[:, B * L:] = rest @ T.T + state @ O.T
+        state = state @ Ar.T + rest @ G.T
+    return y, state
+
+
+class SOSFilter:
+    """
+    Cascade of second-order sections over consecutive blocks of one or many channels.
+
+    process() accepts (N,) or (channels, N) samples and keeps the state of
+    every channel and section between calls, so the blocks may have any size.
+
+    Attributes:
+        sos (np.ndarray): Sections [b0, b1, b2, 1, a1, a2], shape (S, 6).
+        block_size (int): Samples per block of the block recurrence.
+        state (np.ndarray or None): (channels, S, 2) after the first call.
+    """
+
+    def __init__(self, sos, block_size=DEFAULT_BLOCK_SIZE):
+        self.sos = _normalize_sos(sos)
+        self.block_size = int(block_size)
+        if self.block_size < 1:
+            raise ValueError("block_size must be at least 1.")
+        self._matrices = [_SectionMatrices(section, self.block_size) for section in self.sos]
+        self.state = None
+
+    def reset(self):
+        """Clears the state of every channel."""
+        self.state = None
+
+    def process(self, x):
+        """Filters the next block of samples, shape (N,) or (channels, N)."""
+        x = as_real(x)
+        single = x.ndim == 1
+        data = x[None, :] if single else x
+        if data.ndim != 2:
+            raise ValueError("x must have shape (N,) or (channels, N).")
+
+        channels = data.shape[0]
+        if self.state is None:
+            self.state = np.zeros((channels, len(self.sos), 2), dtype=data.dtype)
+        elif self.state.shape[0] != channels:
+            raise ValueError(f"The filter state has {self.state.shape[0]} channels, got {channels}.")
+
+        y = np.array(data, copy=True)
+        state = self.state.astype(data.dtype)
+        for i, matrices in enumerate(self._matrices):
+            y, state[:, i] = _run_section(matrices, y, state[:, i], self.block_size)
+        self.state = state
+        return y[0] if single else y
+
+    def filter(self, x):
+        """Filters a whole signal from a zero state (the stream state is left untouched)."""
+        saved = self.state
+        self.state = None
+        try:
+            return self.process(x)
+        finally:
+            self.state = saved
+
+
+def sosfilt(sos, x, block_size=DEFAULT_BLOCK_SIZE):
+    """Filters x (N,) or (channels, N) with the sections, starting from rest."""
+    return SOSFilter(sos, block_size).process(x)
+
+
+def filter_signal(signal, sos):
+    """
+    Filters a Signal (new/Signal.py) and returns a new Signal with the same
+    indices, sample dtype and sampling rate fs.
+    """
+    y = sosfilt(sos, signal.samples)
+    result = type(signal)(signal.indices, y, f"filtered {signal.filename or 'signal'}")
+    result.fs = getattr(signal, 'fs', None)
+    return result
+
+
+def frequency_response(sos, nfft=1024, Fs=1.0):
+    """
+    Returns:
+        tuple: (freqs, H) at nfft // 2 + 1 frequencies from 0 to Fs/2, H complex.
+    """
+    sos = _normalize_sos(sos)
+    freqs = np.arange(nfft // 2 + 1) * Fs / nfft
+    z = np.exp(-2j * np.pi * freqs / Fs)[:, None] ** np.arange(3)
+    H = np.prod((z @ sos[:, :3].T) / (z @ sos[:, 3:].T), axis=-1)
+    return freqs, H
+
+
+# --- Designs ---
+
+def dc_blocker(r=0.995):
+    """
+    DC blocker H(z) = (1 - z^-1) / (1 - r z^-1); the -3 dB corner is at about
+    (1 - r) * Fs / (2 pi).
+    """
+    if not 0 < r < 1:
+        raise ValueError("r must lie between 0 and 1.")
+    return np.array([[1.0, -1.0, 0.0, 1.0, -r, 0.0]])
+
+
+def notch(f0, Fs, Q=30.0):
+    """
+    Notch at f0 Hz with quality factor Q (bandwidth f0 / Q):
+        w0 = 2 pi f0 / Fs,  alpha = sin(w0) / (2Q)
+        H(z) = (1 - 2cos(w0) z^-1 + z^-2) / ((1 + alpha) - 2cos(w0) z^-1 + (1 - alpha) z^-2)
+    """
+    if not 0 < f0 < Fs / 2 or Q <= 0:
+        raise ValueError("f0 must lie between 0 and Fs / 2 and Q must be positive.")
+    w0 = 2 * np.pi * f0 / Fs
+    alpha = np.sin(w0) / (2 * Q)
+    cos_w0 = np.cos(w0)
+    return _normalize_sos([[1.0, -2 * cos_w0, 1.0, 1 + alpha, -2 * cos_w0, 1 - alpha]])
+
+
+def butterworth(order, cutoff, Fs, kind='lowpass'):
+    """
+    Butterworth lowpass/highpass as second-order sections (bilinear transform).
+
+    The analog prototype poles p_k = exp(j pi (2k + n + 1) / (2n)) are scaled to
+    the pre-warped cutoff Wc = 2 Fs tan(pi fc / Fs) and every conjugate pair
+    becomes one biquad through s = 2 Fs (1 - z^-1) / (1 + z^-1); an odd order
+    adds a first-order section.
+
+    Args:
+        order (int): Filter order n.
+        cutoff (float): -3 dB frequency in Hz.
+        Fs (float): Sampling frequency.
+        kind (str): 'lowpass' or 'highpass'.
+    """
+    order = int(order)
+    if order < 1:
+        raise ValueError("order must be at least 1.")
+    if not 0 < cutoff < Fs / 2:
+        raise ValueError("cutoff must lie between 0 and Fs / 2.")
+    if kind not in ('lowpass', 'highpass'):
+        raise ValueError("kind must be 'lowpass' or 'highpass'.")
+
+    K = 2.0 * Fs
+    Wc = K * np.tan(np.pi * cutoff / Fs)
+    sections = []
+
+    # 1. One biquad per conjugate pole pair: s^2 + c s + Wc^2, c = -2 Re(p) Wc
+    for k in range(order // 2):
+        p = np.exp(1j * np.pi * (2 * k + order + 1) / (2 * order))
+        c = -2 * p.real * Wc
+        d = Wc ** 2
+        a = [K ** 2 + c * K + d, 2 * d - 2 * K ** 2, K ** 2 - c * K + d]
+        b = [d, 2 * d, d] if kind == 'lowpass' else [K ** 2, -2 * K ** 2, K ** 2]
+        sections.append(b + a)
+
+    # 2. The real pole s = -Wc of an odd order
+    if order % 2:
+        a = [K + Wc, Wc - K, 0.0]
+        b = [Wc, Wc, 0.0] if kind == 'lowpass' else [K, -K, 0.0]
+        sections.append(b + a)
+    return _normalize_sos(sections)
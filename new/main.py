@@ -6,8 +6,8 @@ from new.cosinusodial import createCos
 from new.normalaization import signal_normalization
 from new.sinusoidal import createSin
 from new.subtraction import subtract_signals
-from task_4.dft_idft import run_dft_idft, display_dominant_frequencies, plot_dft_result, remove_dc_component, \
-    modify_dft_components
+from task_4.dft_idft import run_dft_idft, display_dominant_frequencies, plot_dft_result
+from task_4.spectrum_session import SpectrumSession
 from task_one.addition_of_signals import add_signals
 from task_one.display_continuous import draw_continuous
 from task_one.display_discrete import draw_discrete
@@ -19,7 +19,7 @@ import numpy as np
 # It's better to store these in a dictionary for easy look-up by user input
 SIGNAL_DATA = {}
 GENERATED_SIGNAL_DATA = {'x': np.array([0]), 'y': np.array([0])}
-LAST_DFT_RESULT = {'X_complex': None, 'Fs': None, 'N': None}
+LAST_DFT_RESULT = {'X_complex': None, 'Fs': None, 'N': None, 'session': None}
 
 # Global entry variables for Quantization (Declare placeholders)
 quant_sig_entry = None
@@ -241,6 +241,8 @@ def run_dft_analysis():
         LAST_DFT_RESULT['X_complex'] = X_complex
         LAST_DFT_RESULT['Fs'] = Fs
         LAST_DFT_RESULT['N'] = len(y)
+        # Keeps the time-domain reconstruction for O(N) single-bin edits
+        LAST_DFT_RESULT['session'] = SpectrumSession(X_complex=X_complex)
 
         plot_dft_result(f_bins, amp_norm, phase)
         display_dominant_frequencies(f_bins, amp_norm)
@@ -256,13 +258,10 @@ def run_remove_dc():
         messagebox.showwarning("Warning", "Run DFT Analysis first.")
         return
 
-    X_complex = LAST_DFT_RESULT['X_complex']
-    Fs = LAST_DFT_RESULT['Fs']
-
-    X_modified = remove_dc_component(X_complex)
-
-    # Re-analyze and plot the new spectrum
-    f_bins, amp_norm, phase, _ = run_dft_idft(X_modified, Fs, mode='dft')
+    # X[0] = 0 is applied to the stored reconstruction as an O(N) rank-1 update
+    session = LAST_DFT_RESULT['session']
+    session.remove_dc()
+    f_bins, amp_norm, phase, X_modified = session.spectrum()
 
     # Update stored result
     LAST_DFT_RESULT['X_complex'] = X_modified
@@ -325,11 +324,10 @@ def apply_modification_and_update():
             messagebox.showerror("Index Error", f"Component index k must be between 0 and {LAST_DFT_RESULT['N'] - 1}.")
             return
 
-        X_modified = modify_dft_components(LAST_DFT_RESULT['X_complex'], k, new_amplitude, new_phase)
-
-        # Re-analyze and plot the new spectrum
-        Fs = LAST_DFT_RESULT['Fs']
-        f_bins, amp_norm, phase, _ = run_dft_idft(X_modified, Fs, mode='dft')
+        # Apply the edit (and its mirror bin) to the stored reconstruction in O(N)
+        session = LAST_DFT_RESULT['session']
+        session.set_bin(k, new_amplitude, new_phase)
+        f_bins, amp_norm, phase, X_modified = session.spectrum()
 
         # Update stored result
         LAST_DFT_RESULT['X_complex'] = X_modified
@@ -351,12 +349,16 @@ def run_idft_reconstruction():
         return
 
     try:
-        x_indices, y_reconstructed = run_dft_idft(
-            signal_y=None,
-            Fs=LAST_DFT_RESULT['Fs'],
-            mode='idft',
-            X_complex_input=LAST_DFT_RESULT['X_complex']
-        )
+        if LAST_DFT_RESULT['session'] is not None:
+            # The session already holds the reconstruction of the edited spectrum
+            x_indices, y_reconstructed = LAST_DFT_RESULT['session'].reconstruction()
+        else:
+            x_indices, y_reconstructed = run_dft_idft(
+                signal_y=None,
+                Fs=LAST_DFT_RESULT['Fs'],
+                mode='idft',
+                X_complex_input=LAST_DFT_RESULT['X_complex']
+            )
 
         # Assuming draw_discrete is imported and works
         # If draw_discrete is not in scope, you'll need to update imports
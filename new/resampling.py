@@ -0,0 +1,292 @@
+import time
+from fractions import Fraction
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from new.convolution import convolve
+from new.fir_filter import design_fir, kaiser_parameters
+from task_4.precision import as_real
+from task_one.read_load_signals import read_signal_chunks
+
+# --- Rational Resampling (up by L, down by M) ---
+# Textbook form: insert L - 1 zeros between the samples (rate Fs * L),
+# lowpass with h at min(Fs/2, Fs*L/(2M)) to remove the images and prevent
+# aliasing, then keep every M-th sample.  Output m is
+#     y[m] = Sum_j x[j] * h[n0 - j L],    n0 = m M + D
+# (D = (len(h) - 1) / 2 removes the filter delay), so only the taps
+# h[p + k L] with the phase p = n0 mod L meet non-zero samples:
+#     y[m] = Sum_k x[n0 // L - k] * h[p + k L],   k = 0 .. K - 1,  K = ceil(len(h) / L)
+# The polyphase resampler evaluates exactly this: L short filters (one per
+# phase) of K taps: about len(h) / L multiply-adds per output instead of
+# len(h) * M for the naive form.  Outputs with the same phase are M input
+# samples apart, so every phase is one strided matrix-vector product, or,
+# split by input residue r (k = q M + r), M convolutions of the decimated
+# inputs x[j - r :: M] with h[p + (q M + r) L].
+#
+# Anti-alias filter (at the rate Fs * L, R = max(L, M)):
+#     stopband edge at 0.5 / R (the lower Nyquist), passband edge at
+#     (1 - rolloff) * 0.5 / R, Kaiser window for attenuation_db,
+#     gain L (the zeros took away a factor L).
+
+DEFAULT_ATTENUATION_DB = 80.0
+DEFAULT_ROLLOFF = 0.1
+# Largest denominator when a rate ratio is turned into L / M
+MAX_RATIO_DENOMINATOR = 1000
+# Outputs computed per strided product (bounds the memory of one step)
+OUTPUT_CHUNK = 1 << 16
+# Up to L * M sub-phases, every (phase, input residue) pair is one np.convolve
+# at the low rate (compiled, no window copies); above that the L phases use
+# strided matrix-vector products
+SUBPHASE_MAX = 64
+
+
+def rate_ratio(fs_in, fs_out, max_denominator=MAX_RATIO_DENOMINATOR):
+    """(L, M) with L / M = fs_out / fs_in, e.g. 44100 -> 48000 gives (160, 147)."""
+    if fs_in <= 0 or fs_out <= 0:
+        raise ValueError("Sampling rates must be positive.")
+    ratio = Fraction(fs_out / fs_in).limit_denominator(max_denominator)
+    return ratio.numerator, ratio.denominator
+
+
+def design_resampler_filter(L, M, attenuation_db=DEFAULT_ATTENUATION_DB, rolloff=DEFAULT_ROLLOFF):
+    """
+    Anti-alias / anti-image lowpass for resampling by L / M (see the notes above).
+
+    Returns:
+        np.array: Odd number of taps, gain L.
+    """
+    R = max(L, M)
+    if R == 1:
+        return np.ones(1)
+    if not 0 < rolloff < 1:
+        raise ValueError("rolloff must lie between 0 and 1.")
+    nyquist = 0.5 / R
+    cutoff = nyquist * (1 - rolloff / 2)
+    num_taps, beta = kaiser_parameters(attenuation_db, nyquist * rolloff)
+    num_taps |= 1  # odd: integer delay D
+    return L * design_fir(cutoff, 1.0, 'lowpass', num_taps=num_taps, beta=beta)
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational resampler.
+
+    process() returns every output whose input samples have arrived; flush()
+    returns the rest, so all pieces together have ceil(N * L / M) samples and
+    equal resample(x, L, M).
+
+    Attributes:
+        L, M (int): Up and down factors (reduced by their gcd).
+        taps (np.ndarray): The prototype filter at the rate Fs * L.
+        samples_in (int): Input samples fed so far.
+        samples_out (int): Output samples returned so far.
+    """
+
+    def __init__(self, L, M, taps=None, attenuation_db=DEFAULT_ATTENUATION_DB, rolloff=DEFAULT_ROLLOFF):
+        L, M = int(L), int(M)
+        if L < 1 or M < 1:
+            raise ValueError("L and M must be positive integers.")
+        g = gcd(L, M)
+        self.L, self.M = L // g, M // g
+        self.taps = np.asarray(taps, dtype=float) if taps is not None else \
+            design_resampler_filter(self.L, self.M, attenuation_db, rolloff)
+        self.delay = (len(self.taps) - 1) // 2
+
+        # Phase p holds h[p + k L], reversed so it lines up with an ascending window
+        self.K = -(-len(self.taps) // self.L)
+        phases = np.zeros(self.K * self.L)
+        phases[:len(self.taps)] = self.taps
+        self._phases = phases.reshape(self.K, self.L).T[:, ::-1].copy()
+        # ... and split once more by input residue: h[p + (q M + r) L] -> [p, r, q]
+        self._Q = -(-self.K // self.M)
+        subphases = np.zeros((self.L, self._Q * self.M))
+        subphases[:, :self.K] = self._phases[:, ::-1]
+        self._subphases = subphases.reshape(self.L, self._Q, self.M).transpose(0, 2, 1).copy()
+
+        self.samples_in = 0
+        self.samples_out = 0
+        # buffer[0] is input sample number _base (zeros before the start)
+        self._buffer = np.zeros(self.K - 1)
+        self._base = -(self.K - 1)
+        self._flushed = False
+
+    def _outputs(self, m_start, m_end):
+        """Outputs m_start .. m_end - 1 from the buffered input."""
+        L, M, K = self.L, self.M, self.K
+        y = np.empty(m_end - m_start, dtype=self._buffer.dtype)
+        if self.L * self.M <= SUBPHASE_MAX:
+            padded = np.concatenate((np.zeros(self._Q * M, dtype=self._buffer.dtype), self._buffer))
+        else:
+            windows = sliding_window_view(self._buffer, K)
+
+        for t in range(min(L, m_end - m_start)):
+            m0 = m_start + t
+            n0 = m0 * M + self.delay
+            phase = n0 % L
+            # Window of output m0 starts at input n0 // L - K + 1; the next
+            # output of this phase is L outputs = M input samples later
+            first = n0 // L - K + 1 - self._base
+            count = len(range(t, m_end - m_start, L))
+
+            if self.L * self.M <= SUBPHASE_MAX:
+                # Sub-phase r: inputs newest - r, newest - r - M, ... against h_p[q M + r]
+                newest = first + K - 1 + self._Q * M
+                total = np.zeros(count, dtype=y.dtype)
+                for r in range(M):
+                    low = newest - r - (self._Q - 1) * M
+                    total += np.convolve(padded[low:low + (count + self._Q - 1) * M:M],
+                                         self._subphases[phase, r], 'valid')
+                y[t::L] = total
+                continue
+
+            for start in range(0, count, OUTPUT_CHUNK):
+                stop = min(start + OUTPUT_CHUNK, count)
+                rows = windows[first + start * M:first + (stop - 1) * M + 1:M]
+                y[t + start * L:t + stop * L:L] = rows @ self._phases[phase]
+        return y
+
+    def _run(self, available_end):
+        """Computes every output whose last input sample is before available_end."""
+        L, M = self.L, self.M
+        # y[m] needs inputs up to (m M + D) // L  <  available_end
+        m_end = max(-(-(available_end * L - self.delay) // M), self.samples_out)
+        y = self._outputs(self.samples_out, m_end)
+        self.samples_out = m_end
+
+        # Drop the inputs no later output needs
+        keep_from = (m_end * M + self.delay) // L - self.K + 1 - self._base
+        keep_from = min(max(keep_from, 0), len(self._buffer))
+        self._buffer = self._buffer[keep_from:]
+        self._base += keep_from
+        return y
+
+    def process(self, chunk):
+        """Feeds the next input samples and returns the outputs that are ready."""
+        if self._flushed:
+            raise ValueError("The stream was already flushed.")
+        chunk = as_real(chunk).ravel()
+        self.samples_in += len(chunk)
+        self._buffer = np.concatenate((self._buffer, chunk))
+        return self._run(self.samples_in)
+
+    def flush(self):
+        """Ends the input (zeros after it) and returns the last outputs."""
+        self._flushed = True
+        total = -(-self.samples_in * self.L // self.M)
+        if total <= self.samples_out:
+            return np.zeros(0, dtype=self._buffer.dtype)
+        # Inputs up to the one the last output needs, as zeros
+        last_needed = ((total - 1) * self.M + self.delay) // self.L
+        pad = max(last_needed + 1 - (self._base + len(self._buffer)), 0)
+        self._buffer = np.concatenate((self._buffer, np.zeros(pad, dtype=self._buffer.dtype)))
+
+        # The zeros make more outputs computable than the input length allows
+        y = self._run(self._base + len(self._buffer))
+        extra = self.samples_out - total
+        self.samples_out = total
+        return y[:len(y) - extra] if extra > 0 else y
+
+
+def resample(x, L, M, taps=None, attenuation_db=DEFAULT_ATTENUATION_DB, rolloff=DEFAULT_ROLLOFF):
+    """
+    Resamples x by L / M with the polyphase filter.
+
+    Returns:
+        np.array: ceil(len(x) * L / M) samples.
+    """
+    resampler = PolyphaseResampler(L, M, taps, attenuation_db, rolloff)
+    return np.concatenate((resampler.process(x), resampler.flush()))
+
+
+def naive_resample(x, L, M, taps=None):
+    """
+    Reference: zero-stuff by L, filter the whole upsampled signal, keep every M-th sample.
+    Same output as resample(), for comparisons.
+    """
+    g = gcd(int(L), int(M))
+    L, M = int(L) // g, int(M) // g
+    taps = design_resampler_filter(L, M) if taps is None else np.asarray(taps, dtype=float)
+    x = as_real(x)
+    upsampled = np.zeros(len(x) * L, dtype=x.dtype)
+    upsampled[::L] = x
+    filtered = convolve(upsampled, taps)
+    delay = (len(taps) - 1) // 2
+    return filtered[delay::M][:-(-len(x) * L // M)]
+
+
+def stream_resample(source, L, M, chunk_size=65536, **filter_options):
+    """Generator resampling a signal file or an iterable of chunks piece by piece."""
+    if isinstance(source, str):
+        source = read_signal_chunks(source, chunk_size)
+    resampler = PolyphaseResampler(L, M, **filter_options)
+    for chunk in source:
+        if isinstance(chunk, tuple):
+            chunk = chunk[1]
+        y = resampler.process(chunk)
+        if len(y):
+            yield y
+    y = resampler.flush()
+    if len(y):
+        yield y
+
+
+# --- Signals ---
+
+def resample_signal(signal, fs_out=None, L=None, M=None, **filter_options):
+    """
+    Resamples a Signal (new/Signal.py) to fs_out (needs signal.fs) or by L / M.
+
+    The result's indices count samples at the new rate, starting at the
+    same time as the input (start index * L / M, rounded), and its fs is set.
+    """
+    fs_in = getattr(signal, 'fs', None)
+    if fs_out is not None:
+        if fs_in is None:
+            raise ValueError("The signal has no sampling rate (fs); give L and M instead.")
+        L, M = rate_ratio(fs_in, fs_out)
+    elif L is None or M is None:
+        raise ValueError("Give fs_out or both L and M.")
+
+    y = resample(signal.samples, L, M, **filter_options)
+    start = int(round(int(signal.indices[0]) * L / M)) if len(signal.indices) else 0
+    result = type(signal)(np.arange(start, start + len(y)), y,
+                          f"{signal.filename or 'signal'} @ {L}/{M}")
+    result.fs = fs_in * L / M if fs_in is not None else None
+    if fs_out is not None:
+        result.fs = fs_out
+    return result
+
+
+def resample_to_common_rate(signals, fs=None, **filter_options):
+    """
+    Brings signals with known fs to one rate (default: the highest) so that
+    add_signals can combine them.
+    """
+    rates = [getattr(s, 'fs', None) for s in signals]
+    if any(r is None for r in rates):
+        raise ValueError("Every signal needs its sampling rate (fs).")
+    fs = max(rates) if fs is None else fs
+    return [s if r == fs else resample_signal(s, fs, **filter_options) for s, r in zip(signals, rates)]
+
+
+def benchmark(ratios=((160, 147), (3, 2), (1, 4), (4, 1)), N=1 << 16, repeats=3):
+    """Prints the time of the polyphase resampler against naive_resample and their difference."""
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(N)
+    print("L/M\ttaps\tpolyphase (ms)\tnaive (ms)\tspeedup\tmax diff")
+    for L, M in ratios:
+        taps = design_resampler_filter(L, M)
+        times = []
+        for method in (resample, naive_resample):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                y = method(x, L, M, taps)
+            times.append((time.perf_counter() - start) / repeats * 1000)
+        difference = np.max(np.abs(resample(x, L, M, taps) - naive_resample(x, L, M, taps)))
+        print(f"{L}/{M}\t{len(taps)}\t{times[0]:.1f}\t\t{times[1]:.1f}\t\t{times[1] / times[0]:.1f}x\t{difference:.1e}")
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -2,11 +2,12 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 from task_one.read_load_signals import get_signal_body
+from task_4.precision import as_real
 
 import numpy as np
 
 
-def quantize_signal_by_bits(x, y, num_bits):
+def quantize_signal_by_bits(x, y, num_bits, dtype=None):
     """
     Quantizes the signal amplitude using a Mid-Tread (uniform) quantizer,
     calculates quantization error, and displays the results.
@@ -15,7 +16,10 @@ def quantize_signal_by_bits(x, y, num_bits):
         x (np.array): The time/index array.
         y (np.array): The original amplitude array.
         num_bits (int): The number of bits for quantization (N).
+        dtype (optional): 'single' or 'double' precision for the computation
+            (see task_4/precision.py); float32 input stays float32 by default.
     """
+    y = as_real(y, dtype)
     if len(y) == 0:
         print("Cannot quantize an empty signal.")
         return
@@ -60,7 +64,7 @@ def quantize_signal_by_bits(x, y, num_bits):
         # be y_max if the signal is exactly y_max to maintain range, but for simplicity
         # and standard Mid-Tread, we use the center formula and let the clipping handle it.
         # The index i corresponds to the interval [y_min + i*delta, y_min + (i+1)*delta).
-        y_quantized = y_min + (level_index * delta) + (delta / 2)
+        y_quantized = y_min + (level_index.astype(y.dtype) * delta) + (delta / 2)
 
         # Edge Case Correction (Optional but good practice): The highest level L-1
         # should generally map to y_max or very close to it if y_max is an input.
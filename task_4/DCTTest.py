@@ -0,0 +1,40 @@
+import numpy as np
+
+from task_4.dct import DCT_TYPES, dct, dct_matrix, dctn, idct, idctn
+
+# Run from the repository root: python -m task_4.DCTTest
+
+
+def DCTMatchesMatrix(lengths=(1, 2, 3, 8, 15, 64, 101)):
+    """Every type and norm must equal the cosine-matrix product, even and odd N."""
+    rng = np.random.default_rng(0)
+    for N in lengths:
+        x = rng.standard_normal((4, N))
+        for type in DCT_TYPES:
+            for norm in (None, 'ortho'):
+                error = np.max(np.abs(dct(x, type, norm) - x @ dct_matrix(N, type, norm).T))
+                if error > 1e-9 * N:
+                    print(f"DCT Test case failed for N = {N}, type = {type}, norm = {norm}")
+                    return
+    print("DCT Test case passed successfully")
+
+
+def DCTRoundTrip(N=100):
+    """idct(dct(x)) == x for every type and norm, and the 2-D pair along both axes."""
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal((3, N))
+    for type in DCT_TYPES:
+        for norm in (None, 'ortho'):
+            if np.max(np.abs(idct(dct(x, type, norm), type, norm) - x)) > 1e-9:
+                print(f"DCT Round Trip Test case failed for type = {type}, norm = {norm}")
+                return
+    block = rng.standard_normal((16, 24))
+    if np.max(np.abs(idctn(dctn(block, norm='ortho'), norm='ortho') - block)) > 1e-9:
+        print("DCT Round Trip Test case failed for dctn / idctn")
+        return
+    print("DCT Round Trip Test case passed successfully")
+
+
+if __name__ == '__main__':
+    DCTMatchesMatrix()
+    DCTRoundTrip()
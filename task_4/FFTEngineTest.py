@@ -0,0 +1,75 @@
+import numpy as np
+
+from task_4.fft_engine import clear_plan_cache, fft, ifft, irfft, plan_cache_info, rfft
+
+# Run from the repository root: python -m task_4.FFTEngineTest
+
+# Powers of two, radix-3/5 mixed lengths and primes (97, 101, 1009 go through Bluestein)
+LENGTHS = (1, 2, 16, 64, 45, 60, 360, 97, 101, 1009)
+
+
+def _direct_dft(x, inverse=False):
+    """O(N^2) DFT matrix product along the last axis (the inverse includes 1/N)."""
+    N = x.shape[-1]
+    n = np.arange(N)
+    sign = 1 if inverse else -1
+    W = np.exp(sign * 2j * np.pi * np.outer(n, n) / N)
+    return x @ W.T / N if inverse else x @ W.T
+
+
+def FFTMatchesDFT(lengths=LENGTHS):
+    """fft / ifft of a batch of 4 rows equal the direct DFT, row by row, for every kind of N."""
+    rng = np.random.default_rng(0)
+    for N in lengths:
+        x = rng.standard_normal((4, N)) + 1j * rng.standard_normal((4, N))
+        if np.max(np.abs(fft(x) - _direct_dft(x))) > 1e-9 * N:
+            print(f"FFT Test case failed for N = {N}")
+            return
+        if np.max(np.abs(ifft(x) - _direct_dft(x, inverse=True))) > 1e-9:
+            print(f"IFFT Test case failed for N = {N}")
+            return
+        if np.max(np.abs(fft(x[2]) - fft(x)[2])) > 1e-12:
+            print(f"FFT Test case failed for N = {N}, a single row differs from the batch")
+            return
+    print("FFT Test case passed successfully")
+
+
+def RealFFTMatchesDFT(lengths=LENGTHS):
+    """rfft gives the first N//2 + 1 direct DFT bins and irfft brings back the real input."""
+    rng = np.random.default_rng(1)
+    for N in lengths:
+        x = rng.standard_normal((3, N))
+        X_half = rfft(x)
+        if np.max(np.abs(X_half - _direct_dft(x)[:, :N // 2 + 1])) > 1e-9 * N:
+            print(f"RFFT Test case failed for N = {N}")
+            return
+        if np.max(np.abs(irfft(X_half, N) - x)) > 1e-9:
+            print(f"IRFFT Test case failed for N = {N}")
+            return
+    print("RFFT Test case passed successfully")
+
+
+def PlanCacheIsReused(N=97, calls=5):
+    """Repeated transforms of one length build their plans once and then give the same result."""
+    clear_plan_cache()
+    x = np.random.default_rng(2).standard_normal(N)
+    first = fft(x)
+    built = plan_cache_info()["misses"]  # the plan plus Bluestein's power-of-two sub-plans
+    for _ in range(calls - 1):
+        if np.max(np.abs(fft(x) - first)) > 0:
+            print("Plan Cache Test case failed, a cached plan gave another result")
+            return
+    info = plan_cache_info()
+    if info["misses"] != built or info["hits"] < calls - 1:
+        print(f"Plan Cache Test case failed, got {info['misses']} misses after {built} on the first call")
+        return
+    if np.max(np.abs(first - _direct_dft(x))) > 1e-9 * N:
+        print("Plan Cache Test case failed, the cached plan differs from the direct DFT")
+        return
+    print("Plan Cache Test case passed successfully")
+
+
+if __name__ == '__main__':
+    FFTMatchesDFT()
+    RealFFTMatchesDFT()
+    PlanCacheIsReused()
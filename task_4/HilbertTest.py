@@ -0,0 +1,53 @@
+import numpy as np
+
+from task_4.hilbert import StreamingHilbert, analytic_signal, dft_analytic_signal, envelope, \
+    instantaneous_frequency
+
+# Run from the repository root: python -m task_4.HilbertTest
+
+
+def AnalyticMatchesDFT(lengths=(1, 2, 7, 8, 100, 101)):
+    """The FFT analytic signal equals the DFT-matrix one and keeps x as its real part."""
+    rng = np.random.default_rng(0)
+    for N in lengths:
+        x = rng.standard_normal(N)
+        z = analytic_signal(x)
+        if np.max(np.abs(z - dft_analytic_signal(x))) > 1e-9 or np.max(np.abs(z.real - x)) > 1e-12:
+            print(f"Analytic Signal Test case failed for N = {N}")
+            return
+    print("Analytic Signal Test case passed successfully")
+
+
+def HilbertToneFeatures(N=4096, f=0.05):
+    """An AM tone gives back its envelope and its frequency away from the ends."""
+    n = np.arange(N)
+    true_envelope = 1 + 0.5 * np.cos(2 * np.pi * n / 1024)
+    x = true_envelope * np.cos(2 * np.pi * f * n)
+    inner = slice(256, N - 256)
+    env_error = np.max(np.abs(envelope(x) - true_envelope)[inner])
+    freq_error = np.max(np.abs(instantaneous_frequency(x, Fs=1000.0) - 1000.0 * f)[inner])
+    if env_error > 1e-2 or freq_error > 1.0:
+        print(f"Hilbert Tone Test case failed (envelope error {env_error:.1e}, frequency error {freq_error:.1e} Hz)")
+        return
+    print("Hilbert Tone Test case passed successfully")
+
+
+def HilbertStreamIsEqual(N=20000):
+    """Streaming in uneven chunks equals the chunked mode, whose real part is still x."""
+    x = np.random.default_rng(1).standard_normal(N)
+    chunked = analytic_signal(x, block_size=1000, overlap=200)
+    streamer = StreamingHilbert(1000, 200)
+    streamed = np.concatenate([streamer.process(c) for c in np.array_split(x, 37)] + [streamer.flush()])
+    if len(streamed) != N or np.max(np.abs(streamed - chunked)) > 1e-12:
+        print("Hilbert Stream Test case failed, streamed output differs from the chunked mode")
+        return
+    if np.max(np.abs(chunked.real - x)) > 1e-12:
+        print("Hilbert Stream Test case failed, the real part is not the input")
+        return
+    print("Hilbert Stream Test case passed successfully")
+
+
+if __name__ == '__main__':
+    AnalyticMatchesDFT()
+    HilbertToneFeatures()
+    HilbertStreamIsEqual()
@@ -0,0 +1,40 @@
+import numpy as np
+
+from task_4.stft import StreamingSTFT, istft, stft
+
+# Run from the repository root: python -m task_4.STFTTest
+
+
+def STFTRoundTrip(N=5000, frame_length=256):
+    """istft(stft(x)) == x, and streaming in uneven chunks gives the one-shot frames."""
+    x = np.random.default_rng(0).standard_normal(N)
+    times, _, Z = stft(x, frame_length=frame_length)
+    if np.max(np.abs(istft(Z, frame_length, length=N) - x)) > 1e-9:
+        print("STFT Round Trip Test case failed, istft does not rebuild the input")
+        return
+    streamer = StreamingSTFT(frame_length=frame_length)
+    parts = [streamer.process(c) for c in np.array_split(x, 7)] + [streamer.flush()]
+    streamed = np.concatenate([Z_part for _, Z_part in parts])
+    if streamed.shape != Z.shape or np.max(np.abs(streamed - Z)) > 1e-12:
+        print("STFT Round Trip Test case failed, streamed frames differ from the one-shot frames")
+        return
+    print("STFT Round Trip Test case passed successfully")
+
+
+def STFTKeepsPrecision(N=5000, Fs=8000.0):
+    """float32 input gives complex64 frames and float32 axes, close to the float64 result."""
+    x = np.random.default_rng(1).standard_normal(N)
+    times, freqs, Z = stft(x.astype(np.float32), Fs=Fs)
+    if Z.dtype != np.complex64 or times.dtype != np.float32 or freqs.dtype != np.float32:
+        print(f"STFT Precision Test case failed, got {Z.dtype}, {times.dtype} and {freqs.dtype}")
+        return
+    _, _, Z64 = stft(x, Fs=Fs)
+    if Z64.dtype != np.complex128 or np.max(np.abs(Z - Z64)) > 1e-5 * np.max(np.abs(Z64)):
+        print("STFT Precision Test case failed, single precision differs from double precision")
+        return
+    print("STFT Precision Test case passed successfully")
+
+
+if __name__ == '__main__':
+    STFTRoundTrip()
+    STFTKeepsPrecision()
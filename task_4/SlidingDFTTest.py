@@ -0,0 +1,37 @@
+import numpy as np
+
+from task_4.dft_idft import run_sliding_dft
+from task_4.fft_engine import fft
+
+# Run from the repository root: python -m task_4.SlidingDFTTest
+
+
+def SlidingDFTMatchesFFT(N=64, length=600, step=7):
+    """Every streamed window spectrum must equal the FFT of that window."""
+    x = np.random.default_rng(0).standard_normal(length)
+    for count, (_, amplitude, phase) in enumerate(run_sliding_dft(x, N, step=step, resync_interval=256)):
+        start = count * step
+        X = fft(x[start:start + N])
+        error = np.max(np.abs(amplitude * np.exp(1j * phase) - X))
+        if error > 1e-8:
+            print(f"Sliding DFT Test case failed, window {start} differs from the FFT by {error:.1e}")
+            return
+    print("Sliding DFT Test case passed successfully")
+
+
+def SlidingDFTShortSignal(N=8):
+    """A source shorter than the window must raise a ValueError, not a RuntimeError."""
+    try:
+        next(run_sliding_dft(iter([1.0, 2.0, 3.0]), N))
+    except ValueError:
+        print("Sliding DFT Short Signal Test case passed successfully")
+        return
+    except Exception as e:
+        print(f"Sliding DFT Short Signal Test case failed, got {type(e).__name__}: {e}")
+        return
+    print("Sliding DFT Short Signal Test case failed, no error was raised")
+
+
+if __name__ == '__main__':
+    SlidingDFTMatchesFFT()
+    SlidingDFTShortSignal()
@@ -0,0 +1,213 @@
+import time
+
+import numpy as np
+
+from task_4.fft_engine import fft, rfft, irfft
+from task_4.precision import as_real
+
+# --- Discrete Cosine Transforms through the FFT ---
+# Definitions (norm=None, the same scaling as SciPy):
+#     DCT-II:   X[k] = 2 Sum_n x[n] cos(pi k (2n + 1) / (2N))
+#     DCT-III:  y[k] = x[0] + 2 Sum_{n>=1} x[n] cos(pi n (2k + 1) / (2N))
+#     DCT-IV:   y[k] = 2 Sum_n x[n] cos(pi (2n + 1)(2k + 1) / (4N))
+# DCT-III(DCT-II(x)) = 2N x and DCT-IV(DCT-IV(x)) = 2N x.  norm='ortho'
+# scales them to orthonormal matrices (DCT-II row 0 by sqrt(1/(4N)), the
+# others by sqrt(1/(2N)); DCT-IV by sqrt(1/(2N))), so DCT-III is the inverse
+# (transpose) of DCT-II and DCT-IV is its own inverse.
+#
+# DCT-II (Makhoul): reorder v = [x[0], x[2], x[4], ..., x[5], x[3], x[1]],
+# V = FFT(v), then with W = exp(-j pi / (2N)):
+#     X[k] = 2 Re(W^k V[k]),   X[N - k] = -2 Im(W^k V[k])
+# so the N//2 + 1 bins of one real FFT give all N outputs.
+# DCT-III runs these steps backwards:
+#     V[k] = 1/2 W^-k (X[k] - j X[N - k])  (X[N] = 0),  v = IRFFT(V),  undo the order.
+# DCT-IV, N even: z[m] = (x[2m] + j x[N-1-2m]) exp(-j pi m / N), m < N/2, and
+#     C = exp(-j pi (4p + 1) / (4N)) * FFT_{N/2}(z)[p]
+#     y[2p] = 2 Re C[p],   y[N-1-2p] = -2 Im C[p]
+# (odd N: one 2N-point FFT of x[n] exp(-j pi n / (2N))).
+# All transforms work along one axis of a batch and cost O(N log N) instead
+# of the O(N^2) of the cosine matrix.
+
+DCT_TYPES = (2, 3, 4)
+
+
+def _check(type, norm):
+    if type not in DCT_TYPES:
+        raise ValueError("type must be 2, 3 or 4.")
+    if norm not in (None, 'ortho'):
+        raise ValueError("norm must be None or 'ortho'.")
+
+
+def _ortho_scale(N, type, dtype):
+    """Per-coefficient factors of the orthonormal DCT-II / DCT-IV."""
+    scale = np.full(N, np.sqrt(1.0 / (2 * N)), dtype=dtype)
+    if type == 2:
+        scale[0] = np.sqrt(1.0 / (4 * N))
+    return scale
+
+
+def _dct2(x):
+    N = x.shape[-1]
+    # 1. Even samples forwards, odd samples backwards
+    v = np.concatenate((x[..., ::2], x[..., 1::2][..., ::-1]), axis=-1)
+
+    # 2. Half spectrum, rotated by W^k
+    k = np.arange(N // 2 + 1)
+    z = rfft(v) * np.exp(-1j * np.pi * k / (2 * N)).astype(np.result_type(x, np.complex64))
+
+    # 3. X[k] from the real part, X[N - k] from the imaginary part
+    X = np.empty(x.shape, dtype=x.dtype)
+    X[..., :N // 2 + 1] = 2 * z.real
+    upper = (N - 1) // 2
+    if upper:
+        X[..., N - upper:] = (-2 * z.imag[..., 1:upper + 1])[..., ::-1]
+    return X
+
+
+def _dct2_inverse(X):
+    """Inverse of the unnormalized _dct2 (= DCT-III / 2N)."""
+    N = X.shape[-1]
+    k = np.arange(N // 2 + 1)
+    # X[N - k] for k = 0..N/2, with X[N] = 0
+    mirrored = np.concatenate((np.zeros(X.shape[:-1] + (1,), dtype=X.dtype),
+                               X[..., N - 1:N - N // 2 - 1:-1]), axis=-1)
+    V = 0.5 * np.exp(1j * np.pi * k / (2 * N)) * (X[..., :N // 2 + 1] - 1j * mirrored)
+    v = irfft(V.astype(np.result_type(X, np.complex64)), N)
+
+    x = np.empty(X.shape, dtype=X.dtype)
+    x[..., ::2] = v[..., :(N + 1) // 2]
+    x[..., 1::2] = v[..., ::-1][..., :N // 2]
+    return x
+
+
+def _dct4(x):
+    N = x.shape[-1]
+    cdtype = np.result_type(x, np.complex64)
+    if N % 2:
+        n = np.arange(N)
+        spectrum = fft(np.concatenate((x * np.exp(-1j * np.pi * n / (2 * N)).astype(cdtype),
+                                       np.zeros(x.shape, dtype=cdtype)), axis=-1))[..., :N]
+        return 2 * (np.exp(-1j * np.pi * (2 * n + 1) / (4 * N)) * spectrum).real.astype(x.dtype)
+
+    M = N // 2
+    m = np.arange(M)
+    z = (x[..., ::2] + 1j * x[..., ::-2]) * np.exp(-1j * np.pi * m / N)
+    C = np.exp(-1j * np.pi * (4 * m + 1) / (4 * N)) * fft(z.astype(cdtype))
+    y = np.empty(x.shape, dtype=x.dtype)
+    y[..., ::2] = 2 * C.real
+    y[..., ::-2] = -2 * C.imag
+    return y
+
+
+def dct(x, type=2, norm=None, axis=-1):
+    """
+    Discrete cosine transform (types II, III, IV) along one axis.
+
+    Args:
+        x (np.array): Samples, any shape (e.g. a batch of signals (B, N)).
+        type (int): 2, 3 or 4.
+        norm (str or None): None (unnormalized) or 'ortho'.
+        axis (int): Axis to transform.
+
+    Returns:
+        np.array: The coefficients, same shape as x.
+    """
+    _check(type, norm)
+    if np.iscomplexobj(x):
+        return dct(np.real(x), type, norm, axis) + 1j * dct(np.imag(x), type, norm, axis)
+    x = np.moveaxis(as_real(x), axis, -1)
+    N = x.shape[-1]
+    if N == 0:
+        return np.moveaxis(x.copy(), -1, axis)
+
+    if type == 2:
+        y = _dct2(x)
+        if norm == 'ortho':
+            y *= _ortho_scale(N, 2, y.dtype)
+    elif type == 3:
+        # DCT-III = 2N * inverse DCT-II; the orthonormal one is its transpose
+        if norm == 'ortho':
+            y = _dct2_inverse(x / _ortho_scale(N, 2, x.dtype))
+        else:
+            y = 2 * N * _dct2_inverse(x)
+    else:
+        y = _dct4(x)
+        if norm == 'ortho':
+            y *= _ortho_scale(N, 4, y.dtype)
+    return np.moveaxis(y, -1, axis)
+
+
+def idct(X, type=2, norm=None, axis=-1):
+    """
+    Inverse of dct(x, type, norm, axis), so idct(dct(x, t, n), t, n) == x.
+    """
+    _check(type, norm)
+    N = np.shape(X)[axis]
+    inverse_type = {2: 3, 3: 2, 4: 4}[type]
+    y = dct(X, inverse_type, norm, axis)
+    return y if norm == 'ortho' else y / (2 * N)
+
+
+def dctn(x, type=2, norm=None, axes=(-2, -1)):
+    """Separable multi-dimensional DCT (e.g. 2-D blocks), one axis after the other."""
+    for axis in axes:
+        x = dct(x, type, norm, axis)
+    return x
+
+
+def idctn(X, type=2, norm=None, axes=(-2, -1)):
+    """Inverse of dctn."""
+    for axis in axes:
+        X = idct(X, type, norm, axis)
+    return X
+
+
+# --- Reference and Benchmark ---
+
+def dct_matrix(N, type=2, norm=None):
+    """The N x N cosine matrix of the transform (y = C @ x), for checks and the benchmark."""
+    _check(type, norm)
+    n = np.arange(N)
+    if type == 2:
+        C = 2 * np.cos(np.pi * n[:, None] * (2 * n[None, :] + 1) / (2 * N))
+    elif type == 3:
+        C = 2 * np.cos(np.pi * n[None, :] * (2 * n[:, None] + 1) / (2 * N))
+        C[:, 0] = 1.0
+    else:
+        C = 2 * np.cos(np.pi * (2 * n[:, None] + 1) * (2 * n[None, :] + 1) / (4 * N))
+    if norm == 'ortho':
+        scale = _ortho_scale(N, 2 if type in (2, 3) else 4, float)
+        C = C * scale[:, None] if type != 3 else C / (2 * N) / scale[None, :]
+    return C
+
+
+def matrix_dct(x, type=2, norm=None, axis=-1):
+    """O(N^2) DCT by the cosine matrix."""
+    x = np.moveaxis(as_real(x), axis, -1)
+    return np.moveaxis(x @ dct_matrix(x.shape[-1], type, norm).T, -1, axis)
+
+
+def benchmark(sizes=(64, 256, 1024, 4096), batch=64, repeats=5):
+    """Prints the time of dct against matrix_dct for a batch of signals, and their difference."""
+    rng = np.random.default_rng(0)
+    print("N\ttype\tFFT (ms)\tmatrix (ms)\tspeedup\tmax diff")
+    for N in sizes:
+        x = rng.standard_normal((batch, N))
+        for type in DCT_TYPES:
+            dct(x, type)  # build the plans
+            start = time.perf_counter()
+            for _ in range(repeats):
+                fast = dct(x, type, 'ortho')
+            fast_time = (time.perf_counter() - start) / repeats * 1000
+
+            C = dct_matrix(N, type, 'ortho')  # building the matrix is not timed
+            start = time.perf_counter()
+            for _ in range(repeats):
+                slow = x @ C.T
+            slow_time = (time.perf_counter() - start) / repeats * 1000
+            print(f"{N}\t{type}\t{fast_time:.2f}\t\t{slow_time:.2f}\t\t{slow_time / fast_time:.1f}x"
+                  f"\t{np.max(np.abs(fast - slow)):.1e}")
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -1,10 +1,15 @@
+from itertools import islice
+
 import numpy as np
 import matplotlib.pyplot as plt
 from tkinter import messagebox
-from task_one.read_load_signals import get_signal_body
+from task_4.fft_engine import fft, ifft, rfft, irfft, hermitian_extend
+from task_4.sliding_dft import SlidingDFT
+from task_4.precision import as_real, as_complex
+from task_4.spectrum import Spectrum
+from task_4.peaks import find_peaks
 
-# --- Manual DFT and IDFT Core Implementation ---
-import cmath
+# --- DFT and IDFT Core Implementation (FFT based) ---
 import math
 
 
@@ -12,72 +17,39 @@ def fourier_transform(y, type):
     """
     Calculates either the DFT (type='dft') or IDFT (type='idft').
     Returns: (Mag, Phase) for DFT, or (Time_Samples) for IDFT.
+
+    Both directions run on the mixed-radix FFT engine in O(N log N).
     """
     N = len(y)
 
     # --- IDFT: Inverse Discrete Fourier Transform ---
     if type == "idft":
-        X = y  # Input y is now the frequency-domain signal X[k]
-        x_n = []  # This will hold the time-domain signal x[n]
-
-        # Outer loop: Iterates over time samples n (n = 0 to N-1)
-        for n in range(N):
-            buffer = 0 + 0j
-
-            # Inner loop: Iterates over frequency bins k (k = 0 to N-1)
-            for k in range(N):
-                comp = 2 * math.pi * n * k
-                comp = comp / N
-                complex_num = complex(0, comp)  # POSITIVE sign here
-                c = X[k] * cmath.exp(complex_num)
-                buffer += c
+        if N == 0:
+            return []
+        # Input y is the frequency-domain signal X[k]
+        x_n = ifft(y)
 
-            final_sample = buffer / N
-            x_n.append(final_sample.real)
-
-        # --- FIX ---
         # The IDFT returns the time-domain signal itself,
         # NOT the magnitude and phase of it.
-        return x_n  # Returns a single list of real (float) time-domain samples
+        return np.real(x_n).tolist()  # Returns a single list of real (float) time-domain samples
     # --- DFT: Forward Discrete Fourier Transform ---
     elif type == "dft":
-        # Input y is the time-domain signal x[n]
-        new_y = []  # Holds the complex results X[k]
-
-        # Step 1: Calculate the DFT (k and n loops remain correct)
-        for k in range(N):
-            buffer = 0 + 0j
-            for n in range(N):
-                comp = 2 * math.pi * n * k
-                comp = comp / N
-                complex_num = complex(0, -comp)  # Negative sign for DFT
-
-                c = y[n] * cmath.exp(complex_num)
-                buffer += c
-            new_y.append(buffer)
-
-        # Step 2: Convert to Polar Form and Destructure Output (Returns floats for comparison)
-        raw_magnitudes = []
-        raw_phases = []
+        if N == 0:
+            return [], []
+        # Step 1: Calculate the DFT of the time-domain signal x[n]
+        new_y = fft(y)
+
+        # Step 2: Convert to Polar Form (Returns floats for comparison)
+        raw_magnitudes = np.abs(new_y)
+        raw_phases = np.angle(new_y)
         TOLERANCE = 1e-12
 
-        for z in new_y:
-            magnitude = abs(z)
-            phase = cmath.phase(z)
-
-            # Apply tolerance cleanup directly to the float values
-            if abs(magnitude) < TOLERANCE:
-                magnitude = 0.0
-            # ... (rest of the tolerance logic) ...
-            if abs(phase) < TOLERANCE:
-                phase = 0.0
-            if abs(phase - math.pi) < TOLERANCE:
-                phase = -math.pi
-
-            raw_magnitudes.append(magnitude)
-            raw_phases.append(phase)
+        # Apply tolerance cleanup directly to the float values
+        raw_magnitudes[raw_magnitudes < TOLERANCE] = 0.0
+        raw_phases[np.abs(raw_phases) < TOLERANCE] = 0.0
+        raw_phases[np.abs(raw_phases - math.pi) < TOLERANCE] = -math.pi
 
-        return raw_magnitudes, raw_phases
+        return raw_magnitudes.tolist(), raw_phases.tolist()
 
     return [], []  # Return empty lists if type is not recognized
 
@@ -92,64 +64,81 @@ def fourier_transform(y, type):
 
 def manual_dft(signal_y):
     """
-    Performs the Discrete Fourier Transform (DFT) manually using the summation formula.
+    Performs the Discrete Fourier Transform (DFT) with the FFT engine.
     X[k] = Sum_{n=0}^{N-1} x[n] * e^(-j * 2 * pi * k * n / N)
+
+    Any length N (including primes) is handled in O(N log N) and
+    exactly N bins are returned, no zero padding is applied.
+    Real signals only compute the N/2 + 1 bins k = 0..N/2, the rest
+    are filled in from X[N-k] = conj(X[k]).
     """
     N = len(signal_y)
     if N == 0:
         return np.array([], dtype=complex)
 
-    X_complex = np.zeros(N, dtype=complex)
-
-    for k in range(N):  # Loop through the frequency bins (k)
-        sum_val = 0j
-        for n in range(N):  # Loop through the time samples (n)
-            # Calculate the exponent term: e^(-j * 2 * pi * k * n / N)
-            exponent = -2j * np.pi * k * n / N
-            sum_val += signal_y[n] * np.exp(exponent)
-
-        X_complex[k] = sum_val
-
-    return X_complex
+    if np.isrealobj(signal_y):
+        return hermitian_extend(manual_rdft(signal_y), N)
+    return fft(signal_y)
 
 def manual_idft(X_complex):
     """
-    Performs the Inverse Discrete Fourier Transform (IDFT) manually
-    using the summation formula. (FIXED: Rounds final output for precision.)
+    Performs the Inverse Discrete Fourier Transform (IDFT) with the FFT engine.
+    x[n] = (1/N) * Sum_{k=0}^{N-1} X[k] * e^(j * 2 * pi * k * n / N)
+
+    Only the real part of x[n] is kept, which equals the IDFT of the
+    Hermitian part (X[k] + conj(X[N-k])) / 2 of the spectrum, so the
+    samples are rebuilt straight from its N/2 + 1 bins k = 0..N/2.
     """
     N = len(X_complex)
     if N == 0:
         return np.array([])
 
-    x_reconstructed = np.zeros(N, dtype=complex)
+    real_reconstructed = manual_irdft(hermitian_half(X_complex), N)
 
-    for n in range(N):  # Loop through the time samples (n)
-        sum_val = 0j
-        for k in range(N):  # Loop through the frequency bins (k)
-            # Calculate the exponent term: e^(j * 2 * pi * k * n / N)
-            exponent = 2j * np.pi * k * n / N
-            sum_val += X_complex[k] * np.exp(exponent)
+    # --- CRITICAL IDFT FIX: Round to 4 decimal places to match test tolerance (0.001) ---
+    return np.round(real_reconstructed, 4)
 
-        # The IDFT formula requires division by N
-        x_reconstructed[n] = (1 / N) * sum_val
+def hermitian_half(X_complex):
+    """
+    Returns the bins k = 0..N/2 of the Hermitian part (X[k] + conj(X[N-k])) / 2,
+    i.e. the half spectrum of the real part of the IDFT of X.
+    """
+    X_complex = as_complex(X_complex)
+    N = len(X_complex)
+    k = np.arange(N // 2 + 1)
+    return 0.5 * (X_complex[k] + np.conj(X_complex[(N - k) % N]))
 
-    real_reconstructed = np.real(x_reconstructed)
+def manual_rdft(signal_y):
+    """
+    Real-input DFT: returns only the N//2 + 1 bins k = 0..N/2 of a real signal.
+    Half the time and memory of the full complex DFT.
+    """
+    if len(signal_y) == 0:
+        return np.array([], dtype=complex)
+    return rfft(signal_y)
 
-    x = np.arange(np.round(real_reconstructed, 4))
-    # --- CRITICAL IDFT FIX: Round to 4 decimal places to match test tolerance (0.001) ---
-    #return np.round(real_reconstructed, 4)
-    plt.plot(x, np.round(real_reconstructed, 4))
-    plt.title(f"reconstructed signal")
-    plt.xlabel("Time [s]")
-    plt.ylabel("Amplitude")
-    plt.show()
+def manual_irdft(X_half, N):
+    """
+    Inverse of manual_rdft: rebuilds the N real samples from the bins k = 0..N/2.
+    """
+    if N == 0:
+        return np.array([])
+    return irfft(X_half, N)
 
 
-# --- Main run_dft_idft function updated to use manual methods ---
+# --- Main run_dft_idft function updated to use the FFT engine ---
 
-def run_dft_idft(signal_y, Fs, mode='dft', X_complex_input=None):
+def run_dft_idft(signal_y, Fs, mode='dft', X_complex_input=None, dtype=None, lazy=False):
     """
-    Performs DFT or IDFT using manual summation methods with precision fixes.
+    Performs DFT or IDFT with the FFT engine (O(N log N) for any N) and precision fixes.
+
+    dtype: 'single' or 'double' for this call (see task_4/precision.py);
+    by default float32 input stays float32/complex64 and anything else
+    follows the global precision policy.
+
+    lazy: In 'dft' mode return a Spectrum (task_4/spectrum.py) instead of the
+    tuple; amplitude, phase and rounding are only computed when accessed,
+    and unpacking it still gives (k_indices, amplitude, phase, X_complex).
     """
 
     # --- DFT Mode: Time Samples -> Frequency Components ---
@@ -158,24 +147,19 @@ def run_dft_idft(signal_y, Fs, mode='dft', X_complex_input=None):
             messagebox.showerror("DFT Error", "Input signal_y cannot be empty.")
             return (np.array([]),) * 4
 
-        N = len(signal_y)
+        signal_y = as_real(signal_y, dtype) if np.isrealobj(signal_y) else as_complex(signal_y, dtype)
 
-        # 1. Compute DFT using the manual method
+        # 1. Compute DFT (exactly N bins)
         X_complex = manual_dft(signal_y)
+        spectrum = Spectrum(X_complex, Fs)
+        if lazy:
+            return spectrum
 
-        # 2. Extract Amplitude and Phase
-        amplitude = np.abs(X_complex)
-        phase = np.angle(X_complex)  # Phase in Radians
-
-        # --- CRITICAL DFT FIX: Round the amplitude and phase to 4 decimal places ---
+        # 2. Amplitude, Phase (radians) and the Discrete DFT Index 'k' (0 to N-1) as the X-axis
+        # --- CRITICAL DFT FIX: Amplitude and phase are rounded to 4 decimal places ---
         # This is necessary to satisfy the strict floating-point comparisons in the test.
-        amplitude = np.round(amplitude, 4)
-        phase = np.round(phase, 4)
-
-        # 3. Use the Discrete DFT Index 'k' (0 to N-1) as the X-axis
-        k_indices = np.arange(N)
-
-        return k_indices, amplitude, phase, X_complex
+        # Spectrum rounds them in place, without keeping unrounded copies.
+        return tuple(spectrum)
 
     # --- IDFT Mode: Frequency Components -> Time Samples ---
     elif mode == 'idft':
@@ -185,8 +169,8 @@ def run_dft_idft(signal_y, Fs, mode='dft', X_complex_input=None):
 
         N = len(X_complex_input)
 
-        # 1. Compute IDFT using the manual method (which includes rounding)
-        x_reconstructed = manual_idft(X_complex_input)
+        # 1. Compute IDFT (which includes rounding)
+        x_reconstructed = manual_idft(as_complex(X_complex_input, dtype))
 
         # 2. Create Time Index 'n' (Discrete Indices)
         x_indices = np.arange(N)
@@ -197,6 +181,97 @@ def run_dft_idft(signal_y, Fs, mode='dft', X_complex_input=None):
         messagebox.showerror("Mode Error", "Mode must be 'dft' or 'idft'.")
         return None, None
 
+def run_sliding_dft(signal_y, N, Fs=None, step=1, resync_interval=None):
+    """
+    Streams the spectrum of a moving N-sample window over signal_y.
+    The first window is transformed once; after that each new sample costs O(N).
+
+    Args:
+        signal_y (iterable): Time-domain samples (any iterable, e.g. a live source).
+        N (int): Window length.
+        Fs (float, optional): Sampling frequency; if given bins are reported in Hz.
+        step (int): Yield the spectrum every `step` new samples.
+        resync_interval (int, optional): Samples between exact FFT recomputations.
+
+    Yields:
+        tuple: (k_indices or f_bins, amplitude, phase) of the current window, ready
+               for display_dominant_frequencies.
+    """
+    samples = iter(signal_y)
+    first_window = list(islice(samples, N))
+    if len(first_window) < N:
+        raise ValueError(f"The signal has {len(first_window)} samples, fewer than the window length N = {N}.")
+    sdft = SlidingDFT(first_window, resync_interval=resync_interval)
+
+    k_indices = np.arange(N)
+    x_axis = k_indices * Fs / N if Fs is not None else k_indices
+
+    yield x_axis, sdft.amplitude(), sdft.phase()
+    for count, x_new in enumerate(samples, start=1):
+        sdft.update(x_new)
+        if count % step == 0:
+            yield x_axis, sdft.amplitude(), sdft.phase()
+
+
+# --- Batched DFT over many equal-length signals ---
+
+# Working memory of one row while it is transformed, in complex samples per
+# input sample (input copy, FFT stage temporaries and the output).
+BATCH_WORK_FACTOR = 6
+
+
+def batch_chunk_rows(N, memory_budget):
+    """Number of length-N rows transformed together so one chunk fits in memory_budget bytes."""
+    row_bytes = N * np.dtype(complex).itemsize * BATCH_WORK_FACTOR
+    return max(1, int(memory_budget // max(row_bytes, 1)))
+
+
+def run_batch_dft(signals, Fs=None, memory_budget=64 * 1024 * 1024):
+    """
+    Performs the DFT of M equal-length signals in one vectorized pass per chunk of rows.
+
+    Args:
+        signals: (M, N) array of samples, or a list of Signal objects (new/Signal.py).
+        Fs (float, optional): Sampling frequency in Hz. If given, the first return
+            value holds the bin frequencies k * Fs / N instead of the indices k.
+        memory_budget (int): Bytes of working memory per chunk; sets the chunk size.
+
+    Returns:
+        tuple: (k_indices or f_bins, amplitude (M, N), phase (M, N), X_complex (M, N)).
+               Each row matches run_dft_idft (amplitude and phase rounded to 4 decimals).
+    """
+    if len(signals) > 0 and hasattr(signals[0], 'samples'):
+        lengths = {len(sig.samples) for sig in signals}
+        if len(lengths) != 1:
+            raise ValueError(f"All signals must have the same length, got lengths {sorted(lengths)}.")
+        signals = np.stack([sig.samples for sig in signals])
+
+    signals = np.asarray(signals)
+    if signals.ndim != 2:
+        raise ValueError("signals must be an (M, N) array or a list of Signal objects.")
+
+    M, N = signals.shape
+    X_complex = np.empty((M, N), dtype=complex)
+    rows = batch_chunk_rows(N, memory_budget)
+
+    # 1. Transform chunk by chunk (real signals only compute the bins k = 0..N/2)
+    for start in range(0, M, rows):
+        chunk = signals[start:start + rows]
+        if np.isrealobj(chunk):
+            X_complex[start:start + rows] = hermitian_extend(rfft(chunk), N)
+        else:
+            X_complex[start:start + rows] = fft(chunk)
+
+    # 2. Extract Amplitude and Phase (rounded like run_dft_idft)
+    amplitude = np.round(np.abs(X_complex), 4)
+    phase = np.round(np.angle(X_complex), 4)
+
+    # 3. X-axis: discrete index k, or frequency in Hz when Fs is given
+    k_indices = np.arange(N)
+    x_axis = k_indices * Fs / N if Fs is not None else k_indices
+
+    return x_axis, amplitude, phase, X_complex
+
 # -------------------------------------------------------------
 # --- Utility Functions (Provided in your original file structure) ---
 # -------------------------------------------------------------
@@ -228,6 +303,7 @@ def plot_dft_result(x_axis, y_amplitude, y_phase):
 def remove_dc_component(X_complex):
     """
     Removes the DC component (average value) from the signal by setting X[0] to 0.
+    X[0] is its own mirror bin, so the spectrum stays conjugate symmetric.
 
     Returns:
         np.array: The modified complex DFT array.
@@ -248,43 +324,58 @@ def remove_dc_component(X_complex):
 # functions like display_dominant_frequencies will require normalization
 # if they rely on a threshold like 0.5.
 
-def display_dominant_frequencies(k_indices, amplitude):
-    """
-    Displays the dominant frequencies based on an arbitrary threshold (e.g., > 10% of max amplitude).
-    NOTE: Using k_indices instead of f_bins for discrete format.
+def display_dominant_frequencies(k_indices, amplitude, psd=None, top_k=10, one_sided=False):
     """
-    if len(amplitude) == 0:
-        print("\nNo DFT amplitude data to analyze.")
-        return
+    Prints the dominant frequencies: the top_k largest spectral peaks (local
+    maxima) above 10% of the maximum amplitude, with parabolic sub-bin
+    interpolation (see task_4/peaks.py). Runs headless, nothing is plotted.
+    NOTE: The positions are reported on the k_indices axis (k or Hz).
 
-    # To find "dominant" components without a hardcoded 0.5 threshold on a 0-1 scale,
-    # we'll use a relative threshold (e.g., 10% of the maximum raw amplitude).
-    max_amplitude = np.max(amplitude)
-    relative_threshold = max_amplitude * 0.1
+    psd (optional): (freqs_hz, power) from task_4.welch.welch(). The averaged
+    PSD is used instead of the single noisy DFT and frequencies print in Hz.
+    one_sided: Skip the mirrored bins k > N/2 of a real signal.
 
-    dominant_indices = np.where(amplitude > relative_threshold)[0]
+    Returns:
+        tuple: (positions, amplitudes) of the peaks, or None if there are none.
+    """
+    N = None
+    if psd is not None:
+        k_indices, amplitude = psd
+        title, value_label = "Welch PSD", "Power/Hz"
+        # One-sided bins 0..Fs/2: DC and Nyquist are edges, not neighbours
+        N, one_sided = 2 * (len(amplitude) - 1), True
+    else:
+        title, value_label = "DFT", "Amplitude"
 
-    if len(dominant_indices) == 0:
-        print(f"\nNo dominant components found (Amplitude > {relative_threshold:.4f}).")
+    if amplitude is None or len(amplitude) == 0:
+        print(f"\nNo {title} data to analyze.")
         return
 
+    # Relative threshold: 10% of the maximum amplitude
+    _, peak_values, _, bins = find_peaks(amplitude, top_k, N=N, threshold=0.1, one_sided=one_sided)
+    found = ~np.isnan(bins)
+    if not np.any(found):
+        print(f"\nNo dominant components found (Amplitude > {0.1 * np.max(amplitude):.4f}).")
+        return
 
-    x = np.arange(len(dominant_indices))
+    # Fractional bins -> positions on the given axis
+    positions = np.interp(bins[found], np.arange(len(k_indices)), k_indices)
+    peak_values = peak_values[found]
 
-    for i in dominant_indices:
-        if i > 0.5:
-            print(dominant_indices[i])
-    # Plot the signal
-    plt.plot(x, dominant_indices)
-    plt.title(f"idft frequency")
-    plt.xlabel("Time [s]")
-    plt.ylabel("Amplitude")
-    plt.show()
+    print(f"\n--- Dominant Frequencies ({title}) ---")
+    print(f"Position\t{value_label}")
+    for position, value in zip(positions, peak_values):
+        print(f"{position:.4f}\t{value:.6g}")
+    return positions, peak_values
 
-def modify_dft_components(X_complex, k, new_amplitude=None, new_phase=None):
+def modify_dft_components(X_complex, k, new_amplitude=None, new_phase=None, keep_symmetry=True):
     """
     Modifies the amplitude and phase of a single signal component at index k.
 
+    With keep_symmetry=True the mirror bin N-k is set to the conjugate value,
+    so the spectrum still belongs to a real signal. The bins that are their
+    own mirror (k=0 and k=N/2) must be real and keep only A*cos(P).
+
     Returns:
         np.array: The modified complex DFT array.
     """
@@ -293,6 +384,7 @@ def modify_dft_components(X_complex, k, new_amplitude=None, new_phase=None):
         return X_complex
 
     X_modified = np.copy(X_complex)
+    N = len(X_modified)
 
     # Convert complex number to magnitude and phase
     current_amplitude = np.abs(X_modified[k])
@@ -305,6 +397,13 @@ def modify_dft_components(X_complex, k, new_amplitude=None, new_phase=None):
     # Eular's identity: e^(j*P) = cos(P) + j*sin(P)
     X_modified[k] = A * (math.cos(P) + 1j * math.sin(P))
 
+    if keep_symmetry:
+        mirror = (N - k) % N
+        if mirror == k:
+            X_modified[k] = X_modified[k].real
+        else:
+            X_modified[mirror] = np.conj(X_modified[k])
+
     print(f"\nSuccessfully modified DFT component k={k} to A={A:.4f}, Phase={P:.4f} radians.")
     return X_modified
 
@@ -0,0 +1,479 @@
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from task_4.precision import as_complex, as_real, complex_dtype, real_dtype
+
+# --- Mixed-Radix FFT Engine ---
+# The DFT of length N = p * m is split into p interleaved sub-sequences of
+# length m (decimation in time).  Each sub-sequence is transformed
+# recursively, multiplied by the twiddle factors W_N^(r*k) and recombined
+# with a small length-p DFT ("butterfly").
+#
+# Radix 2, 3 and 5 have hand written butterflies; any other small prime
+# factor falls back to multiplying by the p x p DFT matrix, and large prime
+# factors (e.g. N = 997 or 10007) use Bluestein's chirp-z algorithm, so the
+# cost stays O(N log N) for every N.  Every stage works on the last axis
+# and is vectorized over all leading axes.
+#
+# The factorization and all twiddle factors of a length are precomputed
+# once in an FFTPlan and kept in a process-wide LRU cache, so repeated
+# transforms of the same length only do the arithmetic.
+
+# Prime factors above this size are transformed with Bluestein's algorithm
+MAX_MATRIX_RADIX = 31
+
+
+def factorize(N):
+    """
+    Splits N into the list of radices used by the FFT stages.
+    Small radices come first (2, 3, 5), then any remaining prime factors.
+    """
+    factors = []
+    for p in (2, 3, 5):
+        while N % p == 0:
+            factors.append(p)
+            N //= p
+
+    p = 7
+    while p * p <= N:
+        while N % p == 0:
+            factors.append(p)
+            N //= p
+        p += 2
+
+    if N > 1:
+        factors.append(N)
+    return factors
+
+
+# Constants of the radix-3 and radix-5 butterflies (Python floats, so they
+# keep the precision of the data instead of promoting complex64 to complex128)
+_SQRT3_2 = math.sqrt(3.0) / 2.0
+_C1, _C2 = math.cos(2 * math.pi / 5), math.cos(4 * math.pi / 5)
+_S1, _S2 = math.sin(2 * math.pi / 5), math.sin(4 * math.pi / 5)
+
+
+def _butterfly(t, p, sign):
+    """
+    Length-p DFT along axis -2 of t (shape (..., p, m)).
+    sign is -1 for the forward transform and +1 for the inverse.
+    """
+    if p == 2:
+        a, b = t[..., 0, :], t[..., 1, :]
+        return np.stack((a + b, a - b), axis=-2)
+
+    if p == 3:
+        a, b, c = t[..., 0, :], t[..., 1, :], t[..., 2, :]
+        s = b + c
+        t1 = a - 0.5 * s
+        t2 = (sign * 1j * _SQRT3_2) * (b - c)
+        return np.stack((a + s, t1 + t2, t1 - t2), axis=-2)
+
+    if p == 5:
+        x0, x1, x2, x3, x4 = (t[..., r, :] for r in range(5))
+        s14, d14 = x1 + x4, x1 - x4
+        s23, d23 = x2 + x3, x2 - x3
+
+        r1 = x0 + _C1 * s14 + _C2 * s23
+        r2 = x0 + _C2 * s14 + _C1 * s23
+        i1 = (sign * 1j) * (_S1 * d14 + _S2 * d23)
+        i2 = (sign * 1j) * (_S2 * d14 - _S1 * d23)
+        return np.stack((x0 + s14 + s23, r1 + i1, r2 + i2, r2 - i2, r1 - i1), axis=-2)
+
+    # Larger radices are handled by the stage itself (matrix or Bluestein)
+    raise ValueError(f"No fixed butterfly for radix {p}.")
+
+
+def _next_power_of_two(n):
+    return 1 << (int(n) - 1).bit_length()
+
+
+def four_step_split(N):
+    """
+    N = N1 * N2 for the four-step (row-column) FFT, with N1 the largest
+    divisor of N that is <= sqrt(N). Prime N gives (1, N).
+    """
+    for N1 in range(math.isqrt(N), 0, -1):
+        if N % N1 == 0:
+            return N1, N // N1
+    return 1, N
+
+
+# --- FFT Plans ---
+
+class _Stage:
+    """
+    Precomputed data of one decimation-in-time stage (length N = p * m).
+
+    Attributes:
+        p (int): The radix of the stage.
+        m (int): Length of the sub-transforms.
+        twiddles (np.ndarray or None): W_N^(r*k), shape (p, m).
+        matrix (np.ndarray or None): p x p DFT matrix for small generic radices.
+        chirp, kernel_hat (np.ndarray or None): Bluestein data for large radices.
+        conv_plans (tuple or None): Forward/inverse plans of the Bluestein convolution.
+    """
+
+    def __init__(self, p, m, sign, dtype):
+        N = p * m
+        self.p = p
+        self.m = m
+        self.twiddles = None
+        self.matrix = None
+        self.chirp = None
+        self.kernel_hat = None
+        self.conv_plans = None
+
+        if m > 1:
+            rk = np.outer(np.arange(p), np.arange(m)) % N
+            self.twiddles = np.exp(sign * 2j * np.pi * rk / N).astype(dtype)
+
+        if p in (2, 3, 5):
+            return
+
+        if p <= MAX_MATRIX_RADIX:
+            q = np.arange(p)
+            self.matrix = np.exp(sign * 2j * np.pi * (np.outer(q, q) % p) / p).astype(dtype)
+            return
+
+        # Bluestein: n*k = (n^2 + k^2 - (k - n)^2) / 2 turns the length-p DFT
+        # into a convolution with the chirp w[n] = e^(sign * j * pi * n^2 / p),
+        # evaluated with power-of-two FFTs of length M >= 2p - 1.
+        # n^2 mod 2p keeps the chirp angle small (and accurate) for large p.
+        M = _next_power_of_two(2 * p - 1)
+        n = np.arange(p)
+        chirp = np.exp(sign * 1j * np.pi * ((n * n) % (2 * p)) / p)
+
+        kernel = np.zeros(M, dtype=complex)
+        kernel[:p] = np.conj(chirp)
+        kernel[M - p + 1:] = np.conj(chirp[1:][::-1])
+
+        self.conv_plans = (get_plan(M, inverse=False, dtype=dtype), get_plan(M, inverse=True, dtype=dtype))
+        self.chirp = chirp.astype(dtype)
+        self.kernel_hat = (self.conv_plans[0].execute(kernel) / M).astype(dtype)
+
+    @property
+    def nbytes(self):
+        arrays = (self.twiddles, self.matrix, self.chirp, self.kernel_hat)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def butterfly(self, t, sign):
+        """Length-p DFT along axis -2 of t (shape (..., p, m))."""
+        p = self.p
+        if self.matrix is not None:
+            return np.matmul(self.matrix, t)
+        if self.chirp is None:
+            return _butterfly(t, p, sign)
+
+        # Bluestein along the radix axis
+        forward, inverse = self.conv_plans
+        x = t.swapaxes(-1, -2)
+        M = forward.N
+        a = np.zeros(x.shape[:-1] + (M,), dtype=self.chirp.dtype)
+        a[..., :p] = x * self.chirp
+        conv = inverse.execute(forward.execute(a) * self.kernel_hat)
+        return (conv[..., :p] * self.chirp).swapaxes(-1, -2)
+
+
+class FFTPlan:
+    """
+    Everything needed to transform signals of one length in one direction:
+    the factorization of N and the twiddle factors of every stage.
+
+    Attributes:
+        N (int): Transform length.
+        inverse (bool): True for the (unscaled) inverse transform.
+        dtype (np.dtype): Complex dtype of the twiddles and of the result.
+        factors (list[int]): Radix of each stage, outermost first.
+        stages (list[_Stage]): Precomputed stage data.
+    """
+
+    def __init__(self, N, inverse=False, dtype=complex):
+        self.N = N
+        self.inverse = inverse
+        self.dtype = np.dtype(dtype)
+        self.sign = 1 if inverse else -1
+        self.factors = factorize(N)
+
+        self.stages = []
+        length = N
+        for p in self.factors:
+            length //= p
+            self.stages.append(_Stage(p, length, self.sign, self.dtype))
+
+    @property
+    def nbytes(self):
+        return sum(stage.nbytes for stage in self.stages)
+
+    def execute(self, x):
+        """Unscaled transform of x along the last axis."""
+        x = np.asarray(x, dtype=self.dtype)
+        if x.shape[-1] != self.N:
+            raise ValueError(f"Plan is for length {self.N}, got {x.shape[-1]}.")
+        if self.N == 0:
+            return x.copy()
+        return self._run(x, 0)
+
+    def _run(self, x, level):
+        """Decimation-in-time FFT of x along the last axis."""
+        N = x.shape[-1]
+        if N == 1:
+            return x
+
+        stage = self.stages[level]
+        batch = x.shape[:-1]
+
+        # 1. Split x[p*n + r] into p interleaved sub-sequences of length m
+        sub = x.reshape(batch + (stage.m, stage.p)).swapaxes(-1, -2)
+
+        # 2. Transform each sub-sequence
+        sub = self._run(sub, level + 1)
+
+        # 3. Twiddle factors W_N^(r*k) for r = 0..p-1, k = 0..m-1
+        if stage.twiddles is not None:
+            sub = sub * stage.twiddles
+
+        # 4. Length-p butterflies: output index k + m*q
+        out = stage.butterfly(sub, self.sign)
+        return out.reshape(batch + (N,))
+
+
+class RealFFTPlan:
+    """
+    Plan for real-input transforms that only handle the N/2 + 1 bins
+    k = 0..N/2 (the rest follow from X[N-k] = conj(X[k])).
+
+    For even N the real signal is packed into a complex signal of length
+    N/2, z[n] = x[2n] + j * x[2n+1], so only a half-length complex FFT is
+    needed.  Odd N fall back to the full complex plan.
+
+    Attributes:
+        N (int): Length of the real signal.
+        inverse (bool): False for rfft (real -> half spectrum), True for irfft.
+        dtype (np.dtype): Complex dtype of the spectrum.
+        half_plan (FFTPlan): Complex plan of length N/2 (N even) or N (N odd).
+        twiddles (np.ndarray or None): W_N^k for k = 0..N/2 (N even).
+    """
+
+    def __init__(self, N, inverse=False, dtype=complex):
+        self.N = N
+        self.inverse = inverse
+        self.dtype = np.dtype(dtype)
+        self.twiddles = None
+
+        if N % 2 == 0 and N > 0:
+            self.half_plan = get_plan(N // 2, inverse=inverse, dtype=dtype)
+            k = np.arange(N // 2 + 1)
+            self.twiddles = np.exp(-2j * np.pi * k / N).astype(self.dtype)
+        else:
+            self.half_plan = get_plan(N, inverse=inverse, dtype=dtype)
+
+    @property
+    def nbytes(self):
+        return 0 if self.twiddles is None else self.twiddles.nbytes
+
+    def execute(self, x):
+        """rfft: real x (..., N) -> X (..., N//2 + 1); irfft: half spectrum -> real x (unscaled)."""
+        return self._inverse(x) if self.inverse else self._forward(x)
+
+    def _forward(self, x):
+        N = self.N
+        x = np.asarray(x, dtype=np.finfo(self.dtype).dtype)
+        if N % 2 == 1:
+            return self.half_plan.execute(x)[..., :N // 2 + 1]
+
+        # 1. Pack even/odd samples into one complex signal and transform it
+        z = x[..., 0::2] + 1j * x[..., 1::2]
+        Z = self.half_plan.execute(z)
+
+        # 2. Split Z into the spectra of the even and odd samples:
+        #    E[k] = (Z[k] + conj(Z[N/2-k])) / 2,  O[k] = (Z[k] - conj(Z[N/2-k])) / 2j
+        Z = np.concatenate((Z, Z[..., :1]), axis=-1)
+        Z_rev = np.conj(Z[..., ::-1])
+        E = 0.5 * (Z + Z_rev)
+        O = -0.5j * (Z - Z_rev)
+
+        # 3. X[k] = E[k] + W_N^k * O[k]
+        return E + self.twiddles * O
+
+    def _inverse(self, X):
+        N = self.N
+        X = np.asarray(X, dtype=self.dtype)
+        if X.shape[-1] != N // 2 + 1:
+            raise ValueError(f"Plan expects {N // 2 + 1} bins, got {X.shape[-1]}.")
+
+        if N % 2 == 1:
+            # Rebuild the full Hermitian spectrum: X[N-k] = conj(X[k])
+            full = np.concatenate((X, np.conj(X[..., :0:-1])), axis=-1)
+            return np.real(self.half_plan.execute(full))
+
+        # DC and Nyquist bins of a real signal are real
+        X = X.copy()
+        X[..., 0] = X[..., 0].real
+        X[..., -1] = X[..., -1].real
+
+        # 1. Recover the spectra of the even and odd samples
+        X_rev = np.conj(X[..., ::-1])
+        E = 0.5 * (X + X_rev)
+        O = 0.5 * (X - X_rev) * np.conj(self.twiddles)
+
+        # 2. Unpack: z[n] = x[2n] + j * x[2n+1] (factor 2 matches the unscaled transform)
+        z = self.half_plan.execute((E + 1j * O)[..., :N // 2])
+        x = np.empty(X.shape[:-1] + (N,), dtype=z.real.dtype)
+        x[..., 0::2] = 2 * z.real
+        x[..., 1::2] = 2 * z.imag
+        return x
+
+
+class PlanCache:
+    """
+    Process-wide LRU cache of FFT plans keyed by (N, inverse, dtype, real).
+
+    Plans are evicted least-recently-used first once the total size of
+    their precomputed arrays exceeds max_bytes.  The hit/miss counters
+    show how often transforms reuse an existing plan.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._plans = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, N, inverse=False, dtype=complex, real=False):
+        key = (int(N), bool(inverse), np.dtype(dtype), bool(real))
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self.hits += 1
+                self._plans.move_to_end(key)
+                return plan
+            self.misses += 1
+
+        plan_class = RealFFTPlan if real else FFTPlan
+        plan = plan_class(key[0], key[1], key[2])
+
+        with self._lock:
+            if key not in self._plans:
+                self._plans[key] = plan
+                self.current_bytes += plan.nbytes
+                self._evict()
+        return plan
+
+    def _evict(self):
+        # Always keep the newest plan, even if it alone exceeds the budget
+        while self.current_bytes > self.max_bytes and len(self._plans) > 1:
+            _, old = self._plans.popitem(last=False)
+            self.current_bytes -= old.nbytes
+            self.evictions += 1
+
+    def resize(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            return {
+                "plans": len(self._plans),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_PLAN_CACHE = PlanCache()
+
+
+def get_plan(N, inverse=False, dtype=complex, real=False):
+    """Returns the cached plan for (N, inverse, dtype, real), building it on a miss."""
+    return _PLAN_CACHE.get(N, inverse, dtype, real)
+
+
+def plan_cache_info():
+    """Returns the plan count, memory use and hit/miss counters of the plan cache."""
+    return _PLAN_CACHE.info()
+
+
+def set_plan_cache_budget(max_bytes):
+    """Sets the memory budget (in bytes) of the plan cache, evicting plans if needed."""
+    _PLAN_CACHE.resize(max_bytes)
+
+
+def clear_plan_cache():
+    """Drops every cached plan and resets the counters."""
+    _PLAN_CACHE.clear()
+
+
+def fft(x, dtype=None):
+    """
+    Forward DFT along the last axis.
+    X[k] = Sum_{n=0}^{N-1} x[n] * e^(-j * 2 * pi * k * n / N)
+
+    The precision follows task_4.precision: the dtype argument, else
+    single precision for float32/complex64 input, else the global default.
+    """
+    x = as_complex(x, dtype)
+    N = x.shape[-1]
+    if N == 0:
+        return x.copy()
+    return get_plan(N, inverse=False, dtype=x.dtype).execute(x)
+
+
+def ifft(X, dtype=None):
+    """
+    Inverse DFT along the last axis (includes the 1/N scaling).
+    x[n] = (1/N) * Sum_{k=0}^{N-1} X[k] * e^(j * 2 * pi * k * n / N)
+    """
+    X = as_complex(X, dtype)
+    N = X.shape[-1]
+    if N == 0:
+        return X.copy()
+    return get_plan(N, inverse=True, dtype=X.dtype).execute(X) / N
+
+
+def rfft(x, dtype=None):
+    """
+    Real-input DFT along the last axis: returns only the N//2 + 1 bins k = 0..N/2.
+    The remaining bins follow from X[N-k] = conj(X[k]).
+    """
+    x = as_real(x, dtype)
+    N = x.shape[-1]
+    cdtype = complex_dtype(x)
+    if N == 0:
+        return np.zeros(x.shape, dtype=cdtype)
+    return get_plan(N, inverse=False, dtype=cdtype, real=True).execute(x)
+
+
+def irfft(X_half, N=None, dtype=None):
+    """
+    Inverse of rfft: rebuilds N real samples from the N//2 + 1 bins k = 0..N/2.
+    N defaults to 2 * (len(X_half) - 1).
+    """
+    X_half = as_complex(X_half, dtype)
+    if N is None:
+        N = 2 * (X_half.shape[-1] - 1)
+    if N == 0:
+        return np.zeros(X_half.shape[:-1] + (0,), dtype=real_dtype(X_half))
+    return get_plan(N, inverse=True, dtype=X_half.dtype, real=True).execute(X_half) / N
+
+
+def hermitian_extend(X_half, N):
+    """Expands the N//2 + 1 bins of a real signal to the full N-bin spectrum."""
+    X_half = np.asarray(X_half)
+    tail = np.conj(X_half[..., 1:N - N // 2][..., ::-1])
+    return np.concatenate((X_half, tail), axis=-1)
@@ -0,0 +1,303 @@
+import time
+
+import numpy as np
+
+from task_4.fft_engine import ifft, rfft
+from task_4.precision import as_real
+from task_one.read_load_signals import read_signal_chunks
+
+# --- Analytic Signal through the FFT ---
+# The analytic signal z = x + j H{x} keeps only the positive frequencies of x:
+#     Z[k] = X[k] * h[k],   h[0] = 1,  h[k] = 2 (0 < k < N/2),  h[N/2] = 1 (N even),
+#                           h[k] = 0 for the negative frequencies,
+#     z    = IFFT(Z)
+# so one real FFT and one inverse FFT (O(N log N)) replace the O(N^2) DFT.
+# From z:
+#     envelope               a[n] = |z[n]|
+#     instantaneous phase    phi[n] = phi[n-1] + angle(z[n] conj(z[n-1]))   (unwrapped)
+#     instantaneous freq.    f[n] = angle(z[n] conj(z[n-1])) * Fs / (2 pi)
+#
+# --- Chunked Overlap Mode ---
+# The ideal Hilbert kernel 2 / (pi n) decays slowly, so a long signal is cut
+# into blocks of block_size samples and each block is transformed with
+# `overlap` samples of context on both sides (zeros before the start and
+# after the end of the signal); only the middle block is kept.  Memory and
+# FFT size stay bounded by the block, and the error from the cut-off context
+# falls as the overlap grows.  The whole-signal transform instead treats the
+# signal as periodic, so both modes also differ within about `overlap`
+# samples of the two ends.
+
+DEFAULT_BLOCK_SIZE = 4096
+DEFAULT_OVERLAP = 1024
+
+
+def _next_power_of_two(n):
+    return 1 << max(int(n) - 1, 0).bit_length()
+
+
+def _analytic(x, nfft=None):
+    """Analytic signal of the rows of x (..., N) through an nfft-point (>= N) FFT."""
+    N = x.shape[-1]
+    nfft = N if nfft is None else nfft
+    if nfft > N:
+        x = np.concatenate((x, np.zeros(x.shape[:-1] + (nfft - N,), dtype=x.dtype)), axis=-1)
+
+    # 1. Positive-frequency half of the spectrum, doubled except at DC and Nyquist
+    X = rfft(x)
+    X[..., 1:(nfft + 1) // 2] *= 2
+
+    # 2. Zero the negative frequencies and transform back
+    Z = np.zeros(X.shape[:-1] + (nfft,), dtype=X.dtype)
+    Z[..., :X.shape[-1]] = X
+    return ifft(Z)[..., :N]
+
+
+class StreamingHilbert:
+    """
+    Analytic signal of a long signal fed in chunks (chunked overlap mode).
+
+    process() returns the analytic samples whose right-hand context is
+    complete, so the output lags the input by `overlap` samples; flush()
+    returns the rest.  Together they give exactly analytic_signal(x,
+    block_size, overlap).
+
+    Attributes:
+        block_size (int): Samples kept from every transformed block.
+        overlap (int): Context samples on each side of a block.
+        nfft (int): FFT size per block (power of two >= block_size + 2 * overlap).
+    """
+
+    def __init__(self, block_size=DEFAULT_BLOCK_SIZE, overlap=DEFAULT_OVERLAP):
+        self.block_size = int(block_size)
+        self.overlap = int(overlap)
+        if self.block_size < 1 or self.overlap < 0:
+            raise ValueError("block_size must be at least 1 and overlap non-negative.")
+        self.nfft = _next_power_of_two(self.block_size + 2 * self.overlap)
+        self.reset()
+
+    def reset(self):
+        """Starts a new signal (zeros as the left context)."""
+        self._buffer = np.zeros(self.overlap)
+
+    def process(self, chunk):
+        """Feeds the next chunk and returns the analytic samples completed by it."""
+        chunk = as_real(np.asarray(chunk).ravel())
+        buffer = np.concatenate((self._buffer.astype(chunk.dtype), chunk))
+        width = self.block_size + 2 * self.overlap
+        if len(buffer) < width:
+            self._buffer = buffer
+            return np.zeros(0, dtype=np.result_type(buffer, np.complex64))
+
+        # 1. Every complete block with its context, transformed in one batch
+        count = (len(buffer) - width) // self.block_size + 1
+        starts = np.arange(count) * self.block_size
+        blocks = buffer[starts[:, None] + np.arange(width)]
+        z = _analytic(blocks, self.nfft)[:, self.overlap:self.overlap + self.block_size]
+
+        # 2. Keep the left context of the next block and everything after it
+        self._buffer = buffer[count * self.block_size:]
+        return z.ravel()
+
+    def flush(self):
+        """Ends the signal (zeros as the right context) and returns the remaining samples."""
+        remaining = len(self._buffer) - self.overlap
+        if remaining <= 0:
+            self.reset()
+            return np.zeros(0, dtype=np.result_type(self._buffer, np.complex64))
+        padded = np.concatenate((self._buffer, np.zeros(self.overlap, dtype=self._buffer.dtype)))
+        z = _analytic(padded, _next_power_of_two(len(padded)))[self.overlap:self.overlap + remaining]
+        self.reset()
+        return z
+
+
+def analytic_signal(x, block_size=None, overlap=DEFAULT_OVERLAP):
+    """
+    Analytic signal z = x + j H{x} of a real signal.
+
+    Args:
+        x (np.array): Real samples, shape (N,) or a batch (..., N) (whole-signal mode).
+        block_size (int, optional): Use the chunked overlap mode with blocks of
+            this size (1-D x); by default the whole signal is transformed at once.
+        overlap (int): Context samples on each side of a block in the chunked mode.
+
+    Returns:
+        np.array: The complex analytic signal, same shape as x.
+    """
+    x = as_real(x)
+    if x.shape[-1] == 0:
+        return np.zeros(x.shape, dtype=np.result_type(x, np.complex64))
+    if block_size is None:
+        return _analytic(x)
+    if x.ndim != 1:
+        raise ValueError("The chunked mode takes a 1-D signal.")
+    streamer = StreamingHilbert(block_size, overlap)
+    return np.concatenate((streamer.process(x), streamer.flush()))
+
+
+def hilbert_transform(x, block_size=None, overlap=DEFAULT_OVERLAP):
+    """Hilbert transform H{x} (the imaginary part of the analytic signal)."""
+    return analytic_signal(x, block_size, overlap).imag
+
+
+def envelope(x, block_size=None, overlap=DEFAULT_OVERLAP):
+    """Amplitude envelope |x + j H{x}|."""
+    return np.abs(analytic_signal(x, block_size, overlap))
+
+
+def _phase_and_frequency(z, previous=None):
+    """
+    Unwrapped phase and frequency (cycles/sample) of the analytic samples z.
+
+    Args:
+        previous (tuple, optional): (last analytic sample, its unwrapped phase)
+            of the preceding chunk, so a stream continues without jumps.
+
+    Returns:
+        tuple: (phase, frequency, new previous)
+    """
+    if len(z) == 0:
+        return np.zeros(0), np.zeros(0), previous
+    # 1. Phase steps between neighbours, always within (-pi, pi]
+    if previous is None:
+        steps = np.angle(z[1:] * np.conj(z[:-1]))
+        start = np.angle(z[0])
+        phase = start + np.concatenate(([0.0], np.cumsum(steps)))
+        # The first sample has no predecessor: it takes the next step
+        steps = np.concatenate((steps[:1] if len(steps) else [0.0], steps))
+    else:
+        last_z, last_phase = previous
+        steps = np.angle(z * np.conj(np.concatenate(([last_z], z[:-1]))))
+        phase = last_phase + np.cumsum(steps)
+
+    # 2. Frequency from the phase step per sample
+    frequency = steps / (2 * np.pi)
+    return phase, frequency, (z[-1], phase[-1])
+
+
+def instantaneous_phase(x, block_size=None, overlap=DEFAULT_OVERLAP):
+    """Unwrapped instantaneous phase in radians."""
+    return _phase_and_frequency(analytic_signal(x, block_size, overlap))[0]
+
+
+def instantaneous_frequency(x, Fs=None, block_size=None, overlap=DEFAULT_OVERLAP):
+    """
+    Instantaneous frequency from the phase step between neighbouring samples.
+
+    Returns:
+        np.array: Frequency in Hz (cycles/sample without Fs), one per sample.
+    """
+    frequency = _phase_and_frequency(analytic_signal(x, block_size, overlap))[1]
+    return frequency * Fs if Fs is not None else frequency
+
+
+def stream_hilbert(source, Fs=None, block_size=DEFAULT_BLOCK_SIZE, overlap=DEFAULT_OVERLAP, chunk_size=65536):
+    """
+    Generator computing envelope, phase and frequency of a long signal chunk by chunk.
+
+    Args:
+        source (str or iterable): A time-domain signal file (read in chunks)
+            or an iterable of sample arrays / (x, y) pairs.
+        Fs (float, optional): Sampling frequency (frequency in Hz instead of cycles/sample).
+
+    Yields:
+        tuple: (envelope, phase, frequency) of the next samples.
+    """
+    if isinstance(source, str):
+        source = read_signal_chunks(source, chunk_size)
+    streamer = StreamingHilbert(block_size, overlap)
+    previous = None
+
+    def features(z):
+        nonlocal previous
+        phase, frequency, previous = _phase_and_frequency(z, previous)
+        return np.abs(z), phase, frequency * Fs if Fs is not None else frequency
+
+    for chunk in source:
+        if isinstance(chunk, tuple):
+            chunk = chunk[1]
+        z = streamer.process(chunk)
+        if len(z):
+            yield features(z)
+    z = streamer.flush()
+    if len(z):
+        yield features(z)
+
+
+def hilbert_signal(signal, Fs=None, block_size=None, overlap=DEFAULT_OVERLAP):
+    """
+    Envelope, instantaneous phase and instantaneous frequency of a Signal (new/Signal.py).
+
+    Args:
+        Fs (float, optional): Sampling frequency; defaults to signal.fs. Without
+            either the frequency is in cycles/sample.
+        block_size (int, optional): Use the chunked overlap mode (see analytic_signal).
+
+    Returns:
+        tuple: (envelope, phase, frequency) as Signals with the input's indices.
+    """
+    Fs = getattr(signal, 'fs', None) if Fs is None else Fs
+    z = analytic_signal(signal.samples, block_size, overlap)
+    phase, frequency, _ = _phase_and_frequency(z)
+    if Fs is not None:
+        frequency = frequency * Fs
+
+    name = signal.filename or 'signal'
+    results = []
+    for values, label in ((np.abs(z), 'envelope'), (phase, 'phase'), (frequency, 'frequency')):
+        result = type(signal)(signal.indices, values, f"{label} of {name}")
+        result.fs = getattr(signal, 'fs', None)
+        results.append(result)
+    return tuple(results)
+
+
+# --- Benchmark ---
+
+def dft_analytic_signal(x):
+    """O(N^2) analytic signal with an explicit DFT matrix (reference for the benchmark)."""
+    x = as_real(x)
+    N = len(x)
+    n = np.arange(N)
+    W = np.exp(-2j * np.pi * np.outer(n, n) / N)
+    h = np.zeros(N)
+    h[0] = 1.0
+    h[1:(N + 1) // 2] = 2.0
+    if N % 2 == 0:
+        h[N // 2] = 1.0
+    return np.conj(W) @ (h * (W @ x)) / N
+
+
+def benchmark(sizes=(256, 1024, 4096), long_size=1 << 20, repeats=3):
+    """Prints FFT against DFT-matrix times, and the chunked-mode error on a long signal."""
+    rng = np.random.default_rng(0)
+    print("N\tFFT (ms)\tDFT (ms)\tspeedup\tmax diff")
+    for N in sizes:
+        x = rng.standard_normal(N)
+        analytic_signal(x)  # build the plans
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fast = analytic_signal(x)
+        fast_time = (time.perf_counter() - start) / repeats * 1000
+        start = time.perf_counter()
+        slow = dft_analytic_signal(x)
+        slow_time = (time.perf_counter() - start) * 1000
+        print(f"{N}\t{fast_time:.2f}\t\t{slow_time:.2f}\t\t{slow_time / fast_time:.0f}x"
+              f"\t{np.max(np.abs(fast - slow)):.1e}")
+
+    # Amplitude-modulated tone: envelope 1 + 0.5 cos(2 pi 0.001 n)
+    n = np.arange(long_size)
+    true_envelope = 1 + 0.5 * np.cos(2 * np.pi * 0.001 * n)
+    x = true_envelope * np.cos(2 * np.pi * 0.05 * n)
+    inner = slice(DEFAULT_OVERLAP, long_size - DEFAULT_OVERLAP)
+    print(f"\nN = {long_size}, block_size = {DEFAULT_BLOCK_SIZE}")
+    print("overlap\ttime (ms)\tmax |z - z_whole|\tmax envelope error")
+    whole = analytic_signal(x)
+    for overlap in (256, 1024):
+        start = time.perf_counter()
+        chunked = analytic_signal(x, DEFAULT_BLOCK_SIZE, overlap)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{overlap}\t{elapsed:.0f}\t\t{np.max(np.abs(chunked - whole)[inner]):.1e}"
+              f"\t\t\t{np.max(np.abs(np.abs(chunked) - true_envelope)[inner]):.1e}")
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from task_4.fft_engine import fft, four_step_split
+from task_4.dft_idft import batch_chunk_rows, BATCH_WORK_FACTOR
+from task_one.read_load_signals import read_signal_chunks
+
+# --- Out-of-Core FFT (four-step / Bailey) ---
+# For N = N1 * N2 the samples are seen as a matrix A[n2, n1] = x[n2*N1 + n1]
+# (row-major, so the file itself is the matrix) and
+#     X[k2 + N2*k1] = Sum_{n1} W_N^(n1*k2) * W_N1^(n1*k1) * Sum_{n2} x[n1 + N1*n2] * W_N2^(n2*k2)
+# which is computed as:
+#     1. N1 FFTs of length N2 down the columns,
+#     2. multiplication by the twiddles W_N^(n1*k2),
+#     3. N2 FFTs of length N1 along the rows,
+#     4. reading the result column by column (X[k2 + N2*k1] = C[k2, k1]).
+# The matrix lives in a scratch memmap on disk and every pass only holds a
+# block of rows or columns in memory, sized to memory_limit.
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+
+def text_to_npy(filename, npy_path, chunk_size=65536):
+    """
+    Copies the samples of a time-domain signal file into a float64 .npy file
+    chunk by chunk (the header's third line gives N).
+
+    Returns:
+        np.memmap: The samples, memory mapped read-only.
+    """
+    with open(filename, 'r') as file:
+        header = [file.readline() for _ in range(3)]
+    if int(float(header[0])) != 0:
+        raise ValueError(f"{filename} is not a time-domain signal file.")
+    N = int(float(header[2]))
+
+    samples = np.lib.format.open_memmap(npy_path, mode='w+', dtype=np.float64, shape=(N,))
+    filled = 0
+    for _, y in read_signal_chunks(filename, chunk_size):
+        if filled + len(y) > N:
+            raise ValueError(f"{filename} has more rows than its header says ({N}).")
+        samples[filled:filled + len(y)] = y
+        filled += len(y)
+    if filled != N:
+        raise ValueError(f"{filename} has {filled} rows but its header says {N}.")
+    samples.flush()
+    del samples
+    return np.load(npy_path, mmap_mode='r')
+
+
+def _open_source(source, scratch_dir, chunk_size):
+    """Returns the samples as a 1-D (memory-mapped) array."""
+    if isinstance(source, str):
+        if source.endswith('.npy'):
+            return np.load(source, mmap_mode='r')
+        return text_to_npy(source, os.path.join(scratch_dir, 'samples.npy'), chunk_size)
+    return source
+
+
+def write_frequency_file(output_path, spectrum_blocks, N):
+    """
+    Writes a spectrum in the frequency-domain file layout:
+    header 1, 0, N and then one "amplitude phase" row per bin.
+
+    Args:
+        spectrum_blocks (iterable): Consecutive blocks of complex bins.
+    """
+    written = 0
+    with open(output_path, 'w') as file:
+        file.write(f"1\n0\n{N}\n")
+        for X_block in spectrum_blocks:
+            rows = np.column_stack([np.abs(X_block), np.angle(X_block)])
+            # One %-format call per block is several times faster than np.savetxt
+            file.write(('%.15g %.15g\n' * len(rows)) % tuple(rows.ravel().tolist()))
+            written += len(X_block)
+    if written != N:
+        raise ValueError(f"Wrote {written} bins instead of {N}.")
+
+
+def out_of_core_fft(source, output_path, memory_limit=DEFAULT_MEMORY_LIMIT, scratch_dir=None,
+                    chunk_size=65536):
+    """
+    DFT of a signal that does not fit in memory, written to a frequency-domain file.
+
+    Args:
+        source (str or np.array): A .npy file (memory mapped), a time-domain
+            signal text file (read in chunks), or a 1-D (memmap) array.
+        output_path (str): Where the spectrum is written (header 1, 0, N).
+        memory_limit (int): Bytes of working memory per pass.
+        scratch_dir (str, optional): Directory for the scratch memmap
+            (default: the system temp directory). It needs about 16 * N bytes.
+        chunk_size (int): Rows read at once from a text file.
+
+    Returns:
+        int: N, the number of bins written.
+    """
+    work_dir = tempfile.mkdtemp(prefix='ooc_fft_', dir=scratch_dir)
+    try:
+        x = _open_source(source, work_dir, chunk_size)
+        if x.ndim != 1 or len(x) == 0:
+            raise ValueError("The signal must be a non-empty 1-D array of samples.")
+        N = len(x)
+        N1, N2 = four_step_split(N)
+
+        row_bytes = max(N1, N2) * np.dtype(complex).itemsize * BATCH_WORK_FACTOR
+        if row_bytes > memory_limit:
+            raise ValueError(f"memory_limit is too small: one row of the {N2} x {N1} split "
+                             f"needs {row_bytes} bytes (N = {N}).")
+
+        A = x.reshape(N2, N1)
+        B = np.lib.format.open_memmap(os.path.join(work_dir, 'scratch.npy'), mode='w+',
+                                      dtype=complex, shape=(N2, N1))
+
+        # 1. + 2. Column FFTs (length N2), then the twiddles W_N^(n1*k2)
+        k2 = np.arange(N2, dtype=np.int64)
+        columns = batch_chunk_rows(N2, memory_limit)
+        for c0 in range(0, N1, columns):
+            c1 = min(c0 + columns, N1)
+            block = fft(np.ascontiguousarray(A[:, c0:c1].T))
+            n1 = np.arange(c0, c1, dtype=np.int64)
+            block *= np.exp(-2j * np.pi * (np.outer(n1, k2) % N) / N)
+            B[:, c0:c1] = block.T
+        B.flush()
+
+        # 3. Row FFTs (length N1), in place
+        rows = batch_chunk_rows(N1, memory_limit)
+        for r0 in range(0, N2, rows):
+            r1 = min(r0 + rows, N2)
+            B[r0:r1] = fft(np.asarray(B[r0:r1]))
+        B.flush()
+
+        # 4. X[k2 + N2*k1] = B[k2, k1]: stream the columns out in order of k1
+        def spectrum_blocks():
+            for c0 in range(0, N1, columns):
+                c1 = min(c0 + columns, N1)
+                yield np.asarray(B[:, c0:c1]).T.ravel()
+
+        write_frequency_file(output_path, spectrum_blocks(), N)
+        del A, B, x
+        return N
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
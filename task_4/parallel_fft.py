@@ -0,0 +1,194 @@
+import os
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from task_4.fft_engine import fft, four_step_split
+from task_4.precision import as_complex
+
+# --- Parallel FFT (four-step over a process pool) ---
+# A large FFT of length N = N1 * N2 is split like the out-of-core transform
+# (task_4/out_of_core.py):
+#     1. N1 column FFTs of length N2 and the twiddles W_N^(n1*k2),
+#     2. N2 row FFTs of length N1, written transposed so that
+#        X[k2 + N2*k1] = C[k1, k2] is already in order.
+# Each pass is cut into one slab of columns / rows per worker.  The matrices
+# live in multiprocessing.shared_memory blocks; the tasks only carry the
+# block names and index ranges, so no sample array is pickled.
+# The precision follows task_4.precision like every other transform
+# (complex64 blocks for single precision).
+#
+# NO multi-core speedup has been measured.  The only machine the benchmark
+# ran on has 1 CPU, where the pool (2 workers) is pure overhead: about
+# 0.5-0.75x the speed of fft for N = 2^16 .. 2^22.  Whether several cores
+# make it faster is unknown; run `python -m task_4.parallel_fft` on a
+# multi-core machine before relying on it.  With one CPU the default
+# worker count falls back to fft.
+
+# Below this length the pool is not used (a guess, not a measured break-even)
+PARALLEL_MIN_SIZE = 1 << 16
+
+_POOL = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool(workers):
+    """The shared process pool, (re)created when the worker count changes."""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown()
+            _POOL = ProcessPoolExecutor(max_workers=workers)
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def shutdown_pool():
+    """Stops the worker processes of parallel_fft."""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown()
+        _POOL, _POOL_WORKERS = None, 0
+
+
+def _column_pass(src_name, dst_name, N1, N2, c0, c1, dtype):
+    """Worker: B[:, c0:c1] = twiddle * FFT_N2(A[:, c0:c1])."""
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    try:
+        A = np.ndarray((N2, N1), dtype=dtype, buffer=src.buf)
+        B = np.ndarray((N2, N1), dtype=dtype, buffer=dst.buf)
+        N = N1 * N2
+        block = fft(np.ascontiguousarray(A[:, c0:c1].T))
+        n1 = np.arange(c0, c1, dtype=np.int64)
+        # Twiddles are computed in float64 and rounded to the block precision
+        twiddles = np.exp(-2j * np.pi * (np.outer(n1, np.arange(N2, dtype=np.int64)) % N) / N)
+        block *= twiddles.astype(dtype)
+        B[:, c0:c1] = block.T
+        del A, B
+    finally:
+        src.close()
+        dst.close()
+
+
+def _row_pass(src_name, dst_name, N1, N2, r0, r1, dtype):
+    """Worker: C[:, r0:r1] = FFT_N1(B[r0:r1]).T (the transposed result)."""
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    try:
+        B = np.ndarray((N2, N1), dtype=dtype, buffer=src.buf)
+        C = np.ndarray((N1, N2), dtype=dtype, buffer=dst.buf)
+        C[:, r0:r1] = fft(B[r0:r1]).T
+        del B, C
+    finally:
+        src.close()
+        dst.close()
+
+
+def _slabs(count, parts):
+    """Splits range(count) into at most parts contiguous (start, stop) slabs."""
+    edges = np.linspace(0, count, min(parts, count) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def parallel_fft(x, workers=None, dtype=None):
+    """
+    Unscaled forward DFT of a 1-D signal using several processes.
+
+    Falls back to the single-process engine (task_4.fft_engine.fft) for
+    N < PARALLEL_MIN_SIZE, for one worker, and for prime N (no split).
+    The precision follows task_4.precision, as in fft().
+
+    Args:
+        x (np.array): Samples, shape (N,).
+        workers (int, optional): Worker processes (default os.cpu_count()).
+        dtype (optional): Per-call precision ('single', 'double', ...).
+
+    Returns:
+        np.array: Complex spectrum, shape (N,).
+    """
+    x = as_complex(x, dtype)
+    if x.ndim != 1:
+        raise ValueError("parallel_fft expects a 1-D signal.")
+    N = len(x)
+    workers = (os.cpu_count() or 1) if workers is None else int(workers)
+    N1, N2 = four_step_split(N) if N else (1, N)
+    if N < PARALLEL_MIN_SIZE or workers <= 1 or N1 == 1:
+        return fft(x)
+
+    cdtype = x.dtype
+    nbytes = N * cdtype.itemsize
+    blocks = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(2)]
+    try:
+        A = np.ndarray((N2, N1), dtype=cdtype, buffer=blocks[0].buf)
+        A[:] = x.reshape(N2, N1)
+        names = [block.name for block in blocks]
+        pool = _get_pool(workers)
+
+        # 1. Column FFTs + twiddles: A -> B
+        jobs = [pool.submit(_column_pass, names[0], names[1], N1, N2, c0, c1, cdtype.str)
+                for c0, c1 in _slabs(N1, workers)]
+        for job in jobs:
+            job.result()
+
+        # 2. Row FFTs, transposed back into the first block: B -> C
+        jobs = [pool.submit(_row_pass, names[1], names[0], N1, N2, r0, r1, cdtype.str)
+                for r0, r1 in _slabs(N2, workers)]
+        for job in jobs:
+            job.result()
+
+        C = np.ndarray((N,), dtype=cdtype, buffer=blocks[0].buf)
+        X = C.copy()
+        del A, C
+        return X
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def benchmark(exponents=range(16, 27), workers=None, repeats=3):
+    """
+    Prints the time of fft and parallel_fft for N = 2^e and their ratio.
+    Sizes whose buffers would not fit in the available memory are skipped.
+    The ratio only shows a speedup when every worker has a core of its own.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else int(workers)
+    try:
+        available = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        available = None
+
+    print(f"workers = {workers}, cores = {os.cpu_count()}")
+    print("N\tfft (s)\tparallel (s)\tspeedup")
+    rng = np.random.default_rng(0)
+    for e in exponents:
+        N = 1 << e
+        # Input, two shared blocks, result and the engine's temporaries
+        if available is not None and 8 * N * np.dtype(complex).itemsize > available:
+            print(f"2^{e}\tskipped (needs more memory than available)")
+            continue
+        x = rng.standard_normal(N) + 1j * rng.standard_normal(N)
+        parallel_fft(x, workers)  # warm up plans and worker processes
+
+        t_single = min(_timed(fft, x) for _ in range(repeats))
+        t_parallel = min(_timed(parallel_fft, x, workers) for _ in range(repeats))
+        print(f"2^{e}\t{t_single:.4f}\t{t_parallel:.4f}\t{t_single / t_parallel:.2f}x")
+        del x
+    shutdown_pool()
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,129 @@
+import numpy as np
+
+# --- Top-K Spectral Peaks ---
+# A bin is a peak if it is a local maximum of the magnitude:
+#     |X[k-1]| < |X[k]| >= |X[k+1]|
+# The K largest peaks are picked with np.argpartition (O(N)) and only those
+# K are sorted.  A parabola through the peak and its two neighbours
+# (a, b, c) = (|X[k-1]|, |X[k]|, |X[k+1]|) gives the sub-bin position and
+# the interpolated amplitude:
+#     p = (a - c) / (2 * (a - 2b + c)),   -0.5 <= p <= 0.5
+#     amplitude = b - (a - c) * p / 4
+# so the peak lies at bin k + p, i.e. (k + p) * Fs / N Hz.
+# For complex (unwindowed) DFT bins the parabola is biased by the sinc shape
+# of the rectangular window, so the complex quadratic estimator (Jacobsen)
+#     p = Re[(X[k-1] - X[k+1]) / (2X[k] - X[k-1] - X[k+1])]
+# is used instead, with amplitude |X[k]| / sinc(p).
+# Everything works on the last axis, so a batch of spectra (..., N) is
+# processed at once.  This module does not import matplotlib.
+
+DEFAULT_TOP_K = 5
+
+
+def _neighbours(values, circular):
+    """values[k-1] and values[k+1] along the last axis (wrapping or -inf at the edges)."""
+    if circular:
+        return np.roll(values, 1, axis=-1), np.roll(values, -1, axis=-1)
+    edge = np.full(values.shape[:-1] + (1,), -np.inf)
+    left = np.concatenate((edge, values[..., :-1]), axis=-1)
+    right = np.concatenate((values[..., 1:], edge), axis=-1)
+    return left, right
+
+
+def find_peaks(spectrum, top_k=DEFAULT_TOP_K, Fs=None, N=None, threshold=0.0, one_sided=False,
+               interpolate=True, method='auto'):
+    """
+    Finds the top_k largest local maxima of one or many spectra.
+
+    Args:
+        spectrum (np.array): Complex DFT bins or amplitudes, shape (M,) or (..., M).
+        top_k (int): Number of peaks per spectrum.
+        Fs (float, optional): Sampling frequency; without it frequencies are bin positions.
+        N (int, optional): DFT length (default M; pass it for half spectra, M = N//2 + 1).
+        threshold (float): Ignore peaks below threshold * (largest amplitude of the spectrum).
+        one_sided (bool): Only search bins k = 0..N/2 (real signals mirror the rest).
+        interpolate (bool): Sub-bin interpolation.
+        method (str): 'parabolic' (magnitudes), 'jacobsen' (complex bins of an
+            unwindowed DFT) or 'auto' (jacobsen for complex input).
+
+    Returns:
+        tuple: (freqs, amplitudes, phases, bins), each of shape (..., top_k) and
+            sorted by amplitude.  bins are the (fractional) peak positions;
+            phases are NaN for amplitude input.  Missing peaks are NaN.
+    """
+    S = np.asarray(spectrum)
+    if S.ndim == 0 or S.shape[-1] == 0:
+        raise ValueError("spectrum cannot be empty.")
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1.")
+
+    has_phase = np.iscomplexobj(S)
+    if method == 'auto':
+        method = 'jacobsen' if has_phase else 'parabolic'
+    if method not in ('parabolic', 'jacobsen') or (method == 'jacobsen' and not has_phase):
+        raise ValueError("method must be 'parabolic', 'auto', or 'jacobsen' (complex input only).")
+    magnitude = np.abs(S) if has_phase else S.astype(float)
+    M = magnitude.shape[-1]
+    N = M if N is None else int(N)
+    circular = M == N and M >= 3 and not one_sided
+
+    # 1. Local maxima above the threshold
+    left, right = _neighbours(magnitude, circular)
+    is_peak = (magnitude > left) & (magnitude >= right)
+    if one_sided:
+        is_peak[..., N // 2 + 1:] = False
+    is_peak &= magnitude > threshold * np.max(magnitude, axis=-1, keepdims=True)
+
+    # 2. Top K with argpartition, then sort only those K
+    K = min(top_k, M)
+    score = np.where(is_peak, magnitude, -np.inf)
+    index = np.argpartition(-score, K - 1, axis=-1)[..., :K]
+    top = np.take_along_axis(score, index, axis=-1)
+    order = np.argsort(-top, axis=-1, kind='stable')
+    index = np.take_along_axis(index, order, axis=-1)
+    valid = np.isfinite(np.take_along_axis(top, order, axis=-1))
+
+    # 3. Sub-bin interpolation through the neighbours
+    b = np.take_along_axis(magnitude, index, axis=-1)
+    offset = np.zeros(b.shape)
+    amplitude = b.copy()
+    if interpolate and M >= 3:
+        if circular:
+            before, after = (index - 1) % M, (index + 1) % M
+            inner = np.ones(b.shape, dtype=bool)
+        else:
+            before, after = np.maximum(index - 1, 0), np.minimum(index + 1, M - 1)
+            inner = (index > 0) & (index < M - 1)
+        values = S if method == 'jacobsen' else magnitude
+        a = np.take_along_axis(values, before, axis=-1)
+        c = np.take_along_axis(values, after, axis=-1)
+
+        if method == 'jacobsen':
+            denominator = 2 * np.take_along_axis(S, index, axis=-1) - a - c
+            usable = inner & (denominator != 0)
+            offset = np.where(usable, ((a - c) / np.where(usable, denominator, 1.0)).real, 0.0)
+            offset = np.clip(offset, -0.5, 0.5)
+            amplitude = b / np.sinc(offset)
+        else:
+            curvature = a - 2 * b + c
+            usable = inner & (curvature < 0)
+            offset = np.where(usable, 0.5 * (a - c) / np.where(usable, curvature, -1.0), 0.0)
+            offset = np.clip(offset, -0.5, 0.5)
+            amplitude = b - 0.25 * (a - c) * offset
+
+    bins = index + offset
+
+    # 4. Phase: interpolated towards the neighbour on the side of the offset
+    phase = np.full(b.shape, np.nan)
+    if has_phase:
+        phase_b = np.angle(np.take_along_axis(S, index, axis=-1))
+        step = np.where(offset >= 0, 1, -1)
+        neighbour = (index + step) % M if circular else np.clip(index + step, 0, M - 1)
+        delta = np.angle(np.take_along_axis(S, neighbour, axis=-1) * np.exp(-1j * phase_b))
+        phase = np.angle(np.exp(1j * (phase_b + np.abs(offset) * delta)))
+
+    freqs = bins * Fs / N if Fs is not None else bins.astype(float)
+
+    # 5. Spectra with fewer than K peaks: fill the rest with NaN
+    freqs, amplitude, phase, bins = (np.where(valid, v, np.nan) for v in (freqs, amplitude, phase, bins))
+    return freqs, amplitude, phase, bins
@@ -0,0 +1,144 @@
+import math
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# --- Precision Policy (float64 / float32) ---
+# Loading (get_signal_body, Signal), arithmetic, the FFT engine, DFT/IDFT and
+# quantization pick their floating-point type with one rule:
+#     1. an explicit dtype argument of the call ('single', 'double', float32, ...),
+#     2. otherwise data that is already float32 / complex64 stays single precision,
+#     3. otherwise the global default (set_default_precision), 'double' unless changed.
+# Complex results use the matching complex type (float32 -> complex64).
+#
+# Error bounds in single precision (unit roundoff u = 2^-24 ~ 6.0e-8):
+# - Loading, scaling, addition: relative error <= u per sample.  16-bit ADC
+#   data is stored exactly (integers up to 2^24 are exact in float32).
+# - FFT / IDFT (radix 2/3/5 stages, twiddles rounded from float64):
+#       ||X_computed - X|| / ||X|| <= L * eta / (1 - L * eta),   L = log2(N),
+#       eta = u + gamma_4 * (sqrt(2) + u),  gamma_4 = 4u / (1 - 4u)
+#   (Higham, "Accuracy and Stability of Numerical Algorithms", Thm 24.2),
+#   about 8e-6 for N = 2^20; see fft_error_bound().  The observed RMS error
+#   is much smaller, about u * sqrt(L).  Prime factors above 31 use
+#   Bluestein's convolution, which roughly doubles the bound.
+# - Quantization: levels and reconstruction values carry relative error
+#   <= 2u, so a sample within 2u * range of an interval boundary may fall
+#   into the neighbouring level compared to float64.  This only matters when
+#   num_bits approaches 22.
+# For 16-bit ADC data (one LSB = 2^-16 of full scale ~ 1.5e-5) these errors
+# stay below the quantization noise of the input.
+
+PRECISIONS = {'double': np.dtype(np.float64), 'single': np.dtype(np.float32)}
+
+_DEFAULT_REAL_DTYPE = PRECISIONS['double']
+
+
+def _to_real_dtype(precision):
+    """'single' / 'double' or any float/complex dtype -> its real floating dtype."""
+    if isinstance(precision, str) and precision in PRECISIONS:
+        return PRECISIONS[precision]
+    dtype = np.dtype(precision)
+    if dtype.kind == 'c':
+        return np.dtype(dtype.char.lower())
+    if dtype.kind != 'f' or dtype.itemsize not in (4, 8):
+        raise ValueError("precision must be 'single', 'double', float32/float64 or complex64/complex128.")
+    return dtype
+
+
+def set_default_precision(precision):
+    """Sets the global default: 'single' (float32/complex64) or 'double' (float64/complex128)."""
+    global _DEFAULT_REAL_DTYPE
+    _DEFAULT_REAL_DTYPE = _to_real_dtype(precision)
+
+
+def get_default_precision():
+    """Returns the global default real dtype."""
+    return _DEFAULT_REAL_DTYPE
+
+
+@contextmanager
+def default_precision(precision):
+    """Temporarily changes the global default inside a with block."""
+    previous = _DEFAULT_REAL_DTYPE
+    set_default_precision(precision)
+    try:
+        yield
+    finally:
+        set_default_precision(previous)
+
+
+def real_dtype(data=None, dtype=None):
+    """
+    Real dtype for processing data under the policy above.
+
+    Args:
+        data: Array (or anything array-like) that is about to be processed.
+        dtype: Explicit per-call precision, overrides everything else.
+    """
+    if dtype is not None:
+        return _to_real_dtype(dtype)
+    data_dtype = getattr(data, 'dtype', None)
+    if data_dtype is not None and data_dtype in (np.float32, np.complex64):
+        return PRECISIONS['single']
+    return _DEFAULT_REAL_DTYPE
+
+
+def complex_dtype(data=None, dtype=None):
+    """Complex dtype matching real_dtype(data, dtype)."""
+    return np.result_type(real_dtype(data, dtype), np.complex64)
+
+
+def as_real(data, dtype=None):
+    """Returns data as a real array of the policy dtype (no copy if it already is one)."""
+    return np.asarray(data, dtype=real_dtype(data, dtype))
+
+
+def as_complex(data, dtype=None):
+    """Returns data as a complex array of the policy dtype (no copy if it already is one)."""
+    return np.asarray(data, dtype=complex_dtype(data, dtype))
+
+
+def fft_error_bound(N, dtype=None):
+    """
+    Norm-wise relative error bound ||X_computed - X|| / ||X|| of a length-N
+    FFT in the given precision (see the notes at the top of this module).
+    """
+    u = float(np.finfo(real_dtype(dtype=dtype)).eps) / 2
+    L = max(math.log2(max(N, 2)), 1.0)
+    gamma_4 = 4 * u / (1 - 4 * u)
+    eta = u + gamma_4 * (math.sqrt(2) + u)
+    return L * eta / (1 - L * eta)
+
+
+def benchmark(exponents=(12, 16, 18, 20, 22), repeats=5):
+    """
+    Prints the time of rfft/irfft in double and single precision for N = 2^e,
+    the throughput gain of single precision, its measured error and the bound.
+    """
+    from task_4.fft_engine import rfft, irfft
+
+    print("N\tdouble (ms)\tsingle (ms)\tgain\tmeasured err\tbound")
+    rng = np.random.default_rng(0)
+    for e in exponents:
+        N = 1 << e
+        # 16-bit ADC samples
+        x64 = rng.integers(-2 ** 15, 2 ** 15, N).astype(np.float64)
+        x32 = x64.astype(np.float32)
+
+        times = []
+        for x in (x64, x32):
+            irfft(rfft(x), N)  # build the plans
+            start = time.perf_counter()
+            for _ in range(repeats):
+                irfft(rfft(x), N)
+            times.append((time.perf_counter() - start) / repeats * 1000)
+
+        X64, X32 = rfft(x64), rfft(x32)
+        error = np.linalg.norm(X32 - X64) / np.linalg.norm(X64)
+        print(f"2^{e}\t{times[0]:.2f}\t\t{times[1]:.2f}\t\t{times[0] / times[1]:.2f}x"
+              f"\t{error:.2e}\t{fft_error_bound(N, 'single'):.2e}")
+
+
+if __name__ == '__main__':
+    benchmark()
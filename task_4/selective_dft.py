@@ -0,0 +1,112 @@
+import numpy as np
+
+from task_4.fft_engine import fft, rfft, hermitian_extend
+
+# --- Selective-Bin DFT ---
+# A single DFT bin
+#     X(k) = Sum_{n=0}^{N-1} x[n] * e^(-j * 2 * pi * k * n / N)
+# costs O(N) without computing the rest of the spectrum.  This is the job of
+# the Goertzel filter, but its second-order recurrence runs sample by sample,
+# which in Python is far slower than the FFT.  So the recurrence is NOT used
+# here: the same sums are evaluated directly, in blocks of L ~ sqrt(N) samples:
+#     X(k) = Sum_b e^(-j*w*b*L) * Sum_j x[b*L + j] * e^(-j*w*j),   w = 2*pi*k/N
+# which is two small matrix products for all requested bins (and all
+# signals of a batch) at once.  Each bin still costs O(N) multiply-adds (plus
+# O(sqrt(N)) exponentials), and since there is no recurrence there is no
+# error build-up along the signal.  k does not have to be an integer.
+
+# Direct bins are used while K < DIRECT_COST_FACTOR * log2(N) bins are requested
+DIRECT_COST_FACTOR = 2.0
+
+
+def _bin_angles(n, k, N):
+    """Angles 2*pi*k*n/N for every (n, k); integer bins reduce k*n mod N first for accuracy."""
+    if np.all(k == np.round(k)):
+        return 2 * np.pi * (np.outer(n, k.astype(np.int64)) % N) / N
+    return 2 * np.pi * np.outer(n, k) / N
+
+
+def selected_bins_dft(signal_y, k):
+    """
+    Evaluates the DFT bins k of signal_y (last axis) by blocked direct summation
+    (the same bins as the Goertzel filter, without its recurrence), O(N) per bin.
+
+    Args:
+        signal_y (np.array): Samples, shape (N,) or (..., N).
+        k (int, float or list): Bin indices; fractional values are allowed.
+
+    Returns:
+        np.array: Complex bins, shape (..., len(k)).
+    """
+    x = np.asarray(signal_y)
+    N = x.shape[-1]
+    k = np.atleast_1d(np.asarray(k, dtype=float))
+
+    # 1. Split the samples into B blocks of L samples (zero padded)
+    L = max(1, int(np.ceil(np.sqrt(N))))
+    B = -(-N // L)
+    if B * L != N:
+        pad = [(0, 0)] * (x.ndim - 1) + [(0, B * L - N)]
+        x = np.pad(x, pad)
+    blocks = x.reshape(x.shape[:-1] + (B, L))
+
+    # 2. Inner sums over each block: Sum_j x[b*L + j] * e^(-j*w*j)
+    inner_angle = _bin_angles(np.arange(L), k, N)
+    if np.isrealobj(blocks):
+        partial = blocks @ np.cos(inner_angle) - 1j * (blocks @ np.sin(inner_angle))
+    else:
+        partial = blocks @ np.exp(-1j * inner_angle)
+
+    # 3. Combine the blocks with the phase of each block start: e^(-j*w*b*L)
+    outer = np.exp(-1j * _bin_angles(np.arange(B) * L, k, N))
+    return np.sum(partial * outer, axis=-2)
+
+
+def use_direct_bins(num_bins, N):
+    """True if evaluating num_bins bins one by one is cheaper than a full FFT of length N."""
+    return num_bins < DIRECT_COST_FACTOR * max(np.log2(max(N, 2)), 1.0)
+
+
+def selective_dft(signal_y, k=None, freqs_hz=None, Fs=None, method='auto'):
+    """
+    Computes amplitude and phase of selected DFT bins only.
+
+    Args:
+        signal_y (np.array): Samples, shape (N,) or (..., N).
+        k (list, optional): Bin indices to evaluate.
+        freqs_hz (list, optional): Frequencies in Hz (needs Fs); bin k = f * N / Fs,
+            the same spacing run_dft_idft uses (bin k is k * Fs / N Hz).
+        Fs (float, optional): Sampling frequency in Hz.
+        method (str): 'direct', 'fft' or 'auto' (direct sums for few bins, FFT otherwise).
+
+    Returns:
+        tuple: (k, amplitude, phase, X_selected) for the requested bins.
+    """
+    x = np.asarray(signal_y)
+    N = x.shape[-1]
+    if N == 0:
+        raise ValueError("signal_y cannot be empty.")
+
+    if freqs_hz is not None:
+        if Fs is None or Fs <= 0:
+            raise ValueError("A positive Fs is required when bins are given in Hz.")
+        k = np.asarray(freqs_hz, dtype=float) * N / Fs
+    if k is None:
+        raise ValueError("Give the bins either as k or as freqs_hz.")
+    k = np.atleast_1d(np.asarray(k, dtype=float))
+
+    integer_bins = np.all(k == np.round(k))
+    if method == 'auto':
+        method = 'direct' if (use_direct_bins(len(k), N) or not integer_bins) else 'fft'
+
+    if method == 'direct':
+        X_selected = selected_bins_dft(x, k)
+    elif method == 'fft':
+        if not integer_bins:
+            raise ValueError("The FFT method only supports integer bins k.")
+        X_full = hermitian_extend(rfft(x), N) if np.isrealobj(x) else fft(x)
+        X_selected = X_full[..., k.astype(int) % N]
+    else:
+        raise ValueError("method must be 'direct', 'fft' or 'auto'.")
+
+    return k, np.abs(X_selected), np.angle(X_selected), X_selected
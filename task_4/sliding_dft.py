@@ -0,0 +1,80 @@
+import numpy as np
+
+from task_4.fft_engine import fft
+
+
+class SlidingDFT:
+    """
+    Keeps the DFT of the last N samples of a stream up to date.
+
+    When sample x_new enters the window and x_old leaves it, every bin is
+    updated with the sliding-DFT recurrence
+        X_k <- (X_k + x_new - x_old) * e^(j * 2 * pi * k / N)
+    which costs O(N) for all bins (or O(1) per tracked bin) instead of a
+    full transform.  Rounding errors of the recurrence accumulate, so the
+    bins are recomputed from the window with the FFT engine every
+    resync_interval samples.
+
+    Attributes:
+        N (int): Window length.
+        bins (np.ndarray): Tracked bin indices k (all N bins by default).
+        X (np.ndarray): Current DFT values of the tracked bins.
+        resync_interval (int): Samples between exact recomputations (0 disables it).
+    """
+
+    def __init__(self, initial_window, bins=None, resync_interval=None):
+        window = np.asarray(initial_window)
+        if window.ndim != 1 or len(window) == 0:
+            raise ValueError("initial_window must be a non-empty 1-D array of samples.")
+
+        self.N = len(window)
+        self.bins = np.arange(self.N) if bins is None else np.asarray(bins, dtype=int) % self.N
+        self.resync_interval = self.N if resync_interval is None else int(resync_interval)
+
+        # Circular buffer holding the window; _pos is the oldest sample
+        self._buffer = window.astype(complex)
+        self._pos = 0
+        self._since_resync = 0
+
+        # e^(j * 2 * pi * k / N) for each tracked bin
+        self._rotation = np.exp(2j * np.pi * self.bins / self.N)
+
+        self.X = None
+        self.resync()
+
+    @property
+    def window(self):
+        """The current window, oldest sample first."""
+        return np.roll(self._buffer, -self._pos)
+
+    def resync(self):
+        """Recomputes the tracked bins exactly from the window (O(N log N))."""
+        self.X = fft(self.window)[self.bins]
+        self._since_resync = 0
+
+    def update(self, x_new):
+        """Slides the window by one sample and returns the updated bins."""
+        x_old = self._buffer[self._pos]
+        self._buffer[self._pos] = x_new
+        self._pos = (self._pos + 1) % self.N
+
+        self.X = (self.X + (x_new - x_old)) * self._rotation
+
+        self._since_resync += 1
+        if self.resync_interval and self._since_resync >= self.resync_interval:
+            self.resync()
+        return self.X
+
+    def update_block(self, samples):
+        """Feeds several samples in order and returns the bins after the last one."""
+        for x_new in samples:
+            self.update(x_new)
+        return self.X
+
+    def amplitude(self):
+        """Amplitude of the tracked bins (same scale as run_dft_idft)."""
+        return np.abs(self.X)
+
+    def phase(self):
+        """Phase of the tracked bins in radians."""
+        return np.angle(self.X)
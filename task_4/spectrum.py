@@ -0,0 +1,76 @@
+from functools import cached_property
+
+import numpy as np
+
+
+class Spectrum:
+    """
+    Result of a DFT that keeps only the complex bins and derives everything
+    else on first access (each derived array is computed once and cached).
+
+    Callers that only need X for an IDFT or a bin edit never pay for the
+    polar conversion and the rounded copies.  Iterating gives the legacy
+    run_dft_idft tuple, so
+        k_indices, amplitude, phase, X_complex = spectrum
+    keeps working.
+
+    Attributes:
+        X (np.ndarray): The complex DFT bins.
+        N (int): Number of bins.
+        Fs (float or None): Sampling frequency for freqs_hz.
+        decimals (int): Rounding of amplitude and rounded_phase (4, like the tests).
+    """
+
+    def __init__(self, X_complex, Fs=None, decimals=4):
+        self.X = np.asarray(X_complex)
+        self.N = len(self.X)
+        self.Fs = Fs
+        self.decimals = decimals
+
+    def __iter__(self):
+        return iter((self.k_indices, self.amplitude, self.rounded_phase, self.X))
+
+    def _rounded(self, cached_name, compute):
+        """Rounds the cached array (copied) or a freshly computed one (in place)."""
+        values = self.__dict__.get(cached_name)
+        values = compute(self.X) if values is None else values.copy()
+        return np.round(values, self.decimals, out=values)
+
+    @cached_property
+    def k_indices(self):
+        """Discrete frequency indices k = 0..N-1."""
+        return np.arange(self.N)
+
+    @cached_property
+    def freqs_hz(self):
+        """Bin frequencies k * Fs / N in Hz."""
+        if self.Fs is None or self.Fs <= 0:
+            raise ValueError("A positive Fs is required for the bins in Hz.")
+        return self.k_indices * self.Fs / self.N
+
+    @cached_property
+    def magnitude(self):
+        """|X[k]| (not rounded)."""
+        return np.abs(self.X)
+
+    @cached_property
+    def phase(self):
+        """angle(X[k]) in radians (not rounded)."""
+        return np.angle(self.X)
+
+    @cached_property
+    def amplitude(self):
+        """|X[k]| rounded to `decimals`, as returned by run_dft_idft."""
+        return self._rounded('magnitude', np.abs)
+
+    @cached_property
+    def rounded_phase(self):
+        """angle(X[k]) rounded to `decimals`, as returned by run_dft_idft."""
+        return self._rounded('phase', np.angle)
+
+    @cached_property
+    def normalized_amplitude(self):
+        """|X[k]| / max |X[k]| in [0, 1] (all zeros for an all-zero spectrum)."""
+        magnitude = self.magnitude
+        peak = np.max(magnitude) if self.N else 0.0
+        return magnitude / peak if peak > 0 else np.zeros_like(magnitude)
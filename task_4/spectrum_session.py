@@ -0,0 +1,118 @@
+import math
+
+import numpy as np
+
+from task_4.fft_engine import irfft, rfft, hermitian_extend
+
+
+class SpectrumSession:
+    """
+    Holds a DFT spectrum together with its time-domain reconstruction so that
+    single-bin edits do not need a new IDFT.
+
+    Changing bin k by delta changes the reconstruction by a single complex
+    exponential (a rank-1 update):
+        x[n] += Re(delta * e^(j * 2 * pi * k * n / N)) / N
+    and by twice that when the mirror bin N-k is set to the conjugate value.
+    Each edit therefore costs O(N) instead of O(N log N) for a new IDFT.
+
+    Attributes:
+        N (int): Number of bins / samples.
+        X (np.ndarray): The current complex spectrum.
+        samples (np.ndarray): Real part of the IDFT of X (not rounded).
+    """
+
+    def __init__(self, X_complex=None, signal_y=None):
+        if X_complex is None and signal_y is None:
+            raise ValueError("Give either the spectrum X_complex or the signal signal_y.")
+
+        if X_complex is not None:
+            self.X = np.array(X_complex, dtype=complex)
+            self.N = len(self.X)
+            samples = self._exact_samples()
+        else:
+            samples = np.asarray(signal_y, dtype=float)
+            self.N = len(samples)
+            self.X = hermitian_extend(rfft(samples), self.N)
+
+        # Rank-1 updates work on the samples as a (B, L) block matrix, L ~ sqrt(N),
+        # so that e^(j*2*pi*k*n/N) with n = a*L + b splits into an outer product
+        self._L = max(1, int(np.ceil(np.sqrt(self.N))))
+        self._B = -(-self.N // self._L)
+        padded = np.zeros(self._B * self._L)
+        padded[:self.N] = samples
+        self._blocks = padded.reshape(self._B, self._L)
+        self.samples = padded[:self.N]
+
+    def _exact_samples(self):
+        # Real part of the IDFT = IDFT of the Hermitian half spectrum
+        N = self.N
+        k = np.arange(N // 2 + 1)
+        X_half = 0.5 * (self.X[k] + np.conj(self.X[(N - k) % N]))
+        return irfft(X_half, N)
+
+    def resync(self):
+        """Recomputes the reconstruction exactly from the spectrum (O(N log N))."""
+        self.samples[:] = self._exact_samples()
+
+    def _add_exponential(self, k, delta, scale):
+        """samples[n] += scale * Re(delta * e^(j * 2 * pi * k * n / N))."""
+        N, L = self.N, self._L
+        # e^(j*2*pi*k*(a*L + b)/N) = e^(j*2*pi*k*a*L/N) * e^(j*2*pi*k*b/N)
+        rows = scale * delta * np.exp(2j * np.pi * ((k * L * np.arange(self._B)) % N) / N)
+        cols = np.exp(2j * np.pi * ((k * np.arange(L)) % N) / N)
+        self._blocks += np.outer(rows.real, cols.real)
+        self._blocks -= np.outer(rows.imag, cols.imag)
+
+    def set_bin(self, k, new_amplitude=None, new_phase=None, keep_symmetry=True):
+        """
+        Sets X[k] = A * e^(j * P) and updates the reconstruction in O(N).
+        A missing amplitude or phase keeps the current value; with keep_symmetry
+        the mirror bin N-k is set to the conjugate (see modify_dft_components).
+        """
+        N = self.N
+        if k < 0 or k >= N:
+            raise IndexError(f"Component index k must be between 0 and {N - 1}.")
+
+        A = new_amplitude if new_amplitude is not None else abs(self.X[k])
+        P = new_phase if new_phase is not None else np.angle(self.X[k])
+        new_value = A * (math.cos(P) + 1j * math.sin(P))
+
+        mirror = (N - k) % N
+        if not keep_symmetry:
+            delta = new_value - self.X[k]
+            self.X[k] = new_value
+            self._add_exponential(k, delta, 1.0 / N)
+        elif mirror == k:
+            # Bins k=0 and k=N/2 are their own mirror and must stay real
+            delta = new_value.real - self.X[k]
+            self.X[k] = new_value.real
+            self._add_exponential(k, delta, 1.0 / N)
+        else:
+            # Both X[k] and X[N-k] change; their contributions add up to 2 * Re(...)
+            delta = new_value - 0.5 * (self.X[k] + np.conj(self.X[mirror]))
+            self.X[k] = new_value
+            self.X[mirror] = np.conj(new_value)
+            self._add_exponential(k, delta, 2.0 / N)
+
+        return self.X
+
+    def remove_dc(self):
+        """Sets X[0] = 0 (removes the average value) in O(N)."""
+        return self.set_bin(0, 0.0, 0.0)
+
+    def spectrum(self):
+        """
+        Returns:
+            tuple: (k_indices, amplitude, phase, X_complex), rounded like run_dft_idft.
+        """
+        amplitude = np.round(np.abs(self.X), 4)
+        phase = np.round(np.angle(self.X), 4)
+        return np.arange(self.N), amplitude, phase, self.X.copy()
+
+    def reconstruction(self):
+        """
+        Returns:
+            tuple: (x_indices, samples) rounded to 4 decimals like manual_idft.
+        """
+        return np.arange(self.N), np.round(self.samples, 4)
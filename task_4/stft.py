@@ -0,0 +1,355 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
+
+from task_4.fft_engine import fft, ifft, rfft, irfft
+from task_4.precision import as_real, complex_dtype, real_dtype
+from task_one.read_load_signals import read_signal_chunks
+
+# --- Short-Time Fourier Transform (STFT) ---
+# The signal is cut into overlapping frames of frame_length samples that
+# start every hop samples.  Each frame is multiplied by a window and
+# transformed with the FFT engine:
+#     Z[m, k] = Sum_{n=0}^{L-1} w[n] * x[m*hop + n] * e^(-j * 2 * pi * k * n / nfft)
+# Frames are strided views of the samples (no copy); only the windowed
+# frames of one block are materialised before their batched FFT.
+#
+# With pad=True the signal is zero padded by L - hop samples at the front
+# and at least L - hop at the end, so every sample is covered by the same
+# number of frames and istft() reconstructs the whole signal.
+
+# Windowed frames are transformed in blocks of about this many values
+STFT_BLOCK_VALUES = 1 << 22
+
+
+# --- Windows ---
+
+def get_window(window, frame_length):
+    """
+    Returns a periodic analysis window (periodic windows overlap-add to a
+    constant for the usual hops, e.g. L/2 for 'hann').
+
+    Args:
+        window (str or np.array): 'hann', 'hamming', 'blackman', 'rect',
+            or the window samples themselves.
+        frame_length (int): Window length L.
+
+    Returns:
+        np.array: The window, shape (L,).
+    """
+    if not isinstance(window, str):
+        w = np.asarray(window, dtype=float)
+        if w.shape != (frame_length,):
+            raise ValueError(f"The window must have frame_length = {frame_length} samples.")
+        return w
+
+    n = np.arange(frame_length)
+    angle = 2 * np.pi * n / frame_length
+    if window == 'hann':
+        return 0.5 - 0.5 * np.cos(angle)
+    if window == 'hamming':
+        return 0.54 - 0.46 * np.cos(angle)
+    if window == 'blackman':
+        return 0.42 - 0.5 * np.cos(angle) + 0.08 * np.cos(2 * angle)
+    if window in ('rect', 'boxcar'):
+        return np.ones(frame_length)
+    raise ValueError("window must be 'hann', 'hamming', 'blackman', 'rect' or an array.")
+
+
+# --- Framing ---
+
+def _check_sizes(frame_length, hop, nfft):
+    """Validates the frame sizes and fills in the defaults (hop = L/2, nfft = L)."""
+    frame_length = int(frame_length)
+    hop = frame_length // 2 if hop is None else int(hop)
+    nfft = frame_length if nfft is None else int(nfft)
+    if frame_length <= 0:
+        raise ValueError("frame_length must be positive.")
+    if hop <= 0 or hop > frame_length:
+        raise ValueError("hop must be between 1 and frame_length.")
+    if nfft < frame_length:
+        raise ValueError("nfft cannot be smaller than frame_length.")
+    return frame_length, hop, nfft
+
+
+def _padding(N, frame_length, hop):
+    """Front and end zero padding so every sample lies in full frames and frames tile the end."""
+    front = frame_length - hop
+    end = frame_length - hop
+    end += (-(N + front + end - frame_length)) % hop
+    return front, end
+
+
+def frame_signal(signal_y, frame_length, hop):
+    """
+    Returns the frames of signal_y as a strided view (no data is copied).
+
+    Args:
+        signal_y (np.array): Samples, shape (N,) or (..., N).
+        frame_length (int): Samples per frame L.
+        hop (int): Samples between frame starts.
+
+    Returns:
+        np.array: Read-only view of shape (..., num_frames, L).
+    """
+    x = np.asarray(signal_y)
+    if x.shape[-1] < frame_length:
+        return np.zeros(x.shape[:-1] + (0, frame_length), dtype=x.dtype)
+    return sliding_window_view(x, frame_length, axis=-1)[..., ::hop, :]
+
+
+def _frames_spectrum(frames, w, nfft, real):
+    """Batched FFT of the windowed frames, block by block to bound the temporary memory."""
+    num_frames = frames.shape[-2]
+    bins = nfft // 2 + 1 if real else nfft
+    # The precision policy: float32 / complex64 frames give complex64 bins
+    Z = np.empty(frames.shape[:-2] + (num_frames, bins), dtype=complex_dtype(frames))
+    w = np.asarray(w, dtype=real_dtype(frames))
+
+    lead = int(np.prod(frames.shape[:-2], dtype=np.int64))
+    block = max(1, STFT_BLOCK_VALUES // (nfft * max(lead, 1)))
+    L = frames.shape[-1]
+    for start in range(0, num_frames, block):
+        stop = min(start + block, num_frames)
+        # 1. Window the frames of this block (the only copy of the samples)
+        windowed = frames[..., start:stop, :] * w
+        # 2. Zero pad each frame to nfft points
+        if nfft > L:
+            pad = [(0, 0)] * (windowed.ndim - 1) + [(0, nfft - L)]
+            windowed = np.pad(windowed, pad)
+        # 3. One batched FFT for all frames of the block
+        Z[..., start:stop, :] = rfft(windowed) if real else fft(windowed)
+    return Z
+
+
+def _axes(frame_starts, frame_length, nfft, bins, Fs, dtype=None):
+    """
+    Frame centre times and bin frequencies (seconds and Hz, or samples and k
+    without Fs), in the real dtype of the precision policy.
+    """
+    dtype = real_dtype(dtype=dtype)
+    centres = (frame_starts + frame_length / 2.0).astype(dtype)
+    k = np.arange(bins)
+    if Fs is None:
+        return centres, k
+    if Fs <= 0:
+        raise ValueError("Fs must be positive.")
+    return (centres / dtype.type(Fs)).astype(dtype), (k * Fs / nfft).astype(dtype)
+
+
+# --- STFT / ISTFT ---
+
+def stft(signal_y, Fs=None, window='hann', frame_length=256, hop=None, nfft=None, pad=True):
+    """
+    Short-time Fourier transform of a whole signal.
+
+    Args:
+        signal_y (np.array): Samples, shape (N,) or (..., N) for a batch.
+        Fs (float, optional): Sampling frequency; without it the axes are
+            sample positions and bin indices k.
+        window (str or np.array): Analysis window (see get_window).
+        frame_length (int): Samples per frame L.
+        hop (int, optional): Samples between frames (default L // 2).
+        nfft (int, optional): FFT size per frame, >= L (default L).
+        pad (bool): Zero pad both ends so istft() can rebuild every sample.
+
+    Returns:
+        tuple: (times, freqs, Z) with Z of shape (..., num_frames, bins);
+            bins = nfft // 2 + 1 for real input, nfft for complex input.
+    """
+    x = np.asarray(signal_y)
+    if x.ndim == 0 or x.shape[-1] == 0:
+        raise ValueError("signal_y cannot be empty.")
+    frame_length, hop, nfft = _check_sizes(frame_length, hop, nfft)
+    w = get_window(window, frame_length)
+    real = np.isrealobj(x)
+    if real:
+        x = as_real(x)
+
+    front = 0
+    if pad:
+        front, end = _padding(x.shape[-1], frame_length, hop)
+        x = np.pad(x, [(0, 0)] * (x.ndim - 1) + [(front, end)])
+
+    frames = frame_signal(x, frame_length, hop)
+    Z = _frames_spectrum(frames, w, nfft, real)
+
+    starts = np.arange(frames.shape[-2]) * hop - front
+    times, freqs = _axes(starts, frame_length, nfft, Z.shape[-1], Fs, real_dtype(x))
+    return times, freqs, Z
+
+
+def _overlap_add(frames, hop):
+    """Sums frames of shape (..., F, L) placed every hop samples."""
+    F, L = frames.shape[-2], frames.shape[-1]
+    R = -(-L // hop)
+    if R * hop != L:
+        frames = np.pad(frames, [(0, 0)] * (frames.ndim - 1) + [(0, R * hop - L)])
+    out = np.zeros(frames.shape[:-2] + ((F + R - 1) * hop,), dtype=frames.dtype)
+    # Piece r of every frame lands on one contiguous run of the output
+    for r in range(R):
+        piece = frames[..., r * hop:(r + 1) * hop]
+        out[..., r * hop:(r + F) * hop] += piece.reshape(piece.shape[:-2] + (F * hop,))
+    return out[..., :(F - 1) * hop + L]
+
+
+def istft(Z, frame_length, hop=None, window='hann', nfft=None, pad=True, length=None, real=True):
+    """
+    Inverse STFT by weighted overlap-add:
+        x[n] = Sum_m w[n - m*hop] * frame_m[n - m*hop] / Sum_m w[n - m*hop]^2
+
+    Args:
+        Z (np.array): STFT frames, shape (..., num_frames, bins).
+        frame_length, hop, window, nfft, pad: The values used for stft().
+        length (int, optional): Number of samples to return (the original N).
+        real (bool): Z holds half spectra of a real signal (rfft bins).
+
+    Returns:
+        np.array: The reconstructed samples, shape (..., length).
+    """
+    Z = np.asarray(Z)
+    frame_length, hop, nfft = _check_sizes(frame_length, hop, nfft)
+    w = get_window(window, frame_length)
+
+    # 1. Back to time-domain frames, cropped to the frame length
+    frames = irfft(Z, nfft) if real else ifft(Z)
+    frames = frames[..., :frame_length]
+
+    # 2. Overlap-add the windowed frames and the squared window
+    y = _overlap_add(frames * w, hop)
+    norm = _overlap_add(np.broadcast_to(w * w, (frames.shape[-2], frame_length)), hop)
+    nonzero = norm > 1e-10
+    y[..., nonzero] /= norm[nonzero]
+
+    # 3. Remove the front padding added by stft()
+    if pad:
+        y = y[..., frame_length - hop:]
+    if length is not None:
+        if length > y.shape[-1]:
+            y = np.pad(y, [(0, 0)] * (y.ndim - 1) + [(0, length - y.shape[-1])])
+        y = y[..., :length]
+    return y
+
+
+# --- Streaming STFT ---
+
+class StreamingSTFT:
+    """
+    Computes STFT frames of a stream that arrives in chunks.
+
+    Samples that do not yet fill a frame are carried over to the next
+    chunk, so feeding a signal chunk by chunk (and calling flush() at the
+    end) returns exactly the frames of stft() on the whole signal.
+
+    Attributes:
+        frame_length (int): Samples per frame L.
+        hop (int): Samples between frames.
+        nfft (int): FFT size per frame.
+        Fs (float or None): Sampling frequency for the axes.
+        samples_seen (int): Samples fed so far.
+    """
+
+    def __init__(self, Fs=None, window='hann', frame_length=256, hop=None, nfft=None, pad=True):
+        self.frame_length, self.hop, self.nfft = _check_sizes(frame_length, hop, nfft)
+        self.window = get_window(window, self.frame_length)
+        self.Fs = Fs
+        self.pad = pad
+        self.samples_seen = 0
+
+        self._front = self.frame_length - self.hop if pad else 0
+        # Samples not yet consumed by a frame (the front padding to start with)
+        self._pending = np.zeros(self._front)
+        self._frames_done = 0
+        self._flushed = False
+
+    def _emit(self, buffer):
+        """Transforms every full frame of buffer and keeps the remainder."""
+        frames = frame_signal(buffer, self.frame_length, self.hop)
+        num_frames = frames.shape[-2]
+        Z = _frames_spectrum(frames, self.window, self.nfft, real=True)
+        self._pending = buffer[num_frames * self.hop:].copy()
+
+        starts = (self._frames_done + np.arange(num_frames)) * self.hop - self._front
+        self._frames_done += num_frames
+        times, _ = _axes(starts, self.frame_length, self.nfft, Z.shape[-1], self.Fs)
+        return times, Z
+
+    def process(self, chunk):
+        """
+        Feeds the next chunk of samples.
+
+        Returns:
+            tuple: (times, Z) for the frames completed by this chunk (possibly none).
+        """
+        if self._flushed:
+            raise ValueError("The stream was already flushed.")
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        self.samples_seen += len(chunk)
+        return self._emit(np.concatenate([self._pending, chunk]))
+
+    def flush(self):
+        """
+        Ends the stream; with pad=True the tail is zero padded like stft().
+
+        Returns:
+            tuple: (times, Z) for the remaining frames.
+        """
+        self._flushed = True
+        buffer = self._pending
+        if self.pad and self.samples_seen:
+            _, end = _padding(self.samples_seen, self.frame_length, self.hop)
+            buffer = np.concatenate([buffer, np.zeros(end)])
+        return self._emit(buffer)
+
+    def freqs(self):
+        """Bin frequencies in Hz (or bin indices k without Fs)."""
+        bins = self.nfft // 2 + 1
+        return _axes(np.zeros(0), self.frame_length, self.nfft, bins, self.Fs)[1]
+
+
+def stft_stream(source, Fs=None, window='hann', frame_length=256, hop=None, nfft=None,
+                pad=True, chunk_size=65536):
+    """
+    Generator yielding STFT frames while a long signal is read chunk by chunk.
+
+    Args:
+        source (str or iterable): A time-domain signal file (read with
+            read_signal_chunks) or an iterable of sample arrays / (x, y) pairs.
+        chunk_size (int): Rows per chunk when source is a file name.
+        Other arguments: as in stft().
+
+    Yields:
+        tuple: (times, freqs, Z) for each non-empty batch of new frames.
+    """
+    if isinstance(source, str):
+        source = read_signal_chunks(source, chunk_size)
+
+    streamer = StreamingSTFT(Fs, window, frame_length, hop, nfft, pad)
+    freqs = streamer.freqs()
+    for chunk in source:
+        if isinstance(chunk, tuple):
+            chunk = chunk[1]
+        times, Z = streamer.process(chunk)
+        if len(times):
+            yield times, freqs, Z
+
+    times, Z = streamer.flush()
+    if len(times):
+        yield times, freqs, Z
+
+
+# --- Plotting ---
+
+def plot_spectrogram(times, freqs, Z, title='STFT Spectrogram'):
+    """Plots |Z| in dB over time (x) and frequency (y)."""
+    magnitude_db = 20 * np.log10(np.abs(Z).T + 1e-12)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    mesh = ax.pcolormesh(times, freqs, magnitude_db, shading='auto', cmap='viridis')
+    fig.colorbar(mesh, ax=ax, label='Magnitude (dB)')
+    ax.set_title(title)
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('Frequency (Hz)')
+
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,112 @@
+import numpy as np
+
+from task_4.stft import StreamingSTFT, get_window
+from task_one.read_load_signals import read_signal_chunks
+
+# --- Welch / Bartlett Power Spectral Density ---
+# The recording is cut into (overlapping) windowed segments and the
+# periodograms |Z_m(k)|^2 of all segments are averaged:
+#     P(f_k) = 1 / (M * Fs * Sum w^2) * Sum_m |Z_m(k)|^2       (one-sided: x2 for 0 < f < Fs/2)
+# Averaging M segments lowers the variance of the estimate by about M,
+# which a single full-length DFT cannot do.  Bartlett's method is the
+# special case with a rectangular window and no overlap.
+#
+# Segments come from StreamingSTFT, so only the running sum of the
+# periodograms (segment size) and the current chunk are held in memory.
+
+
+class WelchPSD:
+    """
+    Streaming Welch estimator: feed chunks with process(), read the PSD with result().
+
+    Attributes:
+        Fs (float): Sampling frequency in Hz.
+        segment_length (int): Samples per segment.
+        overlap (int): Samples shared by consecutive segments.
+        nfft (int): FFT size per segment.
+        segments (int): Segments averaged so far.
+    """
+
+    def __init__(self, Fs, segment_length=256, overlap=None, window='hann', nfft=None):
+        if Fs is None or Fs <= 0:
+            raise ValueError("A positive sampling frequency Fs is required.")
+        self.Fs = float(Fs)
+        self.segment_length = int(segment_length)
+        self.overlap = self.segment_length // 2 if overlap is None else int(overlap)
+        if self.overlap < 0 or self.overlap >= self.segment_length:
+            raise ValueError("overlap must be between 0 and segment_length - 1.")
+
+        self._stream = StreamingSTFT(self.Fs, window, self.segment_length,
+                                     self.segment_length - self.overlap, nfft, pad=False)
+        self.nfft = self._stream.nfft
+        self._window_power = np.sum(get_window(window, self.segment_length) ** 2)
+        self._power_sum = np.zeros(self.nfft // 2 + 1)
+        self.segments = 0
+
+    def process(self, chunk):
+        """Adds the periodograms of the segments completed by this chunk."""
+        _, Z = self._stream.process(chunk)
+        if len(Z):
+            self._power_sum += np.sum(Z.real ** 2 + Z.imag ** 2, axis=0)
+            self.segments += len(Z)
+        return self.segments
+
+    def result(self):
+        """
+        Returns:
+            tuple: (freqs_hz, psd) with the one-sided PSD in power per Hz.
+        """
+        if self.segments == 0:
+            raise ValueError(f"At least {self.segment_length} samples are needed for one segment.")
+
+        psd = self._power_sum / (self.segments * self.Fs * self._window_power)
+        # One-sided spectrum: fold the negative frequencies onto the positive ones
+        if self.nfft % 2 == 0:
+            psd[1:-1] *= 2
+        else:
+            psd[1:] *= 2
+        freqs_hz = np.arange(len(psd)) * self.Fs / self.nfft
+        return freqs_hz, psd
+
+
+def welch(source, Fs, segment_length=256, overlap=None, window='hann', nfft=None, chunk_size=65536):
+    """
+    Welch power spectral density estimate.
+
+    Args:
+        source (np.array, str or iterable): The samples, a time-domain signal
+            file (read in chunks), or an iterable of sample arrays / (x, y) pairs.
+        Fs (float): Sampling frequency in Hz.
+        segment_length (int): Samples per segment; shortened to N for a
+            shorter in-memory signal.
+        overlap (int, optional): Overlapping samples (default segment_length // 2).
+        window (str or np.array): Segment window (see get_window).
+        nfft (int, optional): FFT size per segment (default segment_length).
+        chunk_size (int): Samples processed at once.
+
+    Returns:
+        tuple: (freqs_hz, psd).
+    """
+    if isinstance(source, str):
+        source = read_signal_chunks(source, chunk_size)
+    elif isinstance(source, (np.ndarray, list)):
+        x = np.asarray(source, dtype=float)
+        if x.ndim != 1 or len(x) == 0:
+            raise ValueError("The signal must be a non-empty 1-D array of samples.")
+        if len(x) < segment_length:
+            segment_length = len(x)
+            overlap = None if overlap is None else min(overlap, segment_length - 1)
+            nfft = None if nfft is None else max(nfft, segment_length)
+        source = (x[i:i + chunk_size] for i in range(0, len(x), chunk_size))
+
+    estimator = WelchPSD(Fs, segment_length, overlap, window, nfft)
+    for chunk in source:
+        if isinstance(chunk, tuple):
+            chunk = chunk[1]
+        estimator.process(chunk)
+    return estimator.result()
+
+
+def bartlett(source, Fs, segment_length=256, nfft=None, chunk_size=65536):
+    """Bartlett's method: rectangular window, no overlap (see welch)."""
+    return welch(source, Fs, segment_length, 0, 'rect', nfft, chunk_size)
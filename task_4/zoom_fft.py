@@ -0,0 +1,110 @@
+import numpy as np
+
+from task_4.fft_engine import fft, ifft
+from task_4.dft_idft import plot_dft_result
+
+# --- Chirp-Z Transform (CZT) ---
+# The CZT evaluates the z-transform on M points of a spiral z_k = A * W^(-k):
+#     X(z_k) = Sum_{n=0}^{N-1} x[n] * A^(-n) * W^(n*k),   k = 0 .. M-1
+# With n*k = (n^2 + k^2 - (k - n)^2) / 2 (Bluestein) the sum becomes a
+# convolution with the chirp W^(-m^2/2), done with one FFT pair of a
+# power-of-two length >= N + M - 1.  For the zoom FFT the points lie on the
+# unit circle between f1 and f2, so only the M requested frequencies are
+# computed instead of zero padding the whole spectrum to the same spacing.
+
+
+def _chirp(m, w_angle):
+    """W^(m^2 / 2) for W = e^(-j * w_angle)."""
+    m = np.asarray(m, dtype=np.int64)
+    # Squaring in integers keeps m^2 exact; only the final product is rounded
+    return np.exp(-0.5j * w_angle * (m * m).astype(float))
+
+
+def czt(signal_y, m, w_angle, a_angle):
+    """
+    Chirp-z transform on the unit circle (|A| = |W| = 1) along the last axis.
+
+    Args:
+        signal_y (np.array): Samples, shape (N,) or (..., N).
+        m (int): Number of output points M.
+        w_angle (float): Angle step between points, W = e^(-j * w_angle).
+        a_angle (float): Angle of the first point, A = e^(j * a_angle).
+
+    Returns:
+        np.array: X(z_k) for k = 0 .. M-1, shape (..., M).
+    """
+    x = np.asarray(signal_y)
+    N = x.shape[-1]
+    m = int(m)
+    if N == 0 or m <= 0:
+        raise ValueError("The signal and the number of output points must be non-empty.")
+
+    # 1. Pre-multiply: x[n] * A^(-n) * W^(n^2/2)
+    n = np.arange(N)
+    weighted = x * (np.exp(-1j * a_angle * n) * _chirp(n, w_angle))
+
+    # 2. Convolve with the chirp W^(-m^2/2), m = -(N-1) .. M-1, via FFT
+    size = 1 << int(np.ceil(np.log2(N + m - 1))) if N + m > 2 else 1
+    kernel = np.zeros(size, dtype=complex)
+    kernel[:m] = np.conj(_chirp(np.arange(m), w_angle))
+    if N > 1:
+        kernel[-(N - 1):] = np.conj(_chirp(np.arange(N - 1, 0, -1), w_angle))
+
+    padded = np.zeros(x.shape[:-1] + (size,), dtype=complex)
+    padded[..., :N] = weighted
+    convolved = ifft(fft(padded) * fft(kernel))[..., :m]
+
+    # 3. Post-multiply: W^(k^2/2)
+    return convolved * _chirp(np.arange(m), w_angle)
+
+
+# --- Zoom FFT ---
+
+def zoom_fft(signal_y, f1, f2, Fs, resolution=None, m=None):
+    """
+    Evaluates the spectrum on a dense frequency grid inside the band [f1, f2] only.
+
+    The values are the DTFT X(f) = Sum x[n] * e^(-j * 2 * pi * f * n / Fs)
+    and equal the DFT bins of run_dft_idft wherever f = k * Fs / N.  A grid
+    finer than Fs / N interpolates the spectrum (like zero padding);
+    separating two tones still needs a record longer than 1 / their spacing.
+
+    Args:
+        signal_y (np.array): Samples, shape (N,) or (..., N).
+        f1, f2 (float): Band edges in Hz, 0 <= f1 < f2 <= Fs.
+        Fs (float): Sampling frequency in Hz.
+        resolution (float, optional): Grid spacing in Hz.
+        m (int, optional): Number of grid points instead of resolution (default N).
+
+    Returns:
+        tuple: (freqs_hz, amplitude, phase, X_band).
+    """
+    if Fs is None or Fs <= 0:
+        raise ValueError("Sampling Frequency (Fs) must be positive.")
+    if not 0 <= f1 < f2 <= Fs:
+        raise ValueError("The band must satisfy 0 <= f1 < f2 <= Fs.")
+    x = np.asarray(signal_y)
+
+    # 1. Frequency grid: f1, f1 + df, ..., f2
+    if resolution is not None:
+        if resolution <= 0:
+            raise ValueError("resolution must be positive.")
+        m = int(np.floor((f2 - f1) / resolution + 1e-9)) + 1
+        df = resolution
+    else:
+        m = x.shape[-1] if m is None else int(m)
+        if m < 2:
+            raise ValueError("m must be at least 2.")
+        df = (f2 - f1) / (m - 1)
+    freqs_hz = f1 + df * np.arange(m)
+
+    # 2. CZT along the unit-circle arc between f1 and f2
+    X_band = czt(x, m, 2 * np.pi * df / Fs, 2 * np.pi * f1 / Fs)
+    return freqs_hz, np.abs(X_band), np.angle(X_band), X_band
+
+
+def plot_zoom_fft(signal_y, f1, f2, Fs, resolution=None, m=None):
+    """Runs zoom_fft on [f1, f2] and plots amplitude and phase with plot_dft_result."""
+    freqs_hz, amplitude, phase, X_band = zoom_fft(signal_y, f1, f2, Fs, resolution, m)
+    plot_dft_result(freqs_hz, np.round(amplitude, 4), np.round(phase, 4))
+    return freqs_hz, amplitude, phase, X_band
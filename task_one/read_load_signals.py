@@ -1,4 +1,6 @@
 import numpy as np
+
+from task_4.precision import as_real
 #file format structure
 # the file have four parts
 
@@ -36,10 +38,11 @@ def read_signal(filename):
     return file_as_array
 
 #this function takes the file name and return a numpy array x, y ready to work with
-def get_signal_body(filename):
+#dtype picks the precision of y ('single' or 'double', see task_4/precision.py)
+def get_signal_body(filename, dtype=None):
     data = np.loadtxt(filename,  skiprows=3)
     x = data[:, 0]
-    y = data[:, 1]
+    y = as_real(data[:, 1], dtype)
     return x, y
 
 #this function checks the domain type
@@ -48,3 +51,25 @@ def check_domain_type(signal):
         return "time"
     return "freq"
 
+
+#this function reads a time domain signal file in pieces of chunk_size rows
+#it yields (x, y) numpy arrays so long recordings never have to fit in memory at once
+def read_signal_chunks(filename, chunk_size=65536, dtype=None):
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+    with open(filename, 'r') as file:
+        # skip the three header lines (type, periodic, number of rows)
+        for _ in range(3):
+            file.readline()
+        rows = []
+        for line in file:
+            if not line.strip():
+                continue
+            rows.append(line)
+            if len(rows) == chunk_size:
+                data = np.loadtxt(rows, ndmin=2)
+                yield data[:, 0], as_real(data[:, 1], dtype)
+                rows = []
+        if rows:
+            data = np.loadtxt(rows, ndmin=2)
+            yield data[:, 0], as_real(data[:, 1], dtype)